@@ -1,12 +1,18 @@
 from datetime import datetime
 from typing import List
+import events
+import locks
 
 class Announcement:
-    def __init__(self, title, content, date, recipient_groups):
+    __slots__ = ('title', 'content', 'date', 'recipient_groups', 'store', 'announcement_id')
+
+    def __init__(self, title, content, date, recipient_groups, announcement_id=None):
         self.title = title
         self.content = content
         self.date = date
         self.recipient_groups = recipient_groups
+        self.store = None  # AnnouncementStore indexing this announcement by recipient group
+        self.announcement_id = announcement_id  # Stable ID, assigned by the store when None
 
     def __str__(self):
         return f"{self.date}: {self.title} - {self.content} (Recipients: {', '.join(self.recipient_groups)})"
@@ -14,21 +20,27 @@ class Announcement:
     def add_recipient_group(self, group: str) -> None:
         """Adds a new recipient group to the announcement with validation."""
         if not group.isalnum():  # Example: Check if group name is alphanumeric
-            print(f"Error: Group name '{group}' is not valid. Please use alphanumeric characters only.")
+            events.error(f"Error: Group name '{group}' is not valid. Please use alphanumeric characters only.")
             return
         if group not in self.recipient_groups:
-            self.recipient_groups.append(group)
-            print(f"Group '{group}' added to recipients.")
+            with locks.all_locks():  # Held by compact() too, so the journaled change cannot fall between snapshot and rotation
+                self.recipient_groups.append(group)
+                if self.store:
+                    self.store.group_added(self, group)
+            events.info(f"Group '{group}' added to recipients.")
         else:
-            print(f"Group '{group}' is already a recipient.")
+            events.warning(f"Group '{group}' is already a recipient.")
 
     def remove_recipient_group(self, group: str) -> None:
         """Removes a recipient group from the announcement."""
         if group in self.recipient_groups:
-            self.recipient_groups.remove(group)
-            print(f"Group '{group}' removed from recipients.")
+            with locks.all_locks():
+                self.recipient_groups.remove(group)
+                if self.store and group not in self.recipient_groups:
+                    self.store.group_removed(self, group)
+            events.info(f"Group '{group}' removed from recipients.")
         else:
-            print(f"Group '{group}' not found in recipients.")
+            events.warning(f"Group '{group}' not found in recipients.")
 
     def add_recipient_groups(self, groups: List[str]) -> None:
         """Adds multiple recipient groups at once."""
@@ -0,0 +1,199 @@
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+import journal
+import search_index
+
+
+def date_key(value) -> str:
+    """
+    Canonical form of an announcement date given as a datetime, a date or an ISO string: ISO 8601
+    with a 'T' separator. Announcements are sorted and expired by it, and the journal and the
+    snapshots store it, so the order and the expiry cut-off are the same after a reload.
+    """
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    value = str(value)
+    if len(value) > 10 and value[10] == ' ':  # str(datetime) separates the time with a space
+        return value[:10] + 'T' + value[11:]
+    return value
+
+
+class AnnouncementStore:
+    """
+    The platform's announcements, with an inverted index from recipient group to that group's
+    announcements sorted by date. Each announcement's ID is its sequence number, assigned in the
+    order it was added and saved with it: (date, seq) keys order the per-group lists and double as
+    pagination cursors, and seq alone marks what a user has already seen.
+
+    Iterating the store yields announcements in the order they were added, like the list it replaces.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.seq = 0  # Sequence number of the latest announcement
+        self._announcements: Dict[int, 'Announcement'] = {}  # seq -> announcement, in insertion order
+        self._seqs: Dict['Announcement', int] = {}
+        self._keys: List[Tuple[str, int]] = []  # (date, seq) of every announcement, sorted
+        self._by_group: Dict[str, List[Tuple[str, int]]] = {}  # group -> sorted (date, seq)
+        self._group_seqs: Dict[str, List[int]] = {}  # group -> sorted seq, for "since" queries
+        self._last_seen: Dict[Tuple[str, str], int] = {}  # (role, user id) -> last seq shown
+
+    def __len__(self) -> int:
+        return len(self._announcements)
+
+    def __iter__(self) -> Iterator['Announcement']:
+        return iter(list(self._announcements.values()))
+
+    def append(self, announcement) -> None:
+        """
+        Add an announcement and index it under each of its recipient groups. A loaded announcement
+        keeps its ID; a new one (or one whose ID is taken) gets the next sequence number.
+        """
+        with self._lock:
+            seq = announcement.announcement_id
+            if not seq or seq in self._announcements:
+                seq = announcement.announcement_id = self.seq + 1
+            self.seq = max(self.seq, seq)
+            key = (date_key(announcement.date), seq)
+            self._announcements[seq] = announcement
+            self._seqs[announcement] = seq
+            insort(self._keys, key)
+            for group in dict.fromkeys(announcement.recipient_groups):
+                self._index(group, key)
+            announcement.store = self
+        search_index.announcement_added(announcement)
+
+    def remove(self, announcement) -> None:
+        with self._lock:
+            seq = self._seqs.pop(announcement, None)
+            if seq is None:
+                return
+            del self._announcements[seq]
+            key = (date_key(announcement.date), seq)
+            del self._keys[bisect_left(self._keys, key)]
+            for group in dict.fromkeys(announcement.recipient_groups):
+                self._unindex(group, key)
+            announcement.store = None
+        search_index.announcement_removed(announcement)
+
+    def clear(self) -> None:
+        with self._lock:
+            for announcement in self._announcements.values():
+                announcement.store = None
+            self._announcements.clear()
+            self._seqs.clear()
+            self._keys.clear()
+            self._by_group.clear()
+            self._group_seqs.clear()
+            self._last_seen.clear()
+            self.seq = 0
+
+    def get(self, announcement_id: int) -> Optional['Announcement']:
+        """The announcement with this ID, or None."""
+        return self._announcements.get(announcement_id)
+
+    def _index(self, group: str, key: Tuple[str, int]) -> None:
+        insort(self._by_group.setdefault(group, []), key)
+        insort(self._group_seqs.setdefault(group, []), key[1])
+
+    def _unindex(self, group: str, key: Tuple[str, int]) -> None:
+        keys = self._by_group.get(group, [])
+        pos = bisect_left(keys, key)
+        if pos < len(keys) and keys[pos] == key:
+            del keys[pos]
+            seqs = self._group_seqs[group]
+            del seqs[bisect_left(seqs, key[1])]
+            if not keys:
+                del self._by_group[group], self._group_seqs[group]
+
+    def group_added(self, announcement, group: str) -> None:
+        """
+        Called by Announcement.add_recipient_group so the inverted index follows the change, which is journaled.
+        """
+        with self._lock:
+            seq = self._seqs.get(announcement)
+            if seq is not None:
+                self._index(group, (date_key(announcement.date), seq))
+                journal.record('announcement_groups', announcement_id=seq,
+                               recipient_groups=list(announcement.recipient_groups))
+        search_index.announcement_regrouped(announcement)
+
+    def group_removed(self, announcement, group: str) -> None:
+        """
+        Called by Announcement.remove_recipient_group so the inverted index follows the change, which is journaled.
+        """
+        with self._lock:
+            seq = self._seqs.get(announcement)
+            if seq is not None:
+                self._unindex(group, (date_key(announcement.date), seq))
+                journal.record('announcement_groups', announcement_id=seq,
+                               recipient_groups=list(announcement.recipient_groups))
+        search_index.announcement_regrouped(announcement)
+
+    def regroup(self, announcement_id: int, groups: List[str]) -> None:
+        """Replace an announcement's recipient groups (used when replaying the journal)."""
+        with self._lock:
+            announcement = self._announcements.get(announcement_id)
+            if announcement is None:
+                return
+            key = (date_key(announcement.date), announcement_id)
+            for group in dict.fromkeys(announcement.recipient_groups):
+                self._unindex(group, key)
+            announcement.recipient_groups = list(groups)
+            for group in dict.fromkeys(announcement.recipient_groups):
+                self._index(group, key)
+        search_index.announcement_regrouped(announcement)
+
+    def for_group(self, group: str) -> List['Announcement']:
+        """All announcements for a recipient group, newest first."""
+        with self._lock:
+            return [self._announcements[seq] for _, seq in reversed(self._by_group.get(group, []))]
+
+    def page(self, group: str, limit: int = 10, cursor: Optional[str] = None):
+        """
+        One page of a group's announcements, newest first.
+        :param cursor: The next_cursor of the previous page, or None for the first page.
+        :return: (announcements, next_cursor); next_cursor is None on the last page.
+        """
+        with self._lock:
+            keys = self._by_group.get(group, [])
+            end = len(keys)
+            if cursor:
+                cursor_date, _, cursor_seq = cursor.rpartition('|')
+                end = bisect_left(keys, (cursor_date, int(cursor_seq)))
+            start = max(0, end - limit)
+            items = [self._announcements[seq] for _, seq in reversed(keys[start:end])]
+            next_cursor = f"{keys[start][0]}|{keys[start][1]}" if start > 0 else None
+            return items, next_cursor
+
+    def since(self, group: str, seq: int) -> List['Announcement']:
+        """A group's announcements added after sequence number `seq`, oldest first."""
+        with self._lock:
+            seqs = self._group_seqs.get(group, [])
+            return [self._announcements[s] for s in seqs[bisect_right(seqs, seq):]]
+
+    def unseen(self, user, mark: bool = True) -> List['Announcement']:
+        """
+        Announcements for the user's role added since the user last looked (all of them the first time).
+        :param mark: Remember that the user has now seen everything up to the latest announcement.
+        """
+        user_key = (user.role, getattr(user, 'student_id', None) or getattr(user, 'instructor_id', None) or user.name)
+        with self._lock:
+            new = self.since(user.role, self._last_seen.get(user_key, 0))
+            if mark:
+                self._last_seen[user_key] = self.seq
+            return new
+
+    def expire(self, before) -> int:
+        """
+        Drop announcements dated before `before` (a datetime, date or ISO string).
+        :return: The number of announcements removed.
+        """
+        with self._lock:
+            cut = bisect_left(self._keys, (date_key(before), 0))
+            expired = [self._announcements[seq] for _, seq in self._keys[:cut]]
+            for announcement in expired:
+                self.remove(announcement)
+            return len(expired)
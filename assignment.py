@@ -1,12 +1,17 @@
 from datetime import datetime  # Correctly import datetime
+import events
+import locks
 
 class Assignment:
+    __slots__ = ('__title', '__description', '__due_date', '__course', 'grades', '_graded')
+
     def __init__(self, title: str, description: str, due_date: datetime, course):
         self.__title = title
         self.__description = description
         self.__due_date = due_date  # Expecting a datetime object
         self.__course = course  # The course to which this assignment belongs
         self.grades = []  # Initialize grades list
+        self._graded = set()  # student_id of every grade in `grades` ('' for grades without one)
 
     @property
     def title(self) -> str:
@@ -39,16 +44,28 @@ class Assignment:
     def add_grade(self, grade: float, feedback: str = '', student_id: str = '') -> None:
         """Add a grade to the assignment, along with optional feedback."""
         if not (0 <= grade <= 100):
-            print("Error: Grade must be between 0 and 100.")
-            return
-        if any(g['student_id'] == student_id for g in self.grades):
-            print(f"Grade for student {student_id} already exists for this assignment.")
+            events.error("Error: Grade must be between 0 and 100.")
             return
+        with locks.course_lock(self.course):
+            if student_id in self._graded:
+                events.warning(f"Grade for student {student_id} already exists for this assignment.")
+                return
+            self.record_grade(grade, feedback, student_id)
+            if student_id and hasattr(self.course, 'gradebook'):
+                self.course.gradebook.add(student_id, self.title, grade)
+        events.info(f"Grade of {grade} added for student {student_id} to '{self.title}'.")
+
+    def record_grade(self, grade: float, feedback: str = '', student_id: str = '') -> None:
+        """Append an already validated grade (the caller holds the course lock or is loading data)."""
         self.grades.append({'score': grade, 'student_id': student_id, 'feedback': feedback})
-        print(f"Grade of {grade} added for student {student_id} to '{self.title}'.")
+        self._graded.add(student_id)
 
     def average_grade(self) -> float:
         """Calculate and return the average grade for the assignment."""
+        gradebook = getattr(self.course, 'gradebook', None)
+        # The gradebook only holds grades entered with a student_id
+        if gradebook is not None and '' not in self._graded and gradebook.has_assignment(self.title):
+            return gradebook.mean(self.title)
         valid_grades = [grade['score'] for grade in self.grades if grade['score'] >= 0]  # Example of excluding invalid grades
         if not valid_grades:
             return 0.0
@@ -0,0 +1,759 @@
+import asyncio
+import contextlib
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from discussion import DiscussionThread
+from e_learning_environment import E_Learning_Environment
+import datagen
+from enrollment import Enrollment
+from grade import Grade
+from platform_admin import PlatformAdmin
+from schedule import Schedule
+from announcement import Announcement
+from announcement_store import AnnouncementStore
+from assignment import Assignment
+from due_index import DueDateIndex
+from gpa_engine import GpaEngine
+import gradebook_io
+import instrumentation
+from lazy_store import LazyJsonStorage
+from post_store import PostStore
+from search_index import SearchIndex
+import events
+import server
+from instructor import Instructor
+from course import Course
+from student import Student
+
+
+def bench_enrollment_checks(sizes=(10_000, 100_000, 1_000_000), courses_per_student=4,
+                            n_courses=2_000, lookups=100_000, seed=42):
+    """
+    Time Enrollment.is_student_enrolled as the total number of enrollments grows.
+    With the bidirectional index the per-check cost should stay flat.
+    """
+    rng = random.Random(seed)
+    instructor = Instructor("Bench Instructor", "bench@example.com", "5550000000", "Bench Hall", "I-BENCH")
+    courses = [Course(f"Course {i}", f"C{i:05d}", instructor, 3) for i in range(n_courses)]
+    print(f"{'enrollments':>12} {'ns/check':>10}")
+    results = {}
+    for size in sizes:
+        enrollment = Enrollment()
+        students = [
+            Student(f"Student {i}", f"s{i}@example.com", "5550000000", "Campus", f"S{i:07d}", "Freshman", "CS")
+            for i in range(size // courses_per_student)
+        ]
+        for student in students:
+            for course in rng.sample(courses, courses_per_student):
+                enrollment.add_existing(student, course)
+        pairs = [(rng.choice(students), rng.choice(courses)) for _ in range(lookups)]
+        start = time.perf_counter()
+        for student, course in pairs:
+            enrollment.is_student_enrolled(student, course)
+        elapsed = time.perf_counter() - start
+        results[len(enrollment)] = elapsed / lookups * 1e9
+        print(f"{len(enrollment):>12} {results[len(enrollment)]:>10.1f}")
+    return results
+
+
+def bench_bulk_enroll(batch_sizes=(1_000, 10_000, 100_000), existing=1_000_000, n_courses=2_000, seed=42):
+    """
+    Time Enrollment.enroll_many for growing batches on top of `existing` enrollments.
+    Throughput should depend on the batch size only, not on the enrollments already present.
+    """
+    rng = random.Random(seed)
+    instructor = Instructor("Bench Instructor", "bench@example.com", "5550000000", "Bench Hall", "I-BENCH")
+    courses = [Course(f"Course {i}", f"C{i:05d}", instructor, 3) for i in range(n_courses)]
+    enrollment = Enrollment()
+    for i in range(existing // 4):
+        student = Student(f"Student {i}", f"s{i}@example.com", "5550000000", "Campus", f"S{i:07d}", "Freshman", "CS")
+        for course in rng.sample(courses, 4):
+            enrollment.add_existing(student, course)
+    print(f"{'batch':>10} {'seconds':>10} {'pairs/s':>12}")
+    results = {}
+    for batch_size in batch_sizes:
+        newcomers = [
+            Student(f"New {batch_size}-{i}", f"n{i}@example.com", "5550000000", "Campus", f"N{batch_size}-{i}",
+                    "Freshman", "CS")
+            for i in range(batch_size)
+        ]
+        pairs = [(student, rng.choice(courses)) for student in newcomers]
+        start = time.perf_counter()
+        result = enrollment.enroll_many(pairs)
+        elapsed = time.perf_counter() - start
+        results[batch_size] = len(result.enrolled) / elapsed
+        print(f"{batch_size:>10} {elapsed:>10.3f} {results[batch_size]:>12.0f}")
+    return results
+
+
+def stress_concurrency(workers=64, operations=50_000, n_students=500, n_courses=20, seed=42):
+    """
+    Hammer enrollment, grade entry and discussion posting from many threads at once
+    (with a tiny GIL switch interval to force interleavings), then check that the
+    course rosters, the enrollment index and the gradebooks still agree.
+    Returns the list of broken invariants (empty when everything is consistent).
+    """
+    rng = random.Random(seed)
+    instructor = Instructor("Bench Instructor", "bench@example.com", "5550000000", "Bench Hall", "I-BENCH")
+    courses = [Course(f"Course {i}", f"C{i:05d}", instructor, 3) for i in range(n_courses)]
+    students = [
+        Student(f"Student {i}", f"s{i}@example.com", "5550000000", "Campus", f"S{i:07d}", "Freshman", "CS")
+        for i in range(n_students)
+    ]
+    due = (datetime.now() + timedelta(days=30)).isoformat()
+    with events.use_sink(events.NullSink()):
+        for course in courses:
+            course.assign_assignment("Stress", "Concurrency stress assignment", due)
+    threads = {course: DiscussionThread(course, "Stress", instructor) for course in courses}
+    enrollment = Enrollment()
+    ops = [(rng.choice(('enroll', 'grade', 'post')), rng.choice(students), rng.choice(courses))
+           for _ in range(operations)]
+
+    def run(op):
+        kind, student, course = op
+        if kind == 'enroll':
+            enrollment.enroll_student(student, course)
+        elif kind == 'grade':
+            assignment = course.assignments[0]
+            score = float(rng.randint(0, 100))
+            assignment.add_grade(score, '', student.student_id)
+            course.add_grade(Grade(student, assignment, score))
+        else:
+            threads[course].add_post(student, "stress")
+        return kind
+
+    previous_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    start = time.perf_counter()
+    try:
+        with events.use_sink(events.NullSink()), ThreadPoolExecutor(max_workers=workers) as pool:
+            kinds = list(pool.map(run, ops, chunksize=64))
+    finally:
+        sys.setswitchinterval(previous_interval)
+    elapsed = time.perf_counter() - start
+
+    problems = []
+    unique_pairs = {(s, c) for kind, s, c in ops if kind == 'enroll'}
+    unique_grades = {(s.student_id, c.course_code) for kind, s, c in ops if kind == 'grade'}
+    if len(enrollment) != len(unique_pairs):
+        problems.append(f"enrollment index has {len(enrollment)} pairs, expected {len(unique_pairs)}")
+    for course in courses:
+        roster = course.enrolled_students
+        if len(roster) != len(set(roster)):
+            problems.append(f"{course.course_code}: duplicate students on the roster")
+        if set(roster) != set(enrollment.get_students_by_course(course)):
+            problems.append(f"{course.course_code}: roster and enrollment index disagree")
+        expected = sum(1 for sid, code in unique_grades if code == course.course_code)
+        if not len(course.grades) == len(course.gradebook) == course.assignments[0].grade_count() == expected:
+            problems.append(f"{course.course_code}: {len(course.grades)} grades, {len(course.gradebook)} gradebook "
+                            f"rows, {course.assignments[0].grade_count()} assignment grades, expected {expected}")
+    posts = sum(thread.post_count for thread in threads.values())
+    if posts != kinds.count('post'):
+        problems.append(f"{posts} posts stored, expected {kinds.count('post')}")
+    for student in students:
+        if set(student.enrolled_courses) != set(enrollment.get_courses_by_student(student)):
+            problems.append(f"{student.student_id}: enrolled courses and enrollment index disagree")
+
+    print(f"{operations} operations on {workers} threads in {elapsed:.2f}s "
+          f"({operations / elapsed:.0f} ops/s): {len(problems)} invariant violations")
+    for problem in problems[:20]:
+        print(f"  {problem}")
+    return problems
+
+
+def bench_schedule_conflicts(n_courses=5_000, n_students=50_000, courses_per_student=4, checks=100_000, seed=42):
+    """
+    Time per-enrollment conflict checks against the per-student interval index, and the
+    catalogue-wide conflict report (one sweep over the schedules plus roster matching).
+    """
+    rng = random.Random(seed)
+    days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Mon/Wed', 'Tue/Thu']
+    admin = PlatformAdmin()
+    instructors = [Instructor(f"Instructor {i}", f"i{i}@example.com", "5550000000", "Hall", f"I{i:05d}")
+                   for i in range(n_courses // 5)]
+    for instructor in instructors:
+        admin.add_instructor(instructor)
+    for i in range(n_courses):
+        course = Course(f"Course {i}", f"C{i:05d}", rng.choice(instructors), 3)
+        hour = rng.randint(7, 19)
+        course.schedule = Schedule(course, rng.choice(days), f"{hour:02d}:00 - {hour + rng.randint(1, 2):02d}:00")
+        admin.add_course(course)
+    for i in range(n_students):
+        student = Student(f"Student {i}", f"s{i}@example.com", "5550000000", "Campus", f"S{i:07d}", "Freshman", "CS")
+        for course in rng.sample(admin.courses, courses_per_student):
+            student.enroll(course)
+        admin.add_student(student)
+    pairs = [(rng.choice(admin.students), rng.choice(admin.courses)) for _ in range(checks)]
+    start = time.perf_counter()
+    clashes = sum(1 for student, course in pairs if admin.enrollments.schedule_conflicts(student, course))
+    check_time = time.perf_counter() - start
+    start = time.perf_counter()
+    report = admin.schedule_conflict_report()
+    report_time = time.perf_counter() - start
+    viewers = rng.sample(admin.students, min(10_000, n_students))
+    start = time.perf_counter()
+    for student in viewers:
+        admin.student_timetable(student)
+    timetable_time = time.perf_counter() - start
+    course = rng.choice(admin.courses)
+    start = time.perf_counter()
+    admin.set_schedule(course, 'Saturday', '09:00 - 12:00')
+    reschedule_time = time.perf_counter() - start
+    print(f"{checks} conflict checks: {check_time / checks * 1e6:.2f} us/check ({clashes} clashes)")
+    print(f"conflict report over {n_courses} courses / {n_students} students: {report_time:.2f}s, "
+          f"{len(report)} conflicts")
+    print(f"timetable view: {timetable_time / len(viewers) * 1e6:.2f} us/student; "
+          f"rescheduling one course: {reschedule_time * 1e3:.2f} ms")
+    return check_time / checks, report_time
+
+
+def bench_announcements(n_announcements=100_000, views=1_000, seed=42):
+    """
+    Compare a role's first page of announcements from AnnouncementStore's inverted index
+    with the old full scan of the announcements list.
+    """
+    rng = random.Random(seed)
+    groups = ['Student', 'Instructor', 'Admin']
+    store = AnnouncementStore()
+    for i in range(n_announcements):
+        store.append(Announcement(f"Announcement {i}", "content", f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                                  rng.sample(groups, rng.randint(1, 2))))
+    announcements = list(store)
+    start = time.perf_counter()
+    for _ in range(views // 100):
+        [a for a in announcements if 'Instructor' in a.recipient_groups]
+    scan_time = (time.perf_counter() - start) / (views // 100)
+    start = time.perf_counter()
+    for _ in range(views):
+        store.page('Instructor', limit=20)
+    page_time = (time.perf_counter() - start) / views
+    print(f"{n_announcements} announcements: list scan {scan_time * 1e3:.2f} ms/view, "
+          f"indexed page {page_time * 1e6:.2f} us/view")
+    return scan_time, page_time
+
+
+def bench_due_dates(n_assignments=200_000, n_courses=2_000, courses_per_student=5, views=1_000, seed=42):
+    """
+    Compare "due this week in my courses" from DueDateIndex with a walk over every course's
+    assignments list, and time insertions and the overdue sweep.
+    """
+    rng = random.Random(seed)
+    instructor = Instructor("Bench Instructor", "bench@example.com", "5550000000", "Bench Hall", "I-BENCH")
+    courses = [Course(f"Course {i}", f"C{i:05d}", instructor, 3) for i in range(n_courses)]
+    now = datetime(2025, 1, 1)
+    index = DueDateIndex()
+    start = time.perf_counter()
+    for i in range(n_assignments):
+        course = courses[rng.randrange(n_courses)]
+        assignment = Assignment(f"Assignment {i}", "", now + timedelta(minutes=rng.randrange(-60 * 24 * 180, 60 * 24 * 180)), course)
+        course.add_assignment(assignment)
+        index.add(assignment)
+    insert_time = (time.perf_counter() - start) / n_assignments
+    week = now + timedelta(days=7)
+    student_courses = [[c.course_code for c in rng.sample(courses, courses_per_student)] for _ in range(views)]
+    start = time.perf_counter()
+    for codes in student_courses[:views // 10]:
+        [a for c in courses if c.course_code in codes for a in c.assignments if now <= a.due_date < week]
+    scan_time = (time.perf_counter() - start) / (views // 10)
+    start = time.perf_counter()
+    for codes in student_courses:
+        index.between(now, week, codes)
+    indexed_time = (time.perf_counter() - start) / views
+    start = time.perf_counter()
+    swept = sum(len(index.sweep(now + timedelta(hours=hour))) for hour in range(24 * 7))
+    sweep_time = (time.perf_counter() - start) / (24 * 7)
+    print(f"{n_assignments} assignments: insert {insert_time * 1e6:.2f} us, course walk {scan_time * 1e3:.2f} ms/view, "
+          f"indexed {indexed_time * 1e6:.2f} us/view, hourly sweep {sweep_time * 1e6:.2f} us ({swept} swept)")
+    return insert_time, scan_time, indexed_time, sweep_time
+
+
+def bench_gpa(n_students=100_000, n_courses=500, courses_per_student=5, assignments_per_course=10, seed=42):
+    """
+    Time the GPA engine's O(1) update per grade as gradebooks fill, then a full recompute of
+    every student's GPA (the term-close batch path).
+    """
+    rng = random.Random(seed)
+    instructor = Instructor("Bench Instructor", "bench@example.com", "5550000000", "Bench Hall", "I-BENCH")
+    courses = [Course(f"Course {i}", f"C{i:05d}", instructor, rng.randint(1, 5)) for i in range(n_courses)]
+    engine = GpaEngine()
+    for course in courses:
+        course.gradebook.listener = engine.listener(course)
+    grades = [(f"S{s:07d}", course, f"Assignment {a}", rng.uniform(50, 100))
+              for s in range(n_students) for course in rng.sample(courses, courses_per_student)
+              for a in range(assignments_per_course)]
+    start = time.perf_counter()
+    for student_id, course, title, score in grades:
+        course.gradebook.add(student_id, title, score)
+    update_time = (time.perf_counter() - start) / len(grades)
+    incremental = {f"S{s:07d}": engine.cumulative_gpa(f"S{s:07d}") for s in range(0, n_students, 997)}
+    start = time.perf_counter()
+    engine.recompute(courses)
+    recompute_time = time.perf_counter() - start
+    if any(engine.cumulative_gpa(student_id) != gpa for student_id, gpa in incremental.items()):
+        print("  MISMATCH between incremental and recomputed GPAs")
+    print(f"{len(grades)} grades for {n_students} students: {update_time * 1e6:.2f} us/grade incl. GPA update, "
+          f"full recompute {recompute_time:.2f} s")
+    return update_time, recompute_time
+
+
+def bench_gradebook_io(n_rows=50_000, n_assignments=10, error_rate=0.01, seed=42):
+    """
+    Import a course gradebook of `n_rows` grades (with a share of out-of-range scores) from CSV
+    and from JSON-lines, then export it again, timing both.
+    """
+    rng = random.Random(seed)
+    directory = tempfile.mkdtemp(prefix='grades-')
+    try:
+        results = {}
+        for format in ('csv', 'jsonl'):
+            admin = PlatformAdmin()
+            instructor = Instructor("Bench Instructor", "bench@example.com", "5550000000", "Bench Hall", "I-BENCH")
+            admin.add_instructor(instructor)
+            course = Course("Bench Course", "C00001", instructor, 3)
+            admin.add_course(course)
+            for i in range(n_assignments):
+                course.add_assignment(Assignment(f"A{i}", "", datetime(2030, 1, 1), course))
+            n_students = n_rows // n_assignments
+            students = [Student(f"Student {i}", f"s{i}@example.com", "5550000000", "Campus", f"S{i:07d}",
+                                "Freshman", "CS") for i in range(n_students)]
+            for student in students:
+                admin.add_student(student)
+            admin.enrollments.enroll_many((student, course) for student in students)
+            filename = f"{directory}/grades.{format}"
+            with open(filename, 'w', encoding='utf-8', newline='') as f:
+                rows = ((s.student_id, f"A{a}", rng.uniform(0, 100) if rng.random() > error_rate else 150)
+                        for s in students for a in range(n_assignments))
+                if format == 'csv':
+                    f.write('student_id,assignment_title,score,feedback\n')
+                    f.writelines(f"{sid},{title},{score:.1f},\n" for sid, title, score in rows)
+                else:
+                    f.writelines(json.dumps({'student_id': sid, 'assignment_title': title, 'score': score}) + '\n'
+                                 for sid, title, score in rows)
+            with events.use_sink(events.NullSink()):
+                start = time.perf_counter()
+                result = gradebook_io.import_grades(admin, course, filename)
+                import_time = time.perf_counter() - start
+                start = time.perf_counter()
+                gradebook_io.export_grades(course, filename)
+                export_time = time.perf_counter() - start
+            print(f"{format:>5}: import {result.rows} rows in {import_time:.2f} s ({result.summary()}), "
+                  f"export in {export_time:.2f} s")
+            results[format] = (import_time, export_time)
+        return results
+    finally:
+        shutil.rmtree(directory)
+
+
+def bench_reports(n_courses=1_000, students_per_course=100, assignments_per_course=5, changed=10, seed=42):
+    """
+    Time the course report pipeline: a full build in one process, a full build over the process
+    pool, and an incremental run after grades change in `changed` courses.
+    """
+    rng = random.Random(seed)
+    admin = PlatformAdmin()
+    instructors = [Instructor(f"Instructor {i}", f"i{i}@example.com", "5550000000", "Bench Hall", f"I{i:04d}")
+                   for i in range(n_courses // 5)]
+    for instructor in instructors:
+        admin.add_instructor(instructor)
+    students = [Student(f"Student {i}", f"s{i}@example.com", "5550000000", "Campus", f"S{i:07d}", "Freshman", "CS")
+                for i in range(n_courses * students_per_course // 4)]
+    for student in students:
+        admin.add_student(student)
+    for i in range(n_courses):
+        course = Course(f"Course {i}", f"C{i:05d}", instructors[i % len(instructors)], rng.randint(1, 5))
+        admin.add_course(course)
+        for a in range(assignments_per_course):
+            course.add_assignment(Assignment(f"A{a}", "", datetime(2030, 1, 1), course))
+        for student in rng.sample(students, students_per_course):
+            admin.enrollments.add_existing(student, course)
+            for a in range(assignments_per_course):
+                if rng.random() < 0.9:
+                    course.gradebook.add(student.student_id, f"A{a}", rng.uniform(40, 100))
+    directory = tempfile.mkdtemp(prefix='reports-')
+    try:
+        with events.use_sink(events.NullSink()):
+            timings = {}
+            for label, workers in (('sequential', 1), ('process pool', None)):
+                start = time.perf_counter()
+                admin.generate_reports(directory, workers=workers, incremental=False)
+                timings[label] = time.perf_counter() - start
+            for course in rng.sample(admin.courses, changed):
+                student_id = course.gradebook.student_ids[0]
+                course.gradebook.add(student_id, "A0", rng.uniform(40, 100))
+            start = time.perf_counter()
+            run = admin.generate_reports(directory)
+            timings['incremental'] = time.perf_counter() - start
+    finally:
+        shutil.rmtree(directory)
+    print(f"{n_courses} courses: " + ', '.join(f"{label} {seconds:.2f} s" for label, seconds in timings.items())
+          + f" ({run.summary()})")
+    return timings
+
+
+def bench_discussion(n_posts=50_000, page=20, seed=42):
+    """
+    Time appends to an on-disk discussion thread, reopening the store, listing the thread
+    (count and last activity) and reading pages at the end and deep in the history.
+    """
+    rng = random.Random(seed)
+    directory = tempfile.mkdtemp(prefix='posts-')
+    try:
+        store = PostStore(directory)
+        thread_id = store.create_thread('C00001', 'Busy thread', 'I-BENCH', 'Instructor')['thread_id']
+        start = time.perf_counter()
+        for i in range(n_posts):
+            store.append(thread_id, f"S{rng.randrange(10_000):07d}", 'Student', f"Post number {i}")
+        append_time = time.perf_counter() - start
+        store.close()
+        start = time.perf_counter()
+        store = PostStore(directory)
+        open_time = time.perf_counter() - start
+        start = time.perf_counter()
+        count, last = store.count(thread_id), store.last_activity(thread_id)
+        listing_time = time.perf_counter() - start
+        start = time.perf_counter()
+        store.read(thread_id, count - page + 1, count)
+        latest_time = time.perf_counter() - start
+        post_id = rng.randrange(page, count // 2)
+        start = time.perf_counter()
+        store.read(thread_id, post_id - page, post_id - 1)
+        deep_time = time.perf_counter() - start
+        store.close()
+    finally:
+        shutil.rmtree(directory)
+    print(f"{n_posts} posts: append {append_time / n_posts * 1e6:.1f} us/post, reopen {open_time * 1e3:.2f} ms, "
+          f"listing {listing_time * 1e6:.1f} us, latest page {latest_time * 1e6:.1f} us, "
+          f"page before #{post_id} {deep_time * 1e3:.2f} ms")
+    return append_time / n_posts, open_time, latest_time, deep_time
+
+
+def bench_search(n_posts=1_000_000, n_courses=200, vocabulary=20_000, words_per_post=12, queries=200, seed=42):
+    """
+    Index synthetic posts (Zipf-like word frequencies) into a SearchIndex, then time ranked
+    queries across every course and scoped to one course, saving and reloading the index.
+    """
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(vocabulary)]
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(vocabulary)))
+    courses = [f"C{i:05d}" for i in range(n_courses)]
+    texts = [' '.join(rng.choices(words, cum_weights=cum_weights, k=words_per_post)) for _ in range(n_posts)]
+    index = SearchIndex()
+    start = time.perf_counter()
+    for i, text in enumerate(texts):
+        thread_id = i % (n_courses * 10) + 1
+        index.add_post(thread_id, courses[thread_id % n_courses], i // (n_courses * 10) + 1, text)
+    index_time = time.perf_counter() - start
+    query_words = [words[rng.randrange(10, 2_000)] for _ in range(queries * 2)]
+    query_list = [f"{query_words[2 * i]} {query_words[2 * i + 1]}" for i in range(queries)]
+
+    def time_queries(idx, scoped):
+        start = time.perf_counter()
+        for i, query in enumerate(query_list):
+            idx.search(query, courses=[courses[i % n_courses]] if scoped else None, limit=10)
+        return (time.perf_counter() - start) / queries
+
+    query_time, scoped_time = time_queries(index, False), time_queries(index, True)
+    directory = tempfile.mkdtemp(prefix='search-')
+    try:
+        filename = f"{directory}/data.search"
+        start = time.perf_counter()
+        index.save(filename)
+        save_time = time.perf_counter() - start
+        start = time.perf_counter()
+        loaded = SearchIndex.load(filename)
+        load_time = time.perf_counter() - start
+    finally:
+        shutil.rmtree(directory)
+    loaded_time = time_queries(loaded, False)
+    print(f"{n_posts} posts: index {index_time / n_posts * 1e6:.1f} us/post, query {query_time * 1e3:.2f} ms, "
+          f"scoped query {scoped_time * 1e3:.2f} ms, save {save_time:.2f} s, load {load_time:.2f} s, "
+          f"query after load {loaded_time * 1e3:.2f} ms")
+    return index_time / n_posts, query_time, scoped_time, load_time
+
+
+RESULTS_FILE = 'benchmark_results.jsonl'
+REGRESSION_THRESHOLD = 0.10  # Flag operations more than 10% slower than the previous recorded run
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _time_calls(fn, args_list):
+    """Mean seconds per call of fn(*args) over args_list, with printed output discarded."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for args in args_list:
+            fn(*args)
+        return (time.perf_counter() - start) / max(1, len(args_list))
+
+
+def bench_core(sizes=(10_000, 100_000), calls=1_000, memory=True, results_file=RESULTS_FILE, seed=42):
+    """
+    Benchmark suite for the core operations on generated data sets: PlatformAdmin.load_data and
+    save_data, Enrollment.enroll_student and the view_student_grades, view_enrolled_students and
+    display_all_schedules menu views. With `memory`, the loaded object graph's footprint (the
+    __slots__ classes) is measured with tracemalloc in a second load.
+
+    Each run appends one JSON line per size to `results_file` (commit, Python version, timings),
+    and timings are compared with the previous run of the same size so regressions stand out.
+    """
+    previous = {}
+    if os.path.exists(results_file):
+        with open(results_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                previous[record.get('students')] = record
+    commit = _commit()
+    for size in sizes:
+        rng = random.Random(seed)
+        directory = tempfile.mkdtemp(prefix='bench-core-')
+        try:
+            filename = os.path.join(directory, 'data.json')
+            start = time.perf_counter()
+            counts = datagen.generate(filename, size, seed=seed)
+            generate_time = time.perf_counter() - start
+            results = {}
+            with events.use_sink(events.NullSink()):
+                admin = PlatformAdmin()
+                start = time.perf_counter()
+                admin.load_data(filename)
+                results['load_data'] = time.perf_counter() - start
+                start = time.perf_counter()
+                admin.save_data(os.path.join(directory, 'saved.json'))
+                results['save_data'] = time.perf_counter() - start
+
+                pairs = []
+                while len(pairs) < calls:
+                    student, course = rng.choice(admin.students), rng.choice(admin.courses)
+                    if not admin.enrollments.is_student_enrolled(student, course):
+                        pairs.append((student, course))
+                results['enroll_student'] = _time_calls(admin.enrollments.enroll_student, pairs)
+                environment = E_Learning_Environment(admin)
+                results['view_student_grades'] = _time_calls(
+                    environment.view_student_grades, [(rng.choice(admin.students),) for _ in range(calls)])
+                results['view_enrolled_students'] = _time_calls(
+                    environment.view_enrolled_students, [(rng.choice(admin.instructors),) for _ in range(calls // 10)])
+                results['display_all_schedules'] = _time_calls(environment.display_all_schedules, [()] * 10)
+
+                if memory:
+                    del admin, environment
+                    tracemalloc.start()
+                    admin = PlatformAdmin()
+                    admin.load_data(filename)
+                    current, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+                    del admin
+        finally:
+            shutil.rmtree(directory)
+
+        record = {'timestamp': datetime.now().isoformat(timespec='seconds'), 'commit': commit,
+                  'python': platform.python_version(), 'numpy': 'numpy' in sys.modules, 'students': size,
+                  'records': counts, 'generate_s': round(generate_time, 3),
+                  'seconds': {op: round(seconds, 6) for op, seconds in results.items()}}
+        if memory:
+            record['memory'] = {'graph_bytes': current, 'peak_bytes': peak,
+                                'bytes_per_student': round(current / size)}
+        print(f"\n{size} students ({counts['courses']} courses, {counts['enrollments']} enrollments, "
+              f"{counts['grades']} grades), commit {commit or 'unknown'}:")
+        baseline = previous.get(size, {}).get('seconds', {})
+        for op, seconds in record['seconds'].items():
+            change = ''
+            if baseline.get(op):
+                delta = seconds / baseline[op] - 1
+                change = f" ({delta:+.0%} vs {previous[size].get('commit') or 'previous run'})"
+                if delta > REGRESSION_THRESHOLD:
+                    change += "  <-- slower"
+            unit = f"{seconds:.3f} s" if seconds >= 0.1 else f"{seconds * 1e3:.3f} ms"
+            print(f"  {op:<24} {unit:>12}{change}")
+        if memory:
+            print(f"  {'object graph':<24} {current / 2 ** 20:>9.1f} MB ({record['memory']['bytes_per_student']} "
+                  f"bytes/student, peak {peak / 2 ** 20:.1f} MB)")
+        with open(results_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+    return previous
+
+
+async def _load_client(host, port, login, commands, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for line in [login] + commands + ['QUIT']:
+            start = time.perf_counter()
+            writer.write(line.encode('utf-8') + b'\n')
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            latencies.append((line.split(' ', 1)[0], time.perf_counter() - start, response['ok']))
+    finally:
+        writer.close()
+
+
+async def _run_load(host, port, platform_admin, clients, requests_per_client, seed):
+    rng = random.Random(seed)
+    student_ops = ['GRADES', 'COURSES', 'SCHEDULES', 'THREADS', 'ANNOUNCEMENTS']
+    instructor_ops = ['STUDENTS', 'COURSES', 'SCHEDULES', 'THREADS', 'ANNOUNCEMENTS']
+    course_names = [c.course_name for c in platform_admin.courses]
+    scripts = []
+    for i in range(clients):
+        if i % 10 == 0 and platform_admin.instructors:
+            instructor = rng.choice(platform_admin.instructors)
+            login, ops = f"LOGIN instructor|{instructor.name}", instructor_ops
+        else:
+            login, ops = f"LOGIN student|{rng.choice(platform_admin.students).name}", student_ops
+            ops = ops + [f"ENROLL {name}" for name in course_names]
+        scripts.append((login, [rng.choice(ops) for _ in range(requests_per_client)]))
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_load_client(host, port, login, commands, latencies) for login, commands in scripts))
+    return latencies, time.perf_counter() - start
+
+
+def bench_instrumentation(n_grades=200_000, seed=42):
+    """
+    Overhead of the instrumentation layer on Course.add_grade, a short hot-path operation:
+    never enabled, enabled, and after disable() again.
+    """
+    rng = random.Random(seed)
+    instructor = Instructor("Bench Instructor", "bench@example.com", "5550000000", "Bench Hall", "I-BENCH")
+    course = Course("Course 0", "C00000", instructor, 3)
+    students = [Student(f"Student {i}", f"s{i}@example.com", "5550000000", "Campus", f"S{i:07d}", "Freshman", "CS")
+                for i in range(n_grades)]
+
+    def run():
+        # A fresh assignment per run, so every grade is a new insert
+        assignment = Assignment(f"A{len(course.assignments)}", "", datetime(2030, 1, 1), course)
+        course.add_assignment(assignment)
+        grades = [Grade(student, assignment, rng.uniform(0, 100)) for student in students]
+        start = time.perf_counter()
+        for grade in grades:
+            course.add_grade(grade)
+        return (time.perf_counter() - start) / n_grades
+
+    with events.use_sink(events.NullSink()):
+        baseline = run()
+        instrumentation.reset()
+        instrumentation.enable()
+        try:
+            enabled = run()
+        finally:
+            instrumentation.disable()
+        disabled = run()
+    row = instrumentation.snapshot()['operations']['Course.add_grade']
+    print(f"add_grade: {baseline * 1e6:.2f} us plain, {enabled * 1e6:.2f} us instrumented "
+          f"(p50 {row['p50_ms'] * 1e3:.1f} us, p99 {row['p99_ms'] * 1e3:.1f} us), {disabled * 1e6:.2f} us after disable")
+    instrumentation.reset()
+    return baseline, enabled, disabled
+
+
+def bench_lazy_start(sizes=(10_000, 100_000), sessions=100, seed=42):
+    """
+    Cold start of the menu with the eager load against the lazy offset-index backend: the first
+    lazy open (which builds data.idx with one scan), a warm open, a student session (log in
+    by name, grades, timetable) on the lazy platform, and the lazy save.
+    """
+    for size in sizes:
+        rng = random.Random(seed)
+        directory = tempfile.mkdtemp(prefix='bench-lazy-')
+        try:
+            filename = os.path.join(directory, 'data.json')
+            datagen.generate(filename, size, seed=seed)
+            with events.use_sink(events.NullSink()):
+                start = time.perf_counter()
+                eager = PlatformAdmin()
+                eager.load_data(filename)
+                eager_time = time.perf_counter() - start
+                names = [rng.choice(eager.students).name for _ in range(sessions)]
+                del eager
+                timings = []
+                for _ in range(2):  # The first open builds the offset index
+                    start = time.perf_counter()
+                    admin = PlatformAdmin(storage=LazyJsonStorage(filename))
+                    admin.load_data(filename)
+                    E_Learning_Environment(admin)
+                    timings.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                for name in names:
+                    student = admin.find_student_by_name(name)
+                    admin.enrollments.get_courses_by_student(student)
+                    admin.student_timetable(student)
+                session_time = (time.perf_counter() - start) / sessions
+                hydrated = len(admin.registry.students), len(admin.registry.courses)
+                start = time.perf_counter()
+                admin.save_data(filename)
+                save_time = time.perf_counter() - start
+                admin.storage.close()
+        finally:
+            shutil.rmtree(directory)
+        print(f"{size} students: eager load {eager_time:.2f} s, lazy first open {timings[0]:.2f} s, "
+              f"warm open {timings[1] * 1e3:.1f} ms, student session {session_time * 1e3:.2f} ms, "
+              f"save {save_time:.2f} s ({hydrated[0]} students, {hydrated[1]} courses hydrated)")
+
+
+def bench_server(clients=1_000, requests_per_client=20, host=None, port=None, filename='data.json', seed=42):
+    """
+    Local load generator for server.py: `clients` concurrent connections each log in and send
+    `requests_per_client` menu commands, and the client-side round-trip latency is reported per command.
+    Without host/port an in-process server is started on a free port over `filename` (never saved).
+    """
+    platform_admin = PlatformAdmin()
+    with events.use_sink(events.NullSink()):
+        platform_admin.load_data(filename)
+
+    async def main():
+        if host is not None:
+            return await _run_load(host, port or server.PORT, platform_admin, clients, requests_per_client, seed)
+        instance = server.ELearningServer(platform_admin, port=0, save_on_exit=False)
+        await instance.start()
+        try:
+            return await _run_load(instance.host, instance.port, platform_admin, clients, requests_per_client, seed)
+        finally:
+            await instance.stop()
+
+    latencies, elapsed = asyncio.run(main())
+    stats = server.LatencyStats(window=len(latencies) or 1)
+    for op, seconds, ok in latencies:
+        stats.record(op, seconds, ok)
+    print(f"{clients} clients, {len(latencies)} requests in {elapsed:.2f}s ({len(latencies) / elapsed:.0f} req/s)")
+    stats.display()
+    return stats.summary()
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['core']:
+        # python benchmarks.py core [students ...]: only the core suite, recorded to benchmark_results.jsonl
+        bench_core(tuple(int(arg) for arg in sys.argv[2:]) or (10_000, 100_000))
+        sys.exit(0)
+    sizes = tuple(int(arg) for arg in sys.argv[1:]) or (10_000, 100_000, 1_000_000)
+    bench_enrollment_checks(sizes)
+    bench_bulk_enroll()
+    stress_concurrency()
+    bench_schedule_conflicts()
+    bench_announcements()
+    bench_due_dates()
+    bench_gpa()
+    bench_gradebook_io()
+    bench_reports()
+    bench_discussion()
+    bench_search()
+    bench_instrumentation()
+    bench_lazy_start()
+    bench_server()
+    bench_core()
@@ -0,0 +1,240 @@
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+from typing import Iterator, Tuple
+
+MAGIC = b'ELSNAP'
+VERSION = 2  # Version 1 snapshots (no announcement IDs) are still read
+NONE = 0xFFFFFFFF  # String index / row reference standing for a missing value
+
+# Column kinds: 's' interned string, 'i' integer, 'f' float, 'j' JSON value stored as an
+# interned string, ('r', section, key) integer reference to a row of an earlier section.
+SCHEMA = (
+    ('instructors', (('instructor_id', 's'), ('name', 's'), ('email', 's'), ('contact_number', 's'),
+                     ('address', 's'), ('role', 's'))),
+    ('courses', (('course_name', 's'), ('course_code', 's'),
+                 ('instructor_id', ('r', 'instructors', 'instructor_id')), ('units', 'i'))),
+    ('students', (('name', 's'), ('email', 's'), ('contact_number', 's'), ('address', 's'),
+                  ('student_id', 's'), ('year_level', 's'), ('program', 's'), ('gpa', 'f'), ('birth_date', 's'))),
+    ('enrollments', (('student_id', ('r', 'students', 'student_id')),
+                     ('course_code', ('r', 'courses', 'course_code')))),
+    ('schedules', (('course_code', ('r', 'courses', 'course_code')), ('day', 's'), ('time', 's'))),
+    ('assignments', (('course_code', ('r', 'courses', 'course_code')), ('title', 's'),
+                     ('description', 's'), ('due_date', 's'))),
+    ('grades', (('course_code', ('r', 'courses', 'course_code')), ('student_id', ('r', 'students', 'student_id')),
+                ('assignment_title', 's'), ('score', 'f'), ('feedback', 's'))),
+    ('announcements', (('announcement_id', 'i'), ('title', 's'), ('content', 's'), ('date', 's'),
+                       ('recipient_groups', 'j'))),
+    ('admins', (('email', 's'), ('password', 's'))),
+)
+
+_TYPECODES = {'s': 'I', 'j': 'I', 'i': 'q', 'f': 'd'}
+_REFERENCED = {(kind[1], kind[2]) for _, columns in SCHEMA for _, kind in columns if isinstance(kind, tuple)}
+
+
+def _schema(version: int):
+    """The SCHEMA of a snapshot version: version 1 predates the announcement_id column."""
+    if version == 1:
+        return tuple((section, tuple(column for column in columns if column[0] != 'announcement_id'))
+                     for section, columns in SCHEMA)
+    return SCHEMA
+
+
+def _typecode(kind) -> str:
+    return 'I' if isinstance(kind, tuple) else _TYPECODES[kind]
+
+
+def _to_le(arr: array) -> bytes:
+    if sys.byteorder == 'big':
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _from_le(typecode: str, data: bytes) -> array:
+    arr = array(typecode)
+    arr.frombytes(data)
+    if sys.byteorder == 'big':
+        arr.byteswap()
+    return arr
+
+
+def sidecar_path(json_filename: str) -> str:
+    """Binary snapshot kept next to a JSON data file (data.json -> data.snap)."""
+    return os.path.splitext(json_filename)[0] + '.snap'
+
+
+def encode(data: dict) -> bytes:
+    """Encode a data.json-style dict (see PlatformAdmin.snapshot_data) into the binary format."""
+    strings = {}
+
+    def intern(value) -> int:
+        if value is None:
+            return NONE
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        return index
+
+    # Students listed only through embedded enrolled_courses still need enrollment rows
+    enrollments = list(data.get('enrollments', []))
+    seen = {(e['student_id'], e['course_code']) for e in enrollments}
+    for student_data in data.get('students', []):
+        for course_data in student_data.get('enrolled_courses', []):
+            key = (student_data['student_id'], course_data['course_code'])
+            if key not in seen:
+                seen.add(key)
+                enrollments.append({'student_id': key[0], 'course_code': key[1]})
+    sections = dict(data, enrollments=enrollments)
+
+    row_index = {}  # (section, key, value) -> row number
+    body = []
+    for section, columns in SCHEMA:
+        rows = sections.get(section, [])
+        body.append(struct.pack('<II', intern(section), len(rows)))
+        for field, kind in columns:
+            column = array(_typecode(kind))
+            for row in rows:
+                value = row.get(field)
+                if kind == 's':
+                    column.append(intern(None if value is None else str(value)))
+                elif kind == 'j':
+                    column.append(intern(json.dumps(value, separators=(',', ':'))))
+                elif kind == 'i':
+                    column.append(int(value or 0))
+                elif kind == 'f':
+                    column.append(float(value or 0.0))
+                else:
+                    column.append(row_index.get((kind[1], kind[2], value), NONE))
+            body.append(_to_le(column))
+        for field, _ in columns:
+            if (section, field) in _REFERENCED:
+                for position, row in enumerate(rows):
+                    row_index[(section, field, row.get(field))] = position
+
+    encoded = [s.encode('utf-8') for s in strings]
+    lengths = array('I', (len(s) for s in encoded))
+    blob = b''.join(encoded)
+    header = MAGIC + struct.pack('<HQIQ', VERSION, data.get('journal_seq', 0), len(encoded), len(blob))
+    return b''.join([header, _to_le(lengths), blob] + body)
+
+
+def iter_records(filename: str) -> Iterator[Tuple[str, object]]:
+    """Yield (section, record) pairs from a binary snapshot, like json_stream.iter_sections."""
+    with open(filename, 'rb') as f:
+        buf = f.read()
+    if buf[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"'{filename}' is not a binary snapshot.")
+    offset = len(MAGIC)
+    version, journal_seq, n_strings, blob_size = struct.unpack_from('<HQIQ', buf, offset)
+    if version not in (1, VERSION):
+        raise ValueError(f"Unsupported snapshot version {version} (expected {VERSION}).")
+    offset += struct.calcsize('<HQIQ')
+    lengths = _from_le('I', buf[offset:offset + 4 * n_strings])
+    offset += 4 * n_strings
+    strings = []
+    position = offset
+    for length in lengths:
+        strings.append(buf[position:position + length].decode('utf-8'))
+        position += length
+    offset += blob_size
+
+    decoded = {}  # section -> {field: column values}
+    for section, columns in _schema(version):
+        _, n_rows = struct.unpack_from('<II', buf, offset)
+        offset += 8
+        values = {}
+        for field, kind in columns:
+            typecode = _typecode(kind)
+            size = array(typecode).itemsize * n_rows
+            column = _from_le(typecode, buf[offset:offset + size])
+            offset += size
+            if kind == 's':
+                values[field] = [None if i == NONE else strings[i] for i in column]
+            elif kind == 'j':
+                values[field] = [json.loads(strings[i]) for i in column]
+            elif kind in ('i', 'f'):
+                values[field] = column.tolist()
+            else:
+                target = decoded[kind[1]][kind[2]]
+                values[field] = [None if i == NONE else target[i] for i in column]
+        decoded[section] = values
+        fields = [field for field, _ in columns]
+        for row in zip(*(values[field] for field in fields)):
+            # Fields missing from the source record are left out, so loaders apply the same defaults as for JSON
+            yield section, {field: value for field, value in zip(fields, row) if value is not None}
+    yield 'journal_seq', journal_seq
+
+
+def to_dict(filename: str) -> dict:
+    """Decode a binary snapshot back into a data.json-style dict."""
+    data = {section: [] for section, _ in SCHEMA}
+    for section, record in iter_records(filename):
+        if section == 'journal_seq':
+            data[section] = record
+        else:
+            data[section].append(record)
+    return data
+
+
+def write(data: dict, filename: str) -> None:
+    """Write a binary snapshot atomically."""
+    tmp_filename = filename + '.tmp'
+    with open(tmp_filename, 'wb') as f:
+        f.write(encode(data))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_filename, filename)
+
+
+def json_to_binary(json_filename: str, binary_filename: str) -> None:
+    with open(json_filename, 'r') as f:
+        write(json.load(f), binary_filename)
+
+
+def binary_to_json(binary_filename: str, json_filename: str) -> None:
+    with open(json_filename, 'w') as f:
+        json.dump(to_dict(binary_filename), f, indent=4)
+
+
+def compare_startup(json_filename: str, repeat: int = 3) -> None:
+    """Time PlatformAdmin.load_data from the JSON file and from its binary sidecar."""
+    import contextlib
+    import io
+    from platform_admin import PlatformAdmin
+
+    binary_filename = sidecar_path(json_filename)
+    json_to_binary(json_filename, binary_filename)
+    results = {}
+    for label, kwargs in (('json', {'binary': False}), ('binary', {'binary': True})):
+        best = float('inf')
+        for _ in range(repeat):
+            admin = PlatformAdmin()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                admin.load_data(json_filename, **kwargs)
+            best = min(best, time.perf_counter() - start)
+        results[label] = best
+    print(f"JSON   ({os.path.getsize(json_filename)} bytes): {results['json'] * 1000:.1f} ms")
+    print(f"Binary ({os.path.getsize(binary_filename)} bytes): {results['binary'] * 1000:.1f} ms")
+    if results['binary']:
+        print(f"Speed-up: {results['json'] / results['binary']:.2f}x")
+
+
+if __name__ == "__main__":
+    usage = ("Usage: python binary_snapshot.py to-binary <data.json> [<data.snap>]\n"
+             "       python binary_snapshot.py to-json <data.snap> <data.json>\n"
+             "       python binary_snapshot.py compare <data.json>")
+    if len(sys.argv) < 3:
+        print(usage)
+    elif sys.argv[1] == 'to-binary':
+        json_to_binary(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else sidecar_path(sys.argv[2]))
+    elif sys.argv[1] == 'to-json' and len(sys.argv) > 3:
+        binary_to_json(sys.argv[2], sys.argv[3])
+    elif sys.argv[1] == 'compare':
+        compare_startup(sys.argv[2])
+    else:
+        print(usage)
@@ -1,40 +1,112 @@
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from assignment import Assignment  # Ensure Assignment class is defined and imported
 from grade import Grade            # Ensure Grade class is defined and imported
+from gradebook import Gradebook
 from student import Student        # Ensure Student class is defined and imported
 from instructor import Instructor  # Ensure Instructor class is defined and imported
+import journal
+import search_index
+import events
+import locks
+
+class Roster:
+    """
+    A course's enrolled students in enrollment order, used like the list it replaces. It is backed
+    by an insertion-ordered dict, so membership tests, appends and removals are O(1).
+    """
+    __slots__ = ('_students',)
+
+    def __init__(self, students=()):
+        self._students: Dict['Student', None] = dict.fromkeys(students)
+
+    def __len__(self) -> int:
+        return len(self._students)
+
+    def __iter__(self):
+        return iter(list(self._students))  # Snapshot, so concurrent enrollments cannot break iteration
+
+    def __contains__(self, student) -> bool:
+        return student in self._students
+
+    def append(self, student: 'Student') -> None:
+        self._students[student] = None
+
+    def remove(self, student: 'Student') -> None:
+        """:raises ValueError: If the student is not on the roster."""
+        try:
+            del self._students[student]
+        except KeyError:
+            raise ValueError("Student is not on the roster.") from None
 
 class Course:
+    __slots__ = ('__course_name', '__course_code', '__instructor', '_units', 'assignments', 'grades',
+                 'enrolled_students', 'discussion_threads', 'schedule', 'gradebook', 'due_index',
+                 '_assignments_by_title')
 
     def __init__(self, course_name: str, course_code: str, instructor: 'Instructor', units: int):
         self.__course_name = course_name
         self.__course_code = course_code
         self.__instructor = instructor
-        self._students: List['Student'] = []  # List to hold students
         self._units = units
         self.assignments: List['Assignment'] = []  # Initialize assignments list
+        self._assignments_by_title: Dict[str, 'Assignment'] = {}  # title -> first assignment with that title
         self.grades = {}  # Store grades in a dictionary
-        self.enrolled_students = []
+        self.gradebook = Gradebook()  # Columnar copy of the scores for statistics
+        self.enrolled_students = Roster()  # Enrolled students, in enrollment order
         self.discussion_threads = []  # List to store discussion threads for the course
+        self.schedule = None  # Schedule, set when schedules are loaded
+        self.due_index = None  # The registry's DueDateIndex, set when the course is registered
 
    
     def add_student(self, student: 'Student') -> None:
         """Adds a student to the course."""
-        if student not in self._students:
-            self._students.append(student)
-            print(f"Student {student.name} has been added to the course {self.course_name}.")
-        else:
-            print(f"Student {student.name} is already enrolled in {self.course_name}.")
+        with locks.course_lock(self):
+            if student not in self.enrolled_students:
+                self.enrolled_students.append(student)
+                events.info(f"Student {student.name} has been added to the course {self.course_name}.")
+            else:
+                events.warning(f"Student {student.name} is already enrolled in {self.course_name}.")
+
+    def remove_student(self, student: 'Student') -> None:
+        """Removes a student from the course."""
+        with locks.enrollment_lock(student, self):
+            if student in self.enrolled_students:
+                self.enrolled_students.remove(student)
+                student.unenroll(self)
 
     def add_grade(self, grade: 'Grade') -> None:
         """Add a grade for the course."""
         key = (grade.student.student_id, grade.assignment.title)
-        if key in self.grades:
-            print(f"Grade for student {grade.student.name} on assignment {grade.assignment.title} already exists.")
-            return
-        self.grades[key] = grade
-        print(f"Grade for {self.course_name} added: {grade}")
+        with locks.course_lock(self):
+            if key in self.grades:
+                events.warning(f"Grade for student {grade.student.name} on assignment {grade.assignment.title} already exists.")
+                return
+            self.grades[key] = grade
+            self.gradebook.add(grade.student.student_id, grade.assignment.title, grade.score)
+            journal.record('grade', course_code=self.course_code, student_id=grade.student.student_id,
+                           assignment_title=grade.assignment.title, score=grade.score, feedback=grade.feedback)
+        events.info(f"Grade for {self.course_name} added: {grade}")
+
+    def add_grades(self, grades: List['Grade']) -> List[Tuple['Grade', str]]:
+        """
+        Add a batch of validated grades under one lock, on the course and their assignments,
+        journaling each; nothing is printed.
+        :return: The rejected grades with a reason (a grade already exists for that student and assignment).
+        """
+        rejected = []
+        with locks.course_lock(self):
+            for grade in grades:
+                key = (grade.student.student_id, grade.assignment.title)
+                if key in self.grades:
+                    rejected.append((grade, "grade already exists"))
+                    continue
+                self.grades[key] = grade
+                grade.assignment.record_grade(grade.score, grade.feedback or '', grade.student.student_id)
+                self.gradebook.add(grade.student.student_id, grade.assignment.title, grade.score)
+                journal.record('grade', course_code=self.course_code, student_id=grade.student.student_id,
+                               assignment_title=grade.assignment.title, score=grade.score, feedback=grade.feedback)
+        return rejected
 
     def to_dict(self) -> dict:
         """Convert course details to a dictionary."""
@@ -50,29 +122,48 @@ class Course:
         try:
             due_datetime = datetime.fromisoformat(due_date)
         except ValueError:
-            print("Error: Invalid date format. Please use YYYY-MM-DDTHH:MM:SS.")
+            events.error("Error: Invalid date format. Please use YYYY-MM-DDTHH:MM:SS.")
             return
 
         if due_datetime <= datetime.now():
-            print("Error: The due date must be in the future.")
+            events.error("Error: The due date must be in the future.")
             return
      
-        if any(a.title == title and a.due_date == due_datetime for a in self.assignments):
-            print(f"An assignment with title '{title}' and due date '{due_date}' already exists.")
-            return
-
-        new_assignment = Assignment(title, description, due_datetime, self)  # Pass self as course
-        self.assignments.append(new_assignment)
-        print(f"Assignment '{title}' added to course '{self.course_name}'.")
+        with locks.course_lock(self):
+            if self.due_index is not None:
+                exists = self.due_index.find(self.course_code, title, due_datetime) is not None
+            else:
+                exists = any(a.title == title and a.due_date == due_datetime for a in self.assignments)
+            if exists:
+                events.warning(f"An assignment with title '{title}' and due date '{due_date}' already exists.")
+                return
+
+            new_assignment = Assignment(title, description, due_datetime, self)  # Pass self as course
+            self.add_assignment(new_assignment)
+            if self.due_index is not None:
+                self.due_index.add(new_assignment)
+            journal.record('assignment', course_code=self.course_code, title=title,
+                           description=description, due_date=due_datetime.isoformat())
+            search_index.assignment_added(self.course_code, new_assignment)
+        events.info(f"Assignment '{title}' added to course '{self.course_name}'.")
+
+    def add_assignment(self, assignment: 'Assignment') -> None:
+        """Attach an assignment (e.g. a loaded one) and index it by title."""
+        self.assignments.append(assignment)
+        self._assignments_by_title.setdefault(assignment.title, assignment)
+
+    def get_assignment(self, title: str) -> Optional['Assignment']:
+        """The first assignment with this title, or None."""
+        return self._assignments_by_title.get(title)
 
     def input_grades(self) -> None:
         """Input grades for a specific assignment."""
         assignment_title = input("Enter the assignment title: ")
-        assignment = next((a for a in self.assignments if a.title == assignment_title), None)
+        assignment = self.get_assignment(assignment_title)
 
         if assignment:
             student_id = input("Enter the student's ID: ")
-            student = next((s for s in self._students if s.student_id == student_id), None)
+            student = next((s for s in self.enrolled_students if s.student_id == student_id), None)
 
             if student:
                 self._handle_grade_input(student, assignment)
@@ -86,13 +177,25 @@ class Course:
         try:
             score = float(input("Enter the grade: "))
             feedback = input("Enter feedback: ")
-            grade = Grade(student, assignment, score, feedback)  # Create a Grade instance
-            assignment.add_grade(score)  # Assuming add_grade accepts score
-            self.add_grade(grade)  # Store the grade in the course
+            self.enter_grade(student, assignment, score, feedback)
             print(f"Grade for student '{student.name}' added to assignment '{assignment.title}'.")
         except ValueError:
             print("Invalid score. Please enter a numeric value.")
 
+    def enter_grade(self, student: Student, assignment: 'Assignment', score: float, feedback: str = '') -> 'Grade':
+        """
+        Record a grade on both the assignment and the course.
+        :raises ValueError: If the score is not between 0 and 100.
+        """
+        grade = Grade(student, assignment, score, feedback)  # Validates the score
+        assignment.add_grade(score, feedback, student.student_id)
+        self.add_grade(grade)  # Store the grade in the course
+        return grade
+
+    @property
+    def units(self) -> int:
+        return self._units
+
     @property
     def course_name(self) -> str:
         return self.__course_name
@@ -114,5 +217,5 @@ class Course:
 
     def display_grades(self) -> None:
         """Display grades for all assignments in the course."""
-        for (student_id, assignment_title), grade in self.grades.items():
-            print(f"Student ID: {student_id}, Assignment: {assignment_title}, Grade: {grade.score}")
\ No newline at end of file
+        for student_id, assignment_title, score in self.gradebook.rows():
+            print(f"Student ID: {student_id}, Assignment: {assignment_title}, Grade: {score}")
\ No newline at end of file
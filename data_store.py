@@ -0,0 +1,81 @@
+import os
+import binary_snapshot
+from platform_admin import PlatformAdmin
+
+
+class DataStore:
+    """
+    Process-wide, in-memory copy of a data file. The file is parsed once and only
+    re-read when its modification time or size changes on disk; the platform's own
+    snapshot writes do not count as changes.
+    """
+
+    _shared = {}  # filename -> DataStore
+
+    def __init__(self, filename: str = 'data.json'):
+        self.filename = filename
+        self._platform_admin = None
+        self._signature = None
+        self._adopted = False  # The platform was opened elsewhere and writes the file itself
+
+    @classmethod
+    def shared(cls, filename: str = 'data.json') -> 'DataStore':
+        """Return the process-wide store for `filename`, creating it on first use."""
+        store = cls._shared.get(filename)
+        if store is None:
+            store = cls._shared[filename] = cls(filename)
+        return store
+
+    def _stat(self) -> tuple:
+        """(mtime, size) of the JSON file and its binary sidecar; None for a missing file."""
+        signature = []
+        for path in (self.filename, binary_snapshot.sidecar_path(self.filename)):
+            try:
+                st = os.stat(path)
+                signature.append((st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def get(self) -> PlatformAdmin:
+        """
+        Return the loaded platform, reloading only if the file changed on disk. An adopted platform
+        is never reloaded: in journal mode its compactions rewrite the file, and a storage backend
+        saves to it, so the live platform is always newer than the file.
+        """
+        if self._adopted:
+            return self._platform_admin
+        signature = self._stat()
+        if self._platform_admin is None or signature != self._signature:
+            platform_admin = PlatformAdmin()
+            platform_admin.load_data(self.filename)
+            self._track(platform_admin)
+            self._signature = signature
+        return self._platform_admin
+
+    def adopt(self, platform_admin: PlatformAdmin) -> None:
+        """Serve an already loaded platform (e.g. one opened in journal mode) from this store."""
+        self._track(platform_admin)
+        self._adopted = True
+        self._signature = self._stat()
+
+    def _track(self, platform_admin: PlatformAdmin) -> None:
+        """Cache the platform and keep the signature current across its own snapshot writes."""
+        self._platform_admin = platform_admin
+        platform_admin.on_snapshot_written = self._snapshot_written
+
+    def _snapshot_written(self, filename: str) -> None:
+        if os.path.abspath(filename) == os.path.abspath(self.filename):
+            self._signature = self._stat()
+
+    def save(self) -> None:
+        """Save the cached platform; our own write does not count as a change on disk."""
+        if self._platform_admin is not None:
+            self._platform_admin.save_data(self.filename)
+            self._signature = self._stat()
+
+    def invalidate(self) -> None:
+        """Force the next get() to re-read the file."""
+        self._platform_admin = None
+        self._signature = None
+        self._adopted = False
@@ -0,0 +1,175 @@
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator
+
+FIRST_NAMES = ('Alice', 'Bob', 'Carol', 'David', 'Eva', 'Frank', 'Grace', 'Henry', 'Ivy', 'Jack', 'Karen', 'Leo',
+               'Maya', 'Noah', 'Olivia', 'Paul', 'Quinn', 'Rosa', 'Sam', 'Tina', 'Umar', 'Vera', 'Will', 'Xena',
+               'Yusuf', 'Zoe')
+LAST_NAMES = ('Johnson', 'Smith', 'Brown', 'Garcia', 'Lee', 'Martinez', 'Nguyen', 'Patel', 'Kim', 'Lopez',
+              'Wilson', 'Clark', 'Lewis', 'Walker', 'Young', 'King', 'Scott', 'Green', 'Adams', 'Baker')
+PROGRAMS = ('Computer Science', 'Mathematics', 'Physics', 'Biology', 'Economics', 'History', 'Engineering')
+YEAR_LEVELS = ('Freshman', 'Sophomore', 'Junior', 'Senior')
+SUBJECTS = ('Programming', 'Calculus', 'Linear Algebra', 'Statistics', 'Physics', 'Chemistry', 'Biology',
+            'Economics', 'History', 'Literature', 'Databases', 'Networks', 'Algorithms', 'Ethics')
+DAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Monday/Wednesday', 'Tuesday/Thursday')
+TIMES = ('08:00 AM - 09:30 AM', '09:00 AM - 11:00 AM', '10:00 AM - 11:30 AM', '11:00 AM - 01:00 PM',
+         '01:00 PM - 02:30 PM', '02:00 PM - 04:00 PM', '03:00 PM - 04:30 PM', '05:00 PM - 07:00 PM')
+
+STUDENTS_PER_COURSE = 25  # Average section size used to size the catalogue
+STUDENTS_PER_INSTRUCTOR = 100
+
+
+class Generator:
+    """
+    Deterministic synthetic platform data in the data.json layout. Every student's courses
+    and grades come from a random generator seeded with the student's index, so sections are
+    generated and written one record at a time and memory does not grow with the number of students.
+    """
+
+    def __init__(self, n_students: int, n_courses: int = None, n_instructors: int = None,
+                 courses_per_student=(3, 6), assignments_per_course: int = 4, grade_rate: float = 0.8,
+                 n_announcements: int = 50, seed: int = 42):
+        self.n_students = n_students
+        average_load = sum(courses_per_student) / 2
+        self.n_courses = n_courses or max(10, int(n_students * average_load / STUDENTS_PER_COURSE))
+        self.n_instructors = n_instructors or max(2, n_students // STUDENTS_PER_INSTRUCTOR)
+        self.courses_per_student = courses_per_student
+        self.assignments_per_course = assignments_per_course
+        self.grade_rate = grade_rate
+        self.n_announcements = n_announcements
+        self.seed = seed
+        self.start = datetime(2025, 1, 13, 23, 59)  # Due dates are spread over the term from here
+
+    @staticmethod
+    def student_id(i: int) -> str:
+        return f"S{i + 1:07d}"
+
+    @staticmethod
+    def course_code(i: int) -> str:
+        return f"C{i + 1:05d}"
+
+    def _rng(self, section: int, i: int) -> random.Random:
+        return random.Random(self.seed * 1_000_003 + section * 100_000_007 + i)
+
+    def _student_courses(self, i: int):
+        rng = self._rng(1, i)
+        return rng.sample(range(self.n_courses), min(self.n_courses, rng.randint(*self.courses_per_student)))
+
+    def _course(self, i: int) -> dict:
+        rng = self._rng(2, i)
+        return {'course_name': f"{rng.choice(SUBJECTS)} {100 + i % 400}", 'course_code': self.course_code(i),
+                'instructor_id': f"I{i % self.n_instructors + 1:05d}", 'units': rng.randint(1, 5)}
+
+    def instructors(self) -> Iterator[dict]:
+        for i in range(self.n_instructors):
+            rng = self._rng(3, i)
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            yield {'instructor_id': f"I{i + 1:05d}", 'name': f"Dr. {first} {last} {i + 1}",
+                   'email': f"{first.lower()}.{last.lower()}{i + 1}@faculty.example.com",
+                   'contact_number': f"555-{rng.randint(0, 9999):04d}", 'address': f"{rng.randint(1, 999)} Campus Drive"}
+
+    def courses(self) -> Iterator[dict]:
+        return (self._course(i) for i in range(self.n_courses))
+
+    def students(self) -> Iterator[dict]:
+        for i in range(self.n_students):
+            rng = self._rng(4, i)
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            enrolled = []
+            for c in self._student_courses(i):
+                course = self._course(c)
+                enrolled.append({'course_name': course['course_name'], 'course_code': course['course_code'],
+                                 'units': course['units']})
+            yield {'name': f"{first} {last} {i + 1}", 'email': f"{first.lower()}.{last.lower()}{i + 1}@example.com",
+                   'contact_number': f"555-{rng.randint(0, 9999):04d}", 'address': f"{rng.randint(1, 9999)} Main Street",
+                   'student_id': self.student_id(i), 'year_level': rng.choice(YEAR_LEVELS),
+                   'program': rng.choice(PROGRAMS), 'gpa': round(rng.uniform(1.5, 4.0), 2),
+                   'birth_date': f"{rng.randint(1998, 2007)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                   'enrolled_courses': enrolled}
+
+    def enrollments(self) -> Iterator[dict]:
+        for i in range(self.n_students):
+            for c in self._student_courses(i):
+                yield {'student_id': self.student_id(i), 'course_code': self.course_code(c)}
+
+    def schedules(self) -> Iterator[dict]:
+        for i in range(self.n_courses):
+            rng = self._rng(5, i)
+            yield {'course_code': self.course_code(i), 'day': rng.choice(DAYS), 'time': rng.choice(TIMES)}
+
+    def _due_date(self, course: int, a: int) -> str:
+        weeks = (a + 1) * 14 // (self.assignments_per_course + 1)
+        return (self.start + timedelta(weeks=weeks, days=course % 5)).isoformat()
+
+    def assignments(self) -> Iterator[dict]:
+        for c in range(self.n_courses):
+            for a in range(self.assignments_per_course):
+                yield {'course_code': self.course_code(c), 'title': f"Assignment {a + 1}",
+                       'description': f"Problem set {a + 1}", 'due_date': self._due_date(c, a)}
+
+    def grades(self) -> Iterator[dict]:
+        for i in range(self.n_students):
+            rng = self._rng(6, i)
+            ability = rng.gauss(78, 10)
+            for c in self._student_courses(i):
+                for a in range(self.assignments_per_course):
+                    if rng.random() < self.grade_rate:
+                        score = round(min(100.0, max(0.0, rng.gauss(ability, 8))), 1)
+                        yield {'course_code': self.course_code(c), 'student_id': self.student_id(i),
+                               'assignment_title': f"Assignment {a + 1}", 'score': score, 'feedback': ''}
+
+    def announcements(self) -> Iterator[dict]:
+        rng = self._rng(7, 0)
+        for i in range(self.n_announcements):
+            yield {'title': f"Announcement {i + 1}", 'content': f"Campus update number {i + 1}.",
+                   'date': (self.start + timedelta(days=i)).date().isoformat(),
+                   'recipient_groups': rng.sample(['Student', 'Instructor', 'Admin'], rng.randint(1, 2))}
+
+    def admins(self) -> Iterator[dict]:
+        yield {'email': 'admin@example.com', 'password': '12345'}
+
+    # Sections in the order PlatformAdmin.LOAD_ORDER reads them
+    SECTIONS = ('instructors', 'courses', 'students', 'enrollments', 'schedules',
+                'assignments', 'grades', 'announcements', 'admins')
+
+    def write(self, filename: str) -> dict:
+        """
+        Write a data.json file section by section.
+        :return: The number of records written per section.
+        """
+        counts = {}
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write('{\n')
+            for n, section in enumerate(self.SECTIONS):
+                f.write(f'"{section}": [\n')
+                counts[section] = _write_records(f, getattr(self, section)())
+                f.write('\n],\n' if n < len(self.SECTIONS) - 1 else '\n]\n')
+            f.write('}\n')
+        return counts
+
+
+def _write_records(f, records: Iterable[dict]) -> int:
+    count = 0
+    for record in records:
+        if count:
+            f.write(',\n')
+        f.write(json.dumps(record, separators=(',', ':')))
+        count += 1
+    return count
+
+
+def generate(filename: str, n_students: int, **options) -> dict:
+    """Write a synthetic data.json for `n_students` students (see Generator for the options)."""
+    return Generator(n_students, **options).write(filename)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python datagen.py <students> [output file, default data-<students>.json] [seed]")
+        sys.exit(1)
+    students = int(sys.argv[1])
+    output = sys.argv[2] if len(sys.argv) > 2 else f"data-{students}.json"
+    counts = generate(output, students, seed=int(sys.argv[3]) if len(sys.argv) > 3 else 42)
+    print(f"Wrote {output}: " + ', '.join(f"{count} {section}" for section, count in counts.items()))
@@ -1,33 +1,100 @@
 from datetime import datetime
+from typing import List, Optional
 from person import Person
 from course import Course
+from post_store import PostStore
+import events
+import locks
+import search_index
+
+
+def person_id(person: 'Person') -> str:
+    """The ID posts use to refer to their author."""
+    return getattr(person, 'student_id', None) or getattr(person, 'instructor_id', None) or person.name
+
 
 class DiscussionThread:
-    def __init__(self, course: 'Course', title: str, creator: 'Person'):
+    def __init__(self, course: 'Course', title: str, creator: 'Person', store: Optional[PostStore] = None,
+                 thread_id: Optional[int] = None, timestamp=None):
+        """
+        :param store: The platform's PostStore; a thread without one keeps its posts in memory.
+        :param thread_id: ID of an existing thread in `store`; a new thread is created when omitted.
+        """
         self.course = course  # The course associated with this discussion thread
         self.title = title
         self.creator = creator  # Person (could be Student or Instructor)
-        self.posts = []  # List of posts (messages) in this thread
-        self.timestamp = datetime.now()
+        self.store = store or PostStore()
+        if thread_id is None:
+            record = self.store.create_thread(course.course_code, title, person_id(creator), creator.role)
+            thread_id, timestamp = record['thread_id'], record['created']
+        self.thread_id = thread_id
+        self.timestamp = datetime.fromisoformat(timestamp) if isinstance(timestamp, str) else timestamp or datetime.now()
+        search_index.thread_created(self)
+
+    @property
+    def post_count(self) -> int:
+        return self.store.count(self.thread_id)
+
+    @property
+    def last_activity(self) -> Optional[datetime]:
+        """Time of the latest post (or None), without reading the thread's posts."""
+        last = self.store.last_activity(self.thread_id)
+        return datetime.fromisoformat(last) if last else None
+
+    def _with_names(self, posts: List[dict]) -> List[dict]:
+        """Turn stored posts into display dicts: id, person (author name), timestamp and message."""
+        resolve = self.store.resolve_author
+        return [{'id': post['id'],
+                 'person': (resolve(post['role'], post['author_id']) if resolve else None) or post['author_id'],
+                 'timestamp': datetime.fromisoformat(post['timestamp']),
+                 'message': post['message']}
+                for post in posts]
 
-    def display_thread(self) -> None:
-        """Display the thread details with all posts."""
+    def latest(self, limit: int = 20) -> List[dict]:
+        """The latest `limit` posts, oldest first."""
+        count = self.post_count
+        return self._with_names(self.store.read(self.thread_id, count - limit + 1, count))
+
+    def before(self, post_id: int, limit: int = 20) -> List[dict]:
+        """Up to `limit` posts preceding post `post_id`, oldest first."""
+        return self._with_names(self.store.read(self.thread_id, post_id - limit, post_id - 1))
+
+    def after(self, post_id: int, limit: int = 20) -> List[dict]:
+        """Up to `limit` posts following post `post_id`, oldest first."""
+        return self._with_names(self.store.read(self.thread_id, post_id + 1, post_id + limit))
+
+    @property
+    def posts(self) -> List[dict]:
+        """Every post in the thread; prefer latest/before/after for busy threads."""
+        return self._with_names(self.store.read(self.thread_id, 1, self.post_count))
+
+    def summary(self) -> str:
+        """One listing line: title, creator, post count and last activity."""
+        last = self.last_activity
+        activity = f"last post {last.strftime('%Y-%m-%d %H:%M:%S')}" if last else "no posts yet"
+        creator = self.creator.name if self.creator else "Unknown"
+        return f"{self.title} (by {creator}): {self.post_count} posts, {activity}"
+
+    def display_thread(self, limit: int = 20) -> None:
+        """Display the thread details with its latest posts."""
         print(f"Discussion Thread: {self.title}")
-        print(f"Created by: {self.creator.name} on {self.timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"Created by: {self.creator.name if self.creator else 'Unknown'} on {self.timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"Course: {self.course.course_name} (Code: {self.course.course_code})")
-        print("Posts:")
-        for post in self.posts:
-            print(f"- {post['person']} ({post['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}): {post['message']}")
+        posts = self.latest(limit)
+        print(f"Posts ({len(posts)} of {self.post_count}):")
+        self.display_posts(posts)
+
+    @staticmethod
+    def display_posts(posts: List[dict]) -> None:
+        for post in posts:
+            print(f"- #{post['id']} {post['person']} ({post['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}): {post['message']}")
 
     def add_post(self, person: 'Person', message: str) -> None:
         """Add a post to the thread."""
         if not message.strip():
-            print("Cannot post an empty message.")
+            events.warning("Cannot post an empty message.")
             return
-        post = {
-            'person': person.name,
-            'timestamp': datetime.now(),
-            'message': message
-        }
-        self.posts.append(post)
-        print(f"Post added by {person.name}: {message}")
+        with locks.course_lock(self.course):
+            post = self.store.append(self.thread_id, person_id(person), person.role, message)
+            search_index.post_added(self, post)
+        events.info(f"Post added by {person.name}: {message}")
@@ -0,0 +1,135 @@
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from heapq import merge
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple
+
+Key = Tuple[datetime, int]  # (due date, sequence number)
+
+
+class DueDateIndex:
+    """
+    Every assignment of the platform sorted by due date, globally and per course. Each
+    assignment gets a sequence number when it is added; (due_date, seq) keys order the sorted
+    lists, so a range query is two binary searches and a slice, and an insertion is a binary
+    search plus an insort. A student's view merges the per-course lists of their courses.
+
+    sweep() hands out the assignments that became overdue since the previous sweep, for reminders.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.seq = 0
+        self._assignments: Dict[int, 'Assignment'] = {}  # seq -> assignment
+        self._seqs: Dict['Assignment', int] = {}
+        self._keys: List[Key] = []  # Every assignment, sorted
+        self._by_course: Dict[str, List[Key]] = {}  # course_code -> sorted keys
+        self._swept: Optional[datetime] = None  # Cut-off of the previous sweep
+
+    def __len__(self) -> int:
+        return len(self._assignments)
+
+    def add(self, assignment) -> None:
+        with self._lock:
+            if assignment in self._seqs:
+                return
+            self.seq += 1
+            key = (assignment.due_date, self.seq)
+            self._assignments[self.seq] = assignment
+            self._seqs[assignment] = self.seq
+            insort(self._keys, key)
+            insort(self._by_course.setdefault(assignment.course.course_code, []), key)
+
+    def remove(self, assignment) -> None:
+        with self._lock:
+            seq = self._seqs.pop(assignment, None)
+            if seq is None:
+                return
+            del self._assignments[seq]
+            key = (assignment.due_date, seq)
+            del self._keys[bisect_left(self._keys, key)]
+            keys = self._by_course[assignment.course.course_code]
+            del keys[bisect_left(keys, key)]
+            if not keys:
+                del self._by_course[assignment.course.course_code]
+
+    def remove_course(self, course) -> None:
+        """Drop every assignment of a course."""
+        with self._lock:
+            for _, seq in list(self._by_course.get(course.course_code, [])):
+                self.remove(self._assignments[seq])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._assignments.clear()
+            self._seqs.clear()
+            self._keys.clear()
+            self._by_course.clear()
+            self._swept = None
+            self.seq = 0
+
+    @staticmethod
+    def _slice(keys: List[Key], start: Optional[datetime], end: Optional[datetime]) -> List[Key]:
+        """Keys due in [start, end); None leaves that side open."""
+        lo = 0 if start is None else bisect_left(keys, (start, 0))
+        hi = len(keys) if end is None else bisect_left(keys, (end, 0))
+        return keys[lo:hi]
+
+    def find(self, course_code: str, title: str, due_date: datetime):
+        """The course's assignment with this title and due date, or None."""
+        with self._lock:
+            keys = self._by_course.get(course_code, [])
+            for _, seq in keys[bisect_left(keys, (due_date, 0)):bisect_right(keys, (due_date, self.seq))]:
+                if self._assignments[seq].title == title:
+                    return self._assignments[seq]
+            return None
+
+    def between(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                course_codes: Optional[Iterable[str]] = None, limit: Optional[int] = None) -> List['Assignment']:
+        """
+        Assignments due in [start, end), soonest first.
+        :param course_codes: Only these courses (None for every course).
+        :param limit: Stop after this many assignments.
+        """
+        with self._lock:
+            if course_codes is None:
+                keys = iter(self._slice(self._keys, start, end))
+            else:
+                keys = merge(*(self._slice(self._by_course[code], start, end)
+                               for code in dict.fromkeys(course_codes) if code in self._by_course))
+            return [self._assignments[seq] for _, seq in islice(keys, limit)]
+
+    def for_course(self, course, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List['Assignment']:
+        return self.between(start, end, [course.course_code])
+
+    def for_student(self, student, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                    limit: Optional[int] = None) -> List['Assignment']:
+        """Assignments of the student's enrolled courses due in [start, end), soonest first."""
+        return self.between(start, end, [c.course_code for c in student.enrolled_courses], limit)
+
+    def upcoming(self, now: Optional[datetime] = None, until: Optional[datetime] = None,
+                 course_codes: Optional[Iterable[str]] = None, limit: Optional[int] = None) -> List['Assignment']:
+        """Assignments not yet due (optionally only those due before `until`), soonest first."""
+        now = now or datetime.now()
+        if until is not None and until <= now:
+            return []
+        return self.between(now, until, course_codes, limit)
+
+    def overdue(self, now: Optional[datetime] = None,
+                course_codes: Optional[Iterable[str]] = None) -> List['Assignment']:
+        """Assignments already past their due date, oldest first."""
+        return self.between(None, now or datetime.now(), course_codes)
+
+    def sweep(self, now: Optional[datetime] = None) -> List['Assignment']:
+        """
+        Assignments that became overdue since the previous sweep (all overdue ones on the first),
+        found with a binary search from the previous cut-off rather than a scan.
+        """
+        now = now or datetime.now()
+        with self._lock:
+            if self._swept is not None and now <= self._swept:
+                return []
+            newly = self.between(self._swept, now)
+            self._swept = now
+            return newly
@@ -8,20 +8,27 @@ from instructor import Instructor
 from platform_admin import PlatformAdmin
 from announcement import Announcement
 from course import Course
+from schedule import format_timetable
+from data_store import DataStore
+import gradebook_io
+import events
 
 class E_Learning_Environment:
     mission = "To provide quality education through innovative technology."
     vision = "To become a leading platform fostering accessible learning for all."
 
-    def __init__(self):
-        self.platform_admin = PlatformAdmin()
-        self.platform_admin.load_data()  # Load data on startup
+    def __init__(self, platform_admin=None):
+        # Reuse an already loaded platform, otherwise the process-wide cached copy of data.json
+        self.platform_admin = platform_admin or DataStore.shared().get()
         self.courses = self.platform_admin.courses
         self.students = self.platform_admin.students
         self.instructors = self.platform_admin.instructors
-        self.announcements = []
         self.discussions = []
 
+    @property
+    def announcements(self):
+        """Announcements live on the platform admin so they are saved and journaled with everything else."""
+        return self.platform_admin.announcements
 
     def set_courses(self, courses):
         self.courses = courses
@@ -62,10 +69,11 @@ class E_Learning_Environment:
             elif choice == "2":
                 self.instructor_menu()
             elif choice == "3":
-                if self.platform_admin.admin_login():  # Static method call
+                if self.platform_admin.admin_login():
                     self.admin_menu()
             elif choice == "4":
                 self.platform_admin.save_data()  # Save data on exit
+                events.flush()
                 print("Exiting the platform. Goodbye!")
                 break
             else:
@@ -84,9 +92,12 @@ class E_Learning_Environment:
             print("3. Enroll in Courses")
             print("4. View All Enrolled Courses")
             print("5. View Discussion Threads")
-            print("6. Display All Schedule")
-            print("7. View Announcements")
-            print("8. Logout")
+            print("6. Display My Timetable")
+            print("7. Display All Schedule")
+            print("8. View Announcements")
+            print("9. Search")
+            print("10. Upcoming Assignments")
+            print("11. Logout")
             choice = input("Select an option: ")
 
             if choice == "1":
@@ -100,10 +111,16 @@ class E_Learning_Environment:
             elif choice == "5":
                 self.view_discussion_threads(student)
             elif choice == "6":
-                self.display_all_schedules()
+                self.view_timetable(student)
             elif choice == "7":
-                self.view_announcements(student)
+                self.display_all_schedules()
             elif choice == "8":
+                self.view_announcements(student)
+            elif choice == "9":
+                self.search(student)
+            elif choice == "10":
+                self.view_due_assignments(student)
+            elif choice == "11":
                 print("Logging out...")
                 break
             else:
@@ -111,19 +128,30 @@ class E_Learning_Environment:
 
     def get_student_by_name(self):
         name = input("Enter your name: ")
-        return next((s for s in self.platform_admin.students if s.name == name), None)
+        return self.platform_admin.find_student_by_name(name)
 
     def view_student_grades(self, student):
         print(f"\nGrades for {student.name}:")
         found_grades = False
 
-        for enrollment in self.platform_admin.enrollments._enrollments:
-            if enrollment.get('student_id') == student.student_id:
-                found_grades = True
-                print(f"Course: {enrollment['course_name']}, Grade: {enrollment.get('grade', 'N/A')}")
+        for course in self.platform_admin.enrollments.get_courses_by_student(student):
+            found_grades = True
+            scores = [
+                (assignment.title, course.gradebook.get(student.student_id, assignment.title))
+                for assignment in course.assignments
+            ]
+            scores = [(title, score) for title, score in scores if score is not None]
+            if not scores:
+                print(f"Course: {course.course_name}, Grade: N/A")
+            for title, score in scores:
+                print(f"Course: {course.course_name}, Assignment: {title}, Grade: {score}")
         
         if not found_grades:
             print("No grades found.")
+        gpa = self.platform_admin.gpa_summary(student)
+        if gpa['cumulative_gpa'] is not None:
+            print(f"GPA this term ({gpa['term']}): {gpa['term_gpa'] if gpa['term_gpa'] is not None else 'N/A'}, "
+                  f"cumulative: {gpa['cumulative_gpa']} over {gpa['units']} units")
 
     def submit_assignment(self, student):
         print("\nYour Courses:")
@@ -138,7 +166,7 @@ class E_Learning_Environment:
             return
 
         assignment_title = input("Enter the assignment title: ").strip()
-        assignment = next((a for a in course.assignments if a.title == assignment_title), None)
+        assignment = course.get_assignment(assignment_title)
 
         if not assignment:
             print("Assignment not found in this course.")
@@ -160,8 +188,7 @@ class E_Learning_Environment:
             # Check if the student is already enrolled
             if course in student.enrolled_courses:
                 print(f"You are already enrolled in {course_name}.")
-            else:
-                self.platform_admin.enrollments.enroll_student(student, course)
+            elif self.platform_admin.enrollments.enroll_student(student, course):
                 print(f"Enrolled in {course_name} successfully!")
         else:
             print("Course not found.")
@@ -185,6 +212,50 @@ class E_Learning_Environment:
                 print(f"Course: {course.course_name} has no schedule assigned.")
 
 
+    def view_timetable(self, person):
+        """Display the weekly timetable of a student or instructor, from their cached schedule index."""
+        if isinstance(person, Student):
+            entries = self.platform_admin.student_timetable(person)
+        else:
+            entries = self.platform_admin.instructor_timetable(person)
+        print(f"\nWeekly timetable for {person.name}:")
+        if not entries:
+            print("No scheduled classes.")
+        for line in format_timetable(entries):
+            print(f"- {line}")
+
+
+    def view_due_assignments(self, person, days=7):
+        """List overdue assignments and those due in the coming week, from the due-date index."""
+        overdue, upcoming = self.platform_admin.assignments_due(person, days)
+        print(f"\nOverdue assignments ({len(overdue)}):")
+        for assignment in overdue:
+            print(f"- {assignment.course.course_name}: {assignment.title} (was due {assignment.due_date.strftime('%Y-%m-%d %H:%M')})")
+        print(f"Due in the next {days} days ({len(upcoming)}):")
+        for assignment in upcoming:
+            print(f"- {assignment.course.course_name}: {assignment.title} (due {assignment.due_date.strftime('%Y-%m-%d %H:%M')})")
+
+
+    def search(self, person):
+        """Search the discussions, assignments and announcements of the person's courses."""
+        query = input("Search for: ").strip()
+        if not query:
+            return
+        if isinstance(person, Student):
+            courses = person.enrolled_courses
+        else:
+            courses = self.platform_admin.registry.get_courses_by_instructor(person.instructor_id)
+        results = self.platform_admin.search(query, [c.course_code for c in courses], person.role)
+        if not results:
+            print("No matches found.")
+        for result in results:
+            where = f"[{result['course_code']}] " if result['course_code'] else ""
+            post = f" #{result['post_id']}" if result['post_id'] else ""
+            print(f"- {result['kind'].capitalize()}: {where}{result['title']}{post}")
+            if result['text']:
+                print(f"    {result['text']}")
+
+
     def instructor_menu(self):
         instructor = self.get_instructor_by_name()
         if not instructor:
@@ -200,7 +271,10 @@ class E_Learning_Environment:
             print("5. View Discussion Threads")
             print("6. Create Announcements")
             print("7. View Announcements")
-            print("8. Logout")
+            print("8. View My Timetable")
+            print("9. Search")
+            print("10. Import/Export Grades")
+            print("11. Logout")
             choice = input("Select an option: ")
 
             if choice == "1":
@@ -222,6 +296,12 @@ class E_Learning_Environment:
             elif choice == "7":
                 self.view_announcements(instructor)
             elif choice == "8":
+                self.view_timetable(instructor)
+            elif choice == "9":
+                self.search(instructor)
+            elif choice == "10":
+                self.import_export_grades(instructor)
+            elif choice == "11":
                 print(f"Goodbye, {instructor.name}!")
                 break
             else:
@@ -229,16 +309,15 @@ class E_Learning_Environment:
 
     def get_instructor_by_name(self):
         name = input("Enter your name: ")
-        return next((i for i in self.platform_admin.instructors if i.name == name), None)
+        return self.platform_admin.find_instructor_by_name(name)
 
     def assign_assignments(self, instructor):
         print("Available Courses:")
-        for course in self.platform_admin.courses:
-            if course.instructor.instructor_id == instructor.instructor_id:
-                print(f"- {course.course_name} ({course.course_code})")
+        for course in self.platform_admin.registry.get_courses_by_instructor(instructor.instructor_id):
+            print(f"- {course.course_name} ({course.course_code})")
 
         course_code = input("Enter the course code to assign an assignment: ")
-        course = next((c for c in self.platform_admin.courses if c.course_code == course_code), None)
+        course = self.platform_admin.registry.get_course(course_code)
 
         if course:
             title = input("Enter assignment title: ")
@@ -251,30 +330,55 @@ class E_Learning_Environment:
     def input_grades(self, instructor):
         # Get the course code and find the corresponding course taught by the instructor
         course_code = input("Enter the course code: ")
-        course = next(
-            (c for c in self.platform_admin.courses if c.course_code == course_code and c.instructor == instructor),
-        None
-    )
+        course = self.platform_admin.registry.get_course(course_code)
+        if course and course.instructor != instructor:
+            course = None
 
         if course:
             # Proceed to input grades for the students in this course
             student_id = input("Enter the student ID: ")
-            grade = input("Enter the grade: ")
 
             # Add grade for the student (assuming the course has a list of enrolled students)
             student = next((s for s in course.enrolled_students if s.student_id == student_id), None)
-            if student:
-                student.add_grade(course, grade)  # Assuming there's a method to add grades to the student
-                print(f"Grade for student {student.name} in course {course.course_name} is {grade}.")
-            else:
+            if not student:
                 print(f"Student with ID {student_id} is not enrolled in this course.")
+                return
+
+            assignment_title = input("Enter the assignment title: ")
+            assignment = course.get_assignment(assignment_title)
+            if assignment:
+                course._handle_grade_input(student, assignment)  # Stores the Grade on the course
+            else:
+                print("Assignment not found. Please check the title and try again.")
         else:
             print(f"Course with code {course_code} not found.")
 
+    def import_export_grades(self, instructor):
+        """Import a course's grades from, or export them to, a CSV or JSON-lines file."""
+        course_code = input("Enter the course code: ")
+        course = self.platform_admin.registry.get_course(course_code)
+        if not course or course.instructor != instructor:
+            print(f"Course with code {course_code} not found.")
+            return
+        action = input("Import or export? (i/e): ").strip().lower()
+        filename = input("Enter the file name (.csv or .jsonl): ").strip()
+        try:
+            if action == 'e':
+                gradebook_io.export_grades(course, filename)
+                return
+            result = gradebook_io.import_grades(self.platform_admin, course, filename)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            return
+        for line, reason in result.errors[:20]:
+            print(f"- Line {line}: {reason}")
+        if result.error_count > 20:
+            print(f"... and {result.error_count - 20} more rejected rows.")
+
     def view_enrolled_students(self, instructor):
         """Display a list of students enrolled in the courses taught by the instructor."""
         print("\nCourses Taught:")
-        instructor_courses = [course for course in self.platform_admin.courses if course.instructor.instructor_id == instructor.instructor_id]
+        instructor_courses = self.platform_admin.registry.get_courses_by_instructor(instructor.instructor_id)
 
         if not instructor_courses:
             print("You are not teaching any courses.")
@@ -291,7 +395,7 @@ class E_Learning_Environment:
 
     def view_courses_taught(self, instructor):
         """Return a list of course names taught by this instructor."""
-        instructor_courses = [course for course in self.platform_admin.courses if course.instructor.instructor_id == instructor.instructor_id]
+        instructor_courses = self.platform_admin.registry.get_courses_by_instructor(instructor.instructor_id)
         
         for course in instructor_courses:
             print(f"\nCourse: {course.course_name} (Code: {course.course_code})")    
@@ -306,37 +410,62 @@ class E_Learning_Environment:
         if isinstance(creator, Student):
             courses_to_display = creator.enrolled_courses
         elif isinstance(creator, Instructor):
-            courses_to_display = creator._courses_taught  # Instructor teaches courses
+            courses_to_display = self.platform_admin.registry.get_courses_by_instructor(creator.instructor_id)
         else:
             print("Invalid user type.")
             return
     
-    # Display discussion threads for the courses
+    # List the threads of each course with their post counts (no posts are read here)
         for course in courses_to_display:
             print(f"\nCourse: {course.course_name}")
             for thread in course.discussion_threads:
-                thread.display_thread()
+                print(f"- {thread.summary()}")
+
+        read_choice = input("\nDo you want to read a thread? (yes/no): ")
+        if read_choice.lower() == "yes":
+            self.read_thread(creator)
 
     # Option to add a post to a discussion thread
         add_post_choice = input("\nDo you want to add a post? (yes/no): ")
         if add_post_choice.lower() == "yes":
             self.add_post_to_thread(creator)
 
-
-    def add_post_to_thread(self, creator):
-        """Allow user to add a post to a discussion thread."""
-        course_name = input("Enter the course name for the thread you want to post in: ")
-        course = next((c for c in creator.course if c.course_name().strip().lower() == course_name.lower()), None)
+    def _choose_thread(self, creator, action):
+        course_name = input(f"Enter the course name for the thread you want to {action}: ")
+        if isinstance(creator, Student):
+            courses = creator.enrolled_courses
+        else:
+            courses = self.platform_admin.registry.get_courses_by_instructor(creator.instructor_id)
+        course = next((c for c in courses if c.course_name.strip().lower() == course_name.strip().lower()), None)
 
         if not course:
             print("Course not found.")
-            return
+            return None
 
-        thread_title = input("Enter the title of the thread you want to post in: ")
-        thread = next((t for t in course.discussion_threads if t.title.strip().lower() == thread_title), None)
+        thread_title = input(f"Enter the title of the thread you want to {action}: ")
+        thread = next((t for t in course.discussion_threads if t.title.strip().lower() == thread_title.strip().lower()), None)
 
         if not thread:
             print("Discussion thread not found.")
+        return thread
+
+    def read_thread(self, creator, page_size=10):
+        """Show a thread's latest posts, paging back through older ones on request."""
+        thread = self._choose_thread(creator, "read")
+        if not thread:
+            return
+        thread.display_thread(limit=page_size)
+        posts = thread.latest(page_size)
+        while posts and posts[0]['id'] > 1:
+            if input("Show older posts? (yes/no): ").lower() != "yes":
+                break
+            posts = thread.before(posts[0]['id'], page_size)
+            thread.display_posts(posts)
+
+    def add_post_to_thread(self, creator):
+        """Allow user to add a post to a discussion thread."""
+        thread = self._choose_thread(creator, "post in")
+        if not thread:
             return
 
         message = input("Enter your message: ")
@@ -346,8 +475,7 @@ class E_Learning_Environment:
 
     def create_announcement(self, title, content, date, recipient_groups):
         try:
-            announcement = Announcement(title, content, date, recipient_groups)
-            self.announcements.append(announcement)
+            self.platform_admin.post_announcement(title, content, date, recipient_groups)
             print("Announcement created.")
         except Exception as e:
             print(f"Error creating announcement: {e}")
@@ -356,18 +484,27 @@ class E_Learning_Environment:
     def view_announcements(self, user):
         """Method to view announcements for the given user."""
         print("\nAnnouncements:")
-        for announcement in self.announcements:
-            if user.role in announcement.recipient_groups:  # Assuming user has a role attribute
-                print(f"- {announcement.title} ({announcement.date}): {announcement.content}")
-        if not any(user.role in announcement.recipient_groups for announcement in self.announcements):
+        new = set(self.announcements.unseen(user))  # Posted since the user last looked
+        page, cursor = self.announcements.page(user.role, limit=10)  # Newest first, from the role's index
+        if not page:
             print("No announcements available.")
+        while page:
+            for announcement in page:
+                marker = "[NEW] " if announcement in new else ""
+                print(f"- {marker}{announcement.title} ({announcement.date}): {announcement.content}")
+            if not cursor or input("Show older announcements? (yes/no): ").lower() != "yes":
+                break
+            page, cursor = self.announcements.page(user.role, limit=10, cursor=cursor)
 
     def admin_menu(self):
         """Display the admin menu options."""
         print("Admin Menu:")
         print("1. View Users")
         print("2. Create Announcement")
-        print("3. Log Out")
+        print("3. View Schedule Conflicts")
+        print("4. Close Term")
+        print("5. Generate Course Reports")
+        print("6. Log Out")
 
         choice = input("Select an option: ")
         if choice == "1":
@@ -375,39 +512,47 @@ class E_Learning_Environment:
         elif choice == "2":
             self.create_announcements()
         elif choice == "3":
+            self.view_schedule_conflicts()
+        elif choice == "4":
+            next_term = input("Enter the name of the next term: ").strip()
+            if next_term:
+                self.platform_admin.close_term(next_term)
+        elif choice == "5":
+            directory = input("Enter the report directory (default: reports): ").strip() or 'reports'
+            self.platform_admin.generate_reports(directory)
+        elif choice == "6":
             self.log_out()
         else:
             print("Invalid choice, please try again.")
 
     def view_users(self):
         """Logic to view users."""
-        if os.path.exists("data.json"):
-            with open("data.json", "r") as file:
-                try:
-                    data = json.load(file)
-
-                    students = data.get("students", [])
-                    instructors = data.get("instructors", [])
-
-                    print("Displaying Users:")
-                    print("\nStudents:")
-                    if students:
-                        for student in students:
-                            print(f"Email: {student['email']}, Name: {student['name']}")
-                    else:
-                        print("No students found.")
-
-                    print("\nInstructors:")
-                    if instructors:
-                        for instructor in instructors:
-                            print(f"Email: {instructor['email']}, Name: {instructor['name']}")
-                    else:
-                        print("No instructors found.")
-
-                except json.JSONDecodeError:
-                    print("Error: Could not decode JSON data.")
+        students, instructors = self.platform_admin.user_directory()
+
+        print("Displaying Users:")
+        print("\nStudents:")
+        if students:
+            for email, name in students:
+                print(f"Email: {email}, Name: {name}")
+        else:
+            print("No students found.")
+
+        print("\nInstructors:")
+        if instructors:
+            for email, name in instructors:
+                print(f"Email: {email}, Name: {name}")
         else:
-            print("No data file found.")
+            print("No instructors found.")
+
+    def view_schedule_conflicts(self):
+        """List every student and instructor whose courses meet at overlapping times."""
+        conflicts = self.platform_admin.schedule_conflict_report()
+        print("Schedule Conflicts:")
+        if not conflicts:
+            print("No schedule conflicts found.")
+        for person, course, other in conflicts:
+            print(f"- {person.role} {person.name}: {course.course_name} ({course.schedule.day} {course.schedule.time}) "
+                  f"overlaps {other.course_name} ({other.schedule.day} {other.schedule.time})")
 
     def create_announcements(self, title: str, content: str, date: str, recipient_groups: List[str]):
         try:
@@ -1,49 +1,185 @@
-from typing import List, Dict, Union
+from typing import Dict, Iterable, List, Tuple
 from student import Student
 from course import Course
+from schedule_index import ScheduleIndex
+import journal
+import events
+import locks
+
+class BulkEnrollmentResult:
+    """Outcome of Enrollment.enroll_many: accepted pairs and rejected pairs with a reason."""
+
+    def __init__(self):
+        self.enrolled: List[Tuple[Student, Course]] = []
+        self.rejected: List[Tuple[object, object, str]] = []  # (student, course, reason)
+        self.flagged: List[Tuple[Student, Course, str]] = []  # Enrolled despite a schedule conflict
+
+    def flag(self, student, course, reason: str) -> None:
+        self.flagged.append((student, course, reason))
+
+    def reject(self, student, course, reason: str) -> None:
+        self.rejected.append((student, course, reason))
+
+    def summary(self) -> str:
+        summary = f"{len(self.enrolled)} enrolled, {len(self.rejected)} rejected"
+        if self.flagged:
+            summary += f", {len(self.flagged)} flagged for schedule conflicts"
+        return summary
 
 class Enrollment:
     def __init__(self):
-        self._enrollments: List[Dict[str, Union[Student, Course]]] = []  # List to track enrollments
+        # Insertion-ordered dicts used as sets, so iteration order is stable (enrollment order)
+        self._enrollments: Dict[Tuple[Student, Course], None] = {}  # (student, course) pairs
+        self._by_student: Dict[Student, Dict[Course, None]] = {}
+        self._by_course: Dict[Course, Dict[Student, None]] = {}
+        # Weekly intervals of each student's courses, for schedule conflict checks
+        self.schedules = ScheduleIndex(lambda student: student.enrolled_courses)
+        self.on_conflict = 'reject'  # 'reject' overlapping sections, or 'flag' them and enroll anyway
+
+    def __len__(self) -> int:
+        return len(self._enrollments)
+
+    def __contains__(self, pair: Tuple[Student, Course]) -> bool:
+        return pair in self._enrollments
 
-    def enroll_student(self, student: Student, course: Course) -> None:
+    def schedule_conflicts(self, student: Student, course: Course) -> List[Course]:
         """
-        Enroll a student in a course if they are not already enrolled.
+        Return the student's courses that meet at a time overlapping the course's schedule.
         """
-        if not self.is_student_enrolled(student, course):
-            course.add_student(student)  # Assuming the 'Course' class has a method to add students
-            self._enrollments.append({'student': student, 'course': course})
-            print(f"{student.name} has been enrolled in {course.course_name}.")
-        else:
-            print(f"{student.name} is already enrolled in {course.course_name}.")
+        return self.schedules.conflicts(student, course)
+
+    def enroll_student(self, student: Student, course: Course) -> bool:
+        """
+        Enroll a student in a course if they are not already enrolled and, unless
+        on_conflict is 'flag', the course does not clash with their timetable.
+        :return: True if the student was enrolled.
+        """
+        with locks.enrollment_lock(student, course):
+            enrolled = self.is_student_enrolled(student, course)
+            conflicts = [] if enrolled else self.schedule_conflicts(student, course)
+            added = not enrolled and not (conflicts and self.on_conflict == 'reject')
+            if added:
+                course.add_student(student)  # Assuming the 'Course' class has a method to add students
+                student.enroll(course)
+                self._add(student, course)
+                journal.record('enroll', student_id=student.student_id, course_code=course.course_code)
+        if enrolled:
+            events.warning(f"{student.name} is already enrolled in {course.course_name}.")
+            return False
+        if conflicts:
+            clashes = ', '.join(c.course_name for c in conflicts)
+            if not added:
+                events.warning(f"{student.name} cannot enroll in {course.course_name}: schedule conflict with {clashes}.")
+                return False
+            events.warning(f"{course.course_name} overlaps {clashes} in {student.name}'s schedule.")
+        events.info(f"{student.name} has been enrolled in {course.course_name}.")
+        return True
+
+    def enroll_many(self, pairs: Iterable[Tuple[Student, Course]]) -> BulkEnrollmentResult:
+        """
+        Enroll a batch of (student, course) pairs. The batch is validated and de-duplicated in one
+        pass against the index, then applied in one go; nothing is printed. Schedule conflicts, with
+        the student's existing courses or with earlier pairs of the batch, are rejected or flagged
+        according to on_conflict.
+        """
+        result = BulkEnrollmentResult()
+        accepted: Dict[Tuple[Student, Course], None] = {}
+        batch_courses: Dict[Student, List[Course]] = {}  # Courses accepted so far in this batch
+        with locks.all_locks():
+            for student, course in pairs:
+                if student is None or course is None:
+                    result.reject(student, course, "unknown student or course")
+                    continue
+                if (student, course) in self._enrollments:
+                    result.reject(student, course, "already enrolled")
+                    continue
+                if (student, course) in accepted:
+                    result.reject(student, course, "duplicate in batch")
+                    continue
+                conflicts = self.schedule_conflicts(student, course)
+                if course.schedule:
+                    conflicts += [c for c in batch_courses.get(student, ())
+                                  if c.schedule and course.schedule.overlaps(c.schedule)]
+                if conflicts:
+                    reason = "schedule conflict with " + ', '.join(c.course_code for c in conflicts)
+                    if self.on_conflict == 'reject':
+                        result.reject(student, course, reason)
+                        continue
+                    result.flag(student, course, reason)
+                accepted[(student, course)] = None
+                batch_courses.setdefault(student, []).append(course)
+
+            for student, course in accepted:
+                course.enrolled_students.append(student)  # Not present: the index is checked above
+                student.enroll(course)
+                self._add(student, course)
+            if accepted:
+                journal.record('enroll_many', pairs=[[s.student_id, c.course_code] for s, c in accepted])
+        result.enrolled = list(accepted)
+        return result
+
+    def add_existing(self, student: Student, course: Course) -> None:
+        """
+        Track an enrollment already linked on the student and course (used when loading data).
+        """
+        self._add(student, course)
+
+    def remove_existing(self, student: Student, course: Course) -> None:
+        """
+        Forget an enrollment already unlinked from the student and course (used when replaying the journal).
+        """
+        if (student, course) in self._enrollments:
+            self._remove(student, course)
+
+    def _add(self, student: Student, course: Course) -> None:
+        self._enrollments[(student, course)] = None
+        self._by_student.setdefault(student, {})[course] = None
+        self._by_course.setdefault(course, {})[student] = None
+        self.schedules.add(student, course)
+
+    def _remove(self, student: Student, course: Course) -> None:
+        del self._enrollments[(student, course)]
+        courses = self._by_student[student]
+        del courses[course]
+        if not courses:
+            del self._by_student[student]
+        students = self._by_course[course]
+        del students[student]
+        if not students:
+            del self._by_course[course]
+        self.schedules.remove(student, course)
 
     def is_student_enrolled(self, student: Student, course: Course) -> bool:
         """
         Check if a student is already enrolled in a specific course.
         """
-        return any(enrollment['student'] == student and enrollment['course'] == course for enrollment in self._enrollments)
+        return (student, course) in self._enrollments
 
     def unenroll_student(self, student: Student, course: Course) -> None:
         """
         Unenroll a student from a course if they are enrolled.
         """
-        for enrollment in self._enrollments:
-            if enrollment['student'] == student and enrollment['course'] == course:
+        with locks.enrollment_lock(student, course):
+            enrolled = self.is_student_enrolled(student, course)
+            if enrolled:
                 course.remove_student(student)  # Assuming the 'Course' class has a method to remove students
-                self._enrollments.remove(enrollment)
-                print(f"{student.name} has been unenrolled from {course.course_name}.")
-                return
-        print(f"{student.name} is not enrolled in {course.course_name}.")
+                self._remove(student, course)
+                journal.record('unenroll', student_id=student.student_id, course_code=course.course_code)
+        if enrolled:
+            events.info(f"{student.name} has been unenrolled from {course.course_name}.")
+            return
+        events.warning(f"{student.name} is not enrolled in {course.course_name}.")
 
     def get_enrollment_list(self) -> List[str]:
         """
         Return a list of all enrollments in a readable format.
         """
-        if not self._enrollments:
+        pairs = list(self._enrollments)  # Snapshot, so concurrent enrollments cannot break iteration
+        if not pairs:
             return ["No enrollments found."]
         return [
-            f"{enrollment['student'].name} enrolled in {enrollment['course'].course_name}"
-            for enrollment in self._enrollments
+            f"{student.name} enrolled in {course.course_name}"
+            for student, course in pairs
         ]
 
     def display_enrollments(self) -> None:
@@ -59,10 +195,22 @@ class Enrollment:
         """
         Get a list of courses a specific student is enrolled in.
         """
-        return [enrollment['course'] for enrollment in self._enrollments if enrollment['student'] == student]
+        return list(self._by_student.get(student, ()))
 
     def get_students_by_course(self, course: Course) -> List[Student]:
         """
         Get a list of students enrolled in a specific course.
         """
-        return [enrollment['student'] for enrollment in self._enrollments if enrollment['course'] == course]
\ No newline at end of file
+        return list(self._by_course.get(course, ()))
+
+    def count_students(self, course: Course) -> int:
+        """
+        Return the number of students enrolled in a specific course.
+        """
+        return len(self._by_course.get(course, ()))
+
+    def count_courses(self, student: Student) -> int:
+        """
+        Return the number of courses a specific student is enrolled in.
+        """
+        return len(self._by_student.get(student, ()))
\ No newline at end of file
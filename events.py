@@ -0,0 +1,150 @@
+import sys
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import List, Tuple
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'WARNING', ERROR: 'ERROR'}
+
+
+class NullSink:
+    """Discards every message; for bulk jobs that do not need them."""
+
+    def emit(self, level: int, message: str) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+
+class ConsoleSink:
+    """Writes messages straight to the terminal, as the interactive menus expect."""
+
+    def __init__(self, level: int = INFO, stream=None):
+        self.level = level
+        self.stream = stream
+
+    def emit(self, level: int, message: str) -> None:
+        if level >= self.level:
+            print(message, file=self.stream or sys.stdout)
+
+    def flush(self) -> None:
+        (self.stream or sys.stdout).flush()
+
+
+class MemorySink:
+    """Collects (level, message) pairs in memory, e.g. to summarize a bulk job afterwards."""
+
+    def __init__(self, level: int = DEBUG):
+        self.level = level
+        self.messages: List[Tuple[int, str]] = []
+
+    def emit(self, level: int, message: str) -> None:
+        if level >= self.level:
+            self.messages.append((level, message))
+
+    def flush(self) -> None:
+        pass
+
+    def clear(self) -> None:
+        self.messages.clear()
+
+
+class BufferedFileSink:
+    """Appends timestamped messages to a file, writing them in batches of `batch_size`."""
+
+    def __init__(self, filename: str, level: int = INFO, batch_size: int = 1000):
+        self.filename = filename
+        self.level = level
+        self.batch_size = batch_size
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+
+    def emit(self, level: int, message: str) -> None:
+        if level >= self.level:
+            line = f"{datetime.now().isoformat()} {LEVEL_NAMES.get(level, level)} {message}\n"
+            with self._lock:
+                self._buffer.append(line)
+                if len(self._buffer) >= self.batch_size:
+                    self._write_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._write_locked()
+
+    def _write_locked(self) -> None:
+        if self._buffer:
+            with open(self.filename, 'a', encoding='utf-8') as f:
+                f.writelines(self._buffer)
+            self._buffer.clear()
+
+
+_sink = ConsoleSink()
+_scoped_sink: ContextVar = ContextVar('events_sink', default=None)  # Set by scoped_sink, overrides _sink
+
+
+def get_sink():
+    sink = _scoped_sink.get()
+    return _sink if sink is None else sink
+
+
+def set_sink(sink) -> None:
+    """Route domain messages to `sink` process-wide, flushing the previous one."""
+    global _sink
+    _sink.flush()
+    _sink = sink
+
+
+@contextmanager
+def use_sink(sink):
+    """Temporarily route domain messages to `sink`, e.g. a NullSink around a bulk import."""
+    previous = _sink
+    set_sink(sink)
+    try:
+        yield sink
+    finally:
+        set_sink(previous)
+
+
+@contextmanager
+def scoped_sink(sink):
+    """
+    Route the messages emitted in the current context (thread or asyncio task) to `sink`, e.g. one
+    MemorySink per server request. Other threads and tasks, and the process-wide sink, are unaffected.
+    """
+    token = _scoped_sink.set(sink)
+    try:
+        yield sink
+    finally:
+        _scoped_sink.reset(token)
+        sink.flush()
+
+
+def emit(message: str, level: int = INFO) -> None:
+    get_sink().emit(level, message)
+
+
+def debug(message: str) -> None:
+    get_sink().emit(DEBUG, message)
+
+
+def info(message: str) -> None:
+    get_sink().emit(INFO, message)
+
+
+def warning(message: str) -> None:
+    get_sink().emit(WARNING, message)
+
+
+def error(message: str) -> None:
+    get_sink().emit(ERROR, message)
+
+
+def flush() -> None:
+    get_sink().flush()
@@ -0,0 +1,186 @@
+import threading
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; recompute() falls back to a pure-Python pass
+    np = None
+
+# Course percentage -> grade points, on the usual letter scale (F below 60, A from 93)
+THRESHOLDS = (60, 63, 67, 70, 73, 77, 80, 83, 87, 90, 93)
+POINTS = (0.0, 0.7, 1.0, 1.3, 1.7, 2.0, 2.3, 2.7, 3.0, 3.3, 3.7, 4.0)
+SCALE = 100  # Scores and grade points are summed as integer hundredths, which add up exactly in any order
+
+
+def grade_points(percent: float) -> float:
+    """Grade points (0.0-4.0) for a course percentage."""
+    return POINTS[bisect_right(THRESHOLDS, percent)]
+
+
+def _hundredths(value: float) -> int:
+    return round(value * SCALE)
+
+
+class _CourseResult:
+    """
+    A student's running score total in one course and the grade points it currently contributes
+    to their GPA, both in hundredths.
+    """
+    __slots__ = ('total', 'count', 'points', 'units', 'term')
+
+    def __init__(self, units: int, term: str):
+        self.total = 0
+        self.count = 0
+        self.points = 0
+        self.units = units
+        self.term = term
+
+
+class GpaEngine:
+    """
+    Unit-weighted GPA kept up to date grade by grade. A student's course grade is the mean of
+    their assignment scores in the course, turned into grade points on the letter scale; GPA is
+    the sum of units x grade points over the sum of units of the graded courses.
+
+    Running totals per (student, course), per (student, term) and per student make each grade
+    insert or change O(1): the course mean is updated from its running sum and the difference
+    in quality points is applied to the term and cumulative totals. A course is counted in the
+    term that was open when its first grade arrived. recompute() rebuilds everything from the
+    gradebooks in one vectorized pass; close_term() runs it and opens the next term.
+
+    Every running total is an integer (scores and grade points in hundredths, see SCALE), so a
+    GPA is the same whatever order its grades were loaded or changed in.
+    """
+
+    def __init__(self, students: Optional[Dict[str, 'Student']] = None, term: str = 'current'):
+        """
+        :param students: student_id -> Student; their `gpa` attribute follows the cumulative GPA.
+        :param term: Label of the open term.
+        """
+        self._lock = threading.RLock()
+        self.students = students if students is not None else {}
+        self.term = term
+        self.closed_terms: List[str] = []
+        self._results: Dict[Tuple[str, str], _CourseResult] = {}  # (student_id, course_code) -> result
+        self._term_totals: Dict[Tuple[str, str], List[int]] = {}  # (student_id, term) -> [quality points, units]
+        self._totals: Dict[str, List[int]] = {}  # student_id -> [quality points, units]
+
+    def listener(self, course):
+        """Callback for a course's Gradebook: (student_id, old score or None, new score)."""
+        return lambda student_id, old, new: self.record(student_id, course, new, old)
+
+    def record(self, student_id: str, course, score: float, old_score: Optional[float] = None) -> None:
+        """Fold in a new score (or a change from `old_score`) for one assignment of a course."""
+        with self._lock:
+            key = (student_id, course.course_code)
+            result = self._results.get(key)
+            if result is None:
+                result = self._results[key] = _CourseResult(course.units, self.term)
+            if old_score is None:
+                result.count += 1
+                result.total += _hundredths(score)
+            else:
+                result.total += _hundredths(score) - _hundredths(old_score)
+            first = result.count == 1 and old_score is None
+            points = _hundredths(grade_points(result.total / result.count / SCALE))
+            self._apply(student_id, result, result.units * (points - result.points), result.units if first else 0)
+            result.points = points
+
+    def _apply(self, student_id: str, result: _CourseResult, quality: int, units: int) -> None:
+        for totals in (self._term_totals.setdefault((student_id, result.term), [0, 0]),
+                       self._totals.setdefault(student_id, [0, 0])):
+            totals[0] += quality
+            totals[1] += units
+        self._update_student(student_id)
+
+    def _update_student(self, student_id: str) -> None:
+        student = self.students.get(student_id)
+        gpa = self.cumulative_gpa(student_id)
+        if student is not None and gpa is not None:
+            student.gpa = gpa
+
+    @staticmethod
+    def _gpa(totals: Optional[List[int]]) -> Optional[float]:
+        if not totals or not totals[1]:
+            return None
+        return round(min(4.0, max(0.0, totals[0] / (totals[1] * SCALE))), 2)
+
+    def term_gpa(self, student_id: str, term: Optional[str] = None) -> Optional[float]:
+        """GPA over the courses of one term (the open term by default); None without graded units."""
+        return self._gpa(self._term_totals.get((student_id, term or self.term)))
+
+    def cumulative_gpa(self, student_id: str) -> Optional[float]:
+        """GPA over every graded course; None without graded units."""
+        return self._gpa(self._totals.get(student_id))
+
+    def units(self, student_id: str, term: Optional[str] = None) -> int:
+        """Graded units in a term, or in total when `term` is None."""
+        totals = self._totals.get(student_id) if term is None else self._term_totals.get((student_id, term))
+        return int(totals[1]) if totals else 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+            self._term_totals.clear()
+            self._totals.clear()
+
+    def recompute(self, courses: Iterable['Course']) -> None:
+        """
+        Rebuild every running total from the courses' gradebooks: per-student score sums and
+        counts of each course come from one bincount over its columns, grade points from one
+        searchsorted, so the whole catalogue is a handful of array operations per course.
+        Courses keep the term they were counted in; courses not seen before go to the open term.
+        """
+        with self._lock:
+            terms = {key: result.term for key, result in self._results.items()}
+            self.clear()
+            for course in courses:
+                for student_id, total, count, points in self._course_means(course.gradebook):
+                    result = _CourseResult(course.units, terms.get((student_id, course.course_code), self.term))
+                    result.total, result.count, result.points = total, count, points
+                    self._results[(student_id, course.course_code)] = result
+                    for totals in (self._term_totals.setdefault((student_id, result.term), [0, 0]),
+                                   self._totals.setdefault(student_id, [0, 0])):
+                        totals[0] += result.units * points
+                        totals[1] += result.units
+            for student_id in self._totals:
+                self._update_student(student_id)
+
+    @staticmethod
+    def _course_means(gradebook) -> List[Tuple[str, int, int, int]]:
+        """(student_id, score total, score count, grade points) for each student in a gradebook, in hundredths."""
+        if not len(gradebook):
+            return []
+        if np is not None:
+            student_col = np.frombuffer(gradebook.student_col, dtype=np.uint32)
+            # rint rounds half to even like round(), and float64 sums of these integers are exact
+            scores = np.rint(np.frombuffer(gradebook.score_col, dtype=np.float64) * SCALE)
+            n = len(gradebook.student_ids)
+            totals = np.bincount(student_col, weights=scores, minlength=n)
+            counts = np.bincount(student_col, minlength=n)
+            graded = counts > 0
+            means = np.divide(totals, counts, out=np.zeros(n), where=graded) / SCALE
+            points = np.rint(np.asarray(POINTS)[np.searchsorted(THRESHOLDS, means, side='right')] * SCALE)
+            return [(gradebook.student_ids[s], int(totals[s]), int(counts[s]), int(points[s]))
+                    for s in np.flatnonzero(graded)]
+        totals: Dict[int, List[int]] = {}
+        for s, score in zip(gradebook.student_col, gradebook.score_col):
+            entry = totals.setdefault(s, [0, 0])
+            entry[0] += _hundredths(score)
+            entry[1] += 1
+        return [(gradebook.student_ids[s], total, count, _hundredths(grade_points(total / count / SCALE)))
+                for s, (total, count) in totals.items()]
+
+    def close_term(self, courses: Iterable['Course'], next_term: str) -> Dict[str, Optional[float]]:
+        """
+        Close the open term: recompute from the gradebooks, then open `next_term`.
+        :return: student_id -> GPA of the term just closed.
+        """
+        with self._lock:
+            self.recompute(courses)
+            closed = self.term
+            self.closed_terms.append(closed)
+            self.term = next_term
+            return {student_id: self._gpa(totals)
+                    for (student_id, term), totals in self._term_totals.items() if term == closed}
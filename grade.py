@@ -2,6 +2,8 @@ from student import Student
 from assignment import Assignment
 
 class Grade:
+    __slots__ = ('__student', '__assignment', '__score', '__feedback')
+
     def __init__(self, student: 'Student', assignment: 'Assignment', score: float, feedback: str = None):
         self.__student = student  # The student associated with the grade
         self.__assignment = assignment  # The assignment associated with the grade
@@ -59,9 +61,11 @@ class Grade:
         }
 
     @classmethod
-    def from_dict(cls, data: dict, students: list[Student], assignments: list[Assignment]) -> 'Grade':
-        """Create a Grade object from a dictionary."""
-        student = next((s for s in students if s.student_id == data['student_id']), None)
+    def from_dict(cls, data: dict, students, assignments: list[Assignment]) -> 'Grade':
+        """Create a Grade object from a dictionary. `students` may be a list or a dict keyed by student_id."""
+        if not isinstance(students, dict):
+            students = {s.student_id: s for s in students}
+        student = students.get(data['student_id'])
         assignment = next((a for a in assignments if a.title == data['assignment_title']), None)
 
         if not student:
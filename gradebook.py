@@ -0,0 +1,186 @@
+import math
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure-Python paths below give the same results
+    np = None
+
+
+class Gradebook:
+    """
+    Columnar score store for one course: parallel student-index, assignment-index and
+    score columns. Statistics run as vectorized NumPy operations when NumPy is installed.
+    """
+
+    __slots__ = ('student_ids', 'assignment_titles', '_student_index', '_assignment_index',
+                 '_rows', 'student_col', 'assignment_col', 'score_col', 'listener')
+
+    def __init__(self):
+        self.student_ids: List[str] = []  # student index -> student_id
+        self.assignment_titles: List[str] = []  # assignment index -> title
+        self._student_index: Dict[str, int] = {}
+        self._assignment_index: Dict[str, int] = {}
+        self._rows: Dict[Tuple[int, int], int] = {}  # (student index, assignment index) -> row
+        self.student_col = array('I')
+        self.assignment_col = array('I')
+        self.score_col = array('d')
+        self.listener = None  # Optional callback(student_id, old score or None, new score), e.g. the GPA engine
+
+    def __len__(self) -> int:
+        return len(self.score_col)
+
+    @classmethod
+    def from_columns(cls, student_ids: List[str], assignment_titles: List[str], student_col: array,
+                     assignment_col: array, score_col: array) -> 'Gradebook':
+        """
+        Rebuild a gradebook from its columns (e.g. sent to a worker process as raw arrays),
+        together with the indexes that lookups and per-assignment statistics go through.
+        """
+        gradebook = cls()
+        gradebook.student_ids = list(student_ids)
+        gradebook.assignment_titles = list(assignment_titles)
+        gradebook._student_index = {student_id: s for s, student_id in enumerate(gradebook.student_ids)}
+        gradebook._assignment_index = {title: a for a, title in enumerate(gradebook.assignment_titles)}
+        gradebook._rows = {(s, a): row for row, (s, a) in enumerate(zip(student_col, assignment_col))}
+        gradebook.student_col = student_col
+        gradebook.assignment_col = assignment_col
+        gradebook.score_col = score_col
+        return gradebook
+
+    @staticmethod
+    def _intern(value: str, values: List[str], index: Dict[str, int]) -> int:
+        position = index.get(value)
+        if position is None:
+            position = index[value] = len(values)
+            values.append(value)
+        return position
+
+    def add(self, student_id: str, assignment_title: str, score: float) -> None:
+        """Record a score, replacing any earlier score for the same student and assignment."""
+        s = self._intern(student_id, self.student_ids, self._student_index)
+        a = self._intern(assignment_title, self.assignment_titles, self._assignment_index)
+        row = self._rows.get((s, a))
+        if row is None:
+            self._rows[(s, a)] = len(self.score_col)
+            self.student_col.append(s)
+            self.assignment_col.append(a)
+            self.score_col.append(score)
+            old = None
+        else:
+            old = self.score_col[row]
+            self.score_col[row] = score
+        if self.listener is not None and old != score:
+            self.listener(student_id, old, score)
+
+    def has_assignment(self, assignment_title: str) -> bool:
+        """Whether any score has been recorded for this assignment."""
+        return assignment_title in self._assignment_index
+
+    def get(self, student_id: str, assignment_title: str) -> Optional[float]:
+        s = self._student_index.get(student_id)
+        a = self._assignment_index.get(assignment_title)
+        row = self._rows.get((s, a))
+        return None if row is None else self.score_col[row]
+
+    def rows(self):
+        """Yield (student_id, assignment_title, score) in insertion order."""
+        for s, a, score in zip(self.student_col, self.assignment_col, self.score_col):
+            yield self.student_ids[s], self.assignment_titles[a], score
+
+    def scores(self, assignment_title: Optional[str] = None):
+        """Score column, optionally restricted to one assignment (a NumPy array when available)."""
+        if np is not None:
+            scores = np.array(self.score_col, dtype=float)
+            if assignment_title is None:
+                return scores
+            a = self._assignment_index.get(assignment_title)
+            if a is None:
+                return scores[:0]
+            return scores[np.array(self.assignment_col, dtype=np.int64) == a]
+        if assignment_title is None:
+            return list(self.score_col)
+        a = self._assignment_index.get(assignment_title)
+        return [score for col, score in zip(self.assignment_col, self.score_col) if col == a]
+
+    def mean(self, assignment_title: Optional[str] = None) -> float:
+        scores = self.scores(assignment_title)
+        if len(scores) == 0:
+            return 0.0
+        if np is not None:
+            return float(scores.mean())
+        return math.fsum(scores) / len(scores)
+
+    def median(self, assignment_title: Optional[str] = None) -> float:
+        return self.percentiles([50], assignment_title)[0]
+
+    def stddev(self, assignment_title: Optional[str] = None) -> float:
+        """Population standard deviation."""
+        scores = self.scores(assignment_title)
+        if len(scores) == 0:
+            return 0.0
+        if np is not None:
+            return float(scores.std())
+        mean = math.fsum(scores) / len(scores)
+        return math.sqrt(math.fsum((x - mean) ** 2 for x in scores) / len(scores))
+
+    def percentiles(self, qs: Sequence[float], assignment_title: Optional[str] = None) -> List[float]:
+        """Percentiles (0-100) with linear interpolation between closest ranks."""
+        scores = self.scores(assignment_title)
+        if len(scores) == 0:
+            return [0.0 for _ in qs]
+        if np is not None:
+            return [float(x) for x in np.percentile(scores, list(qs))]
+        ordered = sorted(scores)
+        result = []
+        for q in qs:
+            rank = (len(ordered) - 1) * q / 100
+            low = math.floor(rank)
+            high = min(low + 1, len(ordered) - 1)
+            result.append(ordered[low] + (ordered[high] - ordered[low]) * (rank - low))
+        return result
+
+    def histogram(self, bins: int = 10, score_range: Tuple[float, float] = (0, 100),
+                  assignment_title: Optional[str] = None) -> Tuple[List[int], List[float]]:
+        """Return (counts, bin_edges); the last bin includes its upper edge."""
+        scores = self.scores(assignment_title)
+        if np is not None:
+            counts, edges = np.histogram(scores, bins=bins, range=score_range)
+            return counts.tolist(), edges.tolist()
+        low, high = score_range
+        width = (high - low) / bins
+        edges = [low + i * width for i in range(bins + 1)]
+        counts = [0] * bins
+        for score in scores:
+            if low <= score <= high:
+                counts[min(int((score - low) / width), bins - 1)] += 1
+        return counts, edges
+
+    def weighted_totals(self, weights: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+        """
+        Per-student sum of score x assignment weight.
+        :param weights: assignment_title -> weight; assignments not listed weigh 1.0 (all 1.0 if omitted).
+        """
+        weight_col = [1.0 if weights is None else weights.get(title, 1.0) for title in self.assignment_titles]
+        if np is not None:
+            student_col = np.array(self.student_col, dtype=np.int64)
+            assignment_col = np.array(self.assignment_col, dtype=np.int64)
+            weighted = np.array(self.score_col, dtype=float) * np.array(weight_col, dtype=float)[assignment_col]
+            totals = np.bincount(student_col, weights=weighted, minlength=len(self.student_ids))
+            return dict(zip(self.student_ids, totals.tolist()))
+        totals = [0.0] * len(self.student_ids)
+        for s, a, score in zip(self.student_col, self.assignment_col, self.score_col):
+            totals[s] += score * weight_col[a]
+        return dict(zip(self.student_ids, totals))
+
+    def summary(self, assignment_title: Optional[str] = None) -> dict:
+        p25, p50, p75 = self.percentiles([25, 50, 75], assignment_title)
+        return {
+            'count': len(self.scores(assignment_title)),
+            'mean': self.mean(assignment_title),
+            'median': p50,
+            'stddev': self.stddev(assignment_title),
+            'p25': p25,
+            'p75': p75,
+        }
@@ -0,0 +1,153 @@
+import csv
+import json
+import os
+from typing import Iterator, List, Optional, Tuple
+from grade import Grade
+import events
+
+FIELDS = ('student_id', 'assignment_title', 'score', 'feedback')
+BATCH_SIZE = 1000  # Rows validated and applied per course lock
+MAX_ERRORS = 1000  # Row errors kept in a GradeImportResult; later ones are only counted
+
+
+def file_format(filename: str, format: Optional[str] = None) -> str:
+    """'csv' or 'jsonl', from `format` or else the file extension."""
+    format = (format or os.path.splitext(filename)[1].lstrip('.')).lower()
+    if format == 'json':
+        format = 'jsonl'
+    if format not in ('csv', 'jsonl'):
+        raise ValueError(f"Unsupported gradebook format '{format}'; use .csv or .jsonl.")
+    return format
+
+
+class GradeImportResult:
+    """Outcome of import_grades: the number of grades added and the rejected rows by line number."""
+
+    def __init__(self, max_errors: int = MAX_ERRORS):
+        self.imported = 0
+        self.rows = 0
+        self.error_count = 0
+        self.errors: List[Tuple[int, str]] = []  # (line number, reason), the first max_errors only
+        self.max_errors = max_errors
+
+    def reject(self, line: int, reason: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((line, reason))
+
+    def summary(self) -> str:
+        return f"{self.rows} rows: {self.imported} imported, {self.error_count} rejected"
+
+
+def iter_rows(filename: str, format: Optional[str] = None) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Stream (line number, row, error) from a CSV file with a header row or a JSON-lines file;
+    a row that cannot be parsed comes with row None and the parse error.
+    """
+    format = file_format(filename, format)
+    with open(filename, 'r', encoding='utf-8', newline='') as f:
+        if format == 'csv':
+            reader = csv.DictReader(f)
+            missing = [field for field in FIELDS[:3] if field not in (reader.fieldnames or [])]
+            if missing:
+                yield 1, None, f"missing column(s): {', '.join(missing)}"
+                return
+            for row in reader:
+                yield reader.line_num, row, None
+        else:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    yield line_number, None, f"invalid JSON: {e}"
+                    continue
+                if isinstance(row, dict):
+                    yield line_number, row, None
+                else:
+                    yield line_number, None, "expected a JSON object"
+
+
+def import_grades(platform_admin, course, filename: str, format: Optional[str] = None,
+                  batch_size: int = BATCH_SIZE, max_errors: int = MAX_ERRORS) -> GradeImportResult:
+    """
+    Import a course's grades from a CSV or JSON-lines file (columns student_id, assignment_title,
+    score and optional feedback), streaming it in batches so memory does not grow with the file.
+    Students are resolved through the registry and checked against the enrollment index,
+    assignments through the course's title index (Course.get_assignment); each batch is validated with
+    Grade.validate_score and then applied with Course.add_grades under one lock.
+    :raises ValueError: If the format is not supported.
+    :raises OSError: If the file cannot be read.
+    """
+    result = GradeImportResult(max_errors)
+    batch: List[Grade] = []
+    lines: List[int] = []
+
+    def flush():
+        rejected = {id(grade): reason for grade, reason in course.add_grades(batch)}
+        for grade, line in zip(batch, lines):
+            if id(grade) in rejected:
+                result.reject(line, rejected[id(grade)])
+            else:
+                result.imported += 1
+        batch.clear()
+        lines.clear()
+
+    for line, row, error in iter_rows(filename, format):
+        result.rows += 1
+        if error:
+            result.reject(line, error)
+            continue
+        student_id = str(row.get('student_id') or '').strip()
+        title = str(row.get('assignment_title') or '').strip()
+        student = platform_admin.registry.get_student(student_id)
+        if student is None:
+            result.reject(line, f"unknown student '{student_id}'")
+            continue
+        if not platform_admin.enrollments.is_student_enrolled(student, course):
+            result.reject(line, f"student '{student_id}' is not enrolled in {course.course_code}")
+            continue
+        assignment = course.get_assignment(title)
+        if assignment is None:
+            result.reject(line, f"unknown assignment '{title}'")
+            continue
+        try:
+            grade = Grade(student, assignment, float(row.get('score')), row.get('feedback') or '')
+        except (TypeError, ValueError) as e:
+            result.reject(line, f"invalid score {row.get('score')!r}: {e}")
+            continue
+        batch.append(grade)
+        lines.append(line)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    result.errors.sort()  # Rejections from Course.add_grades arrive per batch
+    events.info(f"Grade import into {course.course_code}: {result.summary()}.")
+    return result
+
+
+def export_grades(course, filename: str, format: Optional[str] = None) -> int:
+    """
+    Write a course's grades to a CSV or JSON-lines file, one row at a time, in the layout
+    import_grades reads. The file is written to a temporary name and renamed into place.
+    :return: The number of rows written.
+    """
+    format = file_format(filename, format)
+    temp_filename = filename + '.tmp'
+    count = 0
+    with open(temp_filename, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f) if format == 'csv' else None
+        if writer:
+            writer.writerow(FIELDS)
+        for grade in list(course.grades.values()):
+            row = (grade.student.student_id, grade.assignment.title, grade.score, grade.feedback or '')
+            if writer:
+                writer.writerow(row)
+            else:
+                f.write(json.dumps(dict(zip(FIELDS, row))) + '\n')
+            count += 1
+    os.replace(temp_filename, filename)
+    events.info(f"Exported {count} grade(s) of {course.course_code} to {filename}.")
+    return count
@@ -1,8 +1,11 @@
 from assignment import Assignment  # Ensure Assignment class is defined and imported
 from person import Person  # Ensure Person class is defined and imported
+import events
 
 # Ensure Instructor class is properly defined, inherits from Person class
 class Instructor(Person):
+    __slots__ = ('__instructor_id', 'role', '_courses_taught', '_assignments')
+
     def __init__(self, name: str, email: str, contact_number: str, address: str, instructor_id: str, role="Instructor"):
         # Initialize the Person class
         super().__init__(name, email, contact_number, address)
@@ -10,7 +13,6 @@ class Instructor(Person):
         self.role = role  # Role of the instructor
         self._courses_taught = []  # List to store courses taught by the instructor
         self._assignments = []  # List to store assignments assigned by the instructor
-        self.course = []
 
 
     @property
@@ -41,20 +43,20 @@ class Instructor(Person):
         """Add a course to the list of courses taught by the instructor."""
         if course not in self._courses_taught:  # Avoid duplicates
             self._courses_taught.append(course)
-            print(f"Course '{course.course_name}' added to instructor '{self.name}'.")
+            events.info(f"Course '{course.course_name}' added to instructor '{self.name}'.")
         else:
-            print(f"Instructor '{self.name}' is already teaching the course '{course.course_name}'.")
+            events.warning(f"Instructor '{self.name}' is already teaching the course '{course.course_name}'.")
 
     def assign_assignment(self, assignment: Assignment) -> None:
         """Assign an assignment to a course taught by the instructor."""
         if assignment.course not in self._courses_taught:
-            print(f"Cannot assign '{assignment.title}' to instructor '{self.name}': course not taught by instructor.")
+            events.warning(f"Cannot assign '{assignment.title}' to instructor '{self.name}': course not taught by instructor.")
         else:
             if assignment not in self._assignments:  # Avoid duplicates
                 self._assignments.append(assignment)
-                print(f"Assignment '{assignment.title}' assigned to instructor '{self.name}'.")
+                events.info(f"Assignment '{assignment.title}' assigned to instructor '{self.name}'.")
             else:
-                print(f"Assignment '{assignment.title}' is already assigned.")
+                events.warning(f"Assignment '{assignment.title}' is already assigned.")
 
     def display_info(self) -> str:
         """Display detailed information about the instructor."""
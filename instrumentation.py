@@ -0,0 +1,300 @@
+import cProfile
+import functools
+import io
+import json
+import pstats
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Latency histogram bucket upper bounds: powers of two from 1 us to about 2 minutes
+BOUNDS = tuple(1e-6 * 2 ** i for i in range(28))
+
+# (module, class, method) wrapped by enable(), with the operation name they are reported under
+POINTS = [
+    ('platform_admin', 'PlatformAdmin', 'load_data'),
+    ('platform_admin', 'PlatformAdmin', 'save_data'),
+    ('platform_admin', 'PlatformAdmin', 'bulk_enroll'),
+    ('enrollment', 'Enrollment', 'enroll_student'),
+    ('enrollment', 'Enrollment', 'enroll_many'),
+    ('enrollment', 'Enrollment', 'unenroll_student'),
+    ('course', 'Course', 'assign_assignment'),
+    ('course', 'Course', 'enter_grade'),
+    ('course', 'Course', 'add_grade'),
+    ('course', 'Course', 'add_grades'),
+    ('gradebook_io', None, 'import_grades'),
+    ('gradebook_io', None, 'export_grades'),
+    ('lazy_store', 'LazyJsonStorage', 'load'),
+    ('lazy_store', 'LazyJsonStorage', 'save'),
+    ('lazy_store', 'LazyJsonStorage', 'load_roster'),
+    ('lazy_store', 'LazyJsonStorage', 'hydrate_all'),
+]
+
+# Menu actions of E_Learning_Environment; each can also be profiled with profile_next()
+MENU_ACTIONS = (
+    'view_student_grades', 'submit_assignment', 'enroll_in_courses', 'view_student_courses',
+    'view_discussion_threads', 'view_timetable', 'display_all_schedules', 'view_announcements', 'search',
+    'view_due_assignments', 'assign_assignments', 'input_grades', 'import_export_grades',
+    'view_enrolled_students', 'view_courses_taught', 'create_announcement', 'view_users',
+    'view_schedule_conflicts', 'create_announcements',
+)
+POINTS += [('e_learning_environment', 'E_Learning_Environment', action) for action in MENU_ACTIONS]
+
+
+class Histogram:
+    """Call count, errors, total/min/max and a log2-bucketed latency histogram of one operation."""
+    __slots__ = ('count', 'errors', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self.buckets = [0] * (len(BOUNDS) + 1)  # The last bucket takes anything slower
+
+    def record(self, seconds: float, ok: bool = True) -> None:
+        self.count += 1
+        self.errors += not ok
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        self.buckets[bisect_left(BOUNDS, seconds)] += 1
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the pct-th percentile (capped at the slowest call)."""
+        rank = pct / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min(BOUNDS[i] if i < len(BOUNDS) else self.max, self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            'count': self.count, 'errors': self.errors, 'total_s': round(self.total, 6),
+            'mean_ms': round(self.total / self.count * 1e3, 4) if self.count else 0.0,
+            'min_ms': round(self.min * 1e3, 4) if self.count else 0.0, 'max_ms': round(self.max * 1e3, 4),
+            'p50_ms': round(self.percentile(50) * 1e3, 4), 'p95_ms': round(self.percentile(95) * 1e3, 4),
+            'p99_ms': round(self.percentile(99) * 1e3, 4),
+            'histogram': {f"<={bound * 1e3:g}ms": n for bound, n in zip(BOUNDS, self.buckets) if n}
+                         | ({'slower': self.buckets[-1]} if self.buckets[-1] else {}),
+        }
+
+
+_lock = threading.Lock()
+_stats: Dict[str, Histogram] = {}
+_counters: Counter = Counter()
+_originals: List[Tuple[object, str, Callable]] = []  # What enable() replaced, for disable()
+_profile_requests: Dict[str, dict] = {}  # operation -> profile_next() options, consumed by the next call
+enabled = False
+
+
+def record(name: str, seconds: float, ok: bool = True) -> None:
+    """Add one timing to an operation's histogram."""
+    with _lock:
+        histogram = _stats.get(name)
+        if histogram is None:
+            histogram = _stats[name] = Histogram()
+        histogram.record(seconds, ok)
+
+
+def count(name: str, n: int = 1) -> None:
+    """Bump a named counter (a no-op unless instrumentation is enabled)."""
+    if enabled:
+        with _lock:
+            _counters[name] += n
+
+
+def _wrap(name: str, fn: Callable) -> Callable:
+    @functools.wraps(fn)
+    def timed(*args, **kwargs):
+        if _profile_requests and name in _profile_requests:
+            return _profiled(name, fn, args, kwargs)
+        start = time.perf_counter()
+        ok = False
+        try:
+            result = fn(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            record(name, time.perf_counter() - start, ok)
+    return timed
+
+
+def enable(points=None) -> None:
+    """
+    Start timing the instrumentation points by wrapping them in place. Nothing is wrapped while
+    instrumentation is disabled, so the disabled path costs nothing at all.
+    :param points: (module, class or None, function) triples; POINTS by default.
+    """
+    global enabled
+    if enabled:
+        return
+    for module_name, class_name, attribute in points or POINTS:
+        module = sys.modules.get(module_name) or __import__(module_name)
+        owner = getattr(module, class_name) if class_name else module
+        original = owner.__dict__.get(attribute)
+        if original is None:
+            continue
+        name = f"{class_name}.{attribute}" if class_name else f"{module_name}.{attribute}"
+        _originals.append((owner, attribute, original))
+        setattr(owner, attribute, _wrap(name, original))
+    enabled = True
+
+
+def disable() -> None:
+    """Restore every wrapped function; recorded statistics are kept until reset()."""
+    global enabled
+    while _originals:
+        owner, attribute, original = _originals.pop()
+        setattr(owner, attribute, original)
+    _profile_requests.clear()
+    enabled = False
+
+
+def reset() -> None:
+    with _lock:
+        _stats.clear()
+        _counters.clear()
+
+
+def snapshot() -> dict:
+    """Every operation's statistics and every counter, as plain data."""
+    with _lock:
+        return {'operations': {name: histogram.to_dict() for name, histogram in sorted(_stats.items())},
+                'counters': dict(sorted(_counters.items()))}
+
+
+def dump_text(stream=None) -> None:
+    """Print a table of the operations (slowest total first) and the counters."""
+    stream = stream or sys.stdout
+    data = snapshot()
+    print(f"{'operation':<46} {'calls':>7} {'errors':>6} {'total s':>9} {'mean ms':>9} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}", file=stream)
+    for name, row in sorted(data['operations'].items(), key=lambda item: -item[1]['total_s']):
+        print(f"{name:<46} {row['count']:>7} {row['errors']:>6} {row['total_s']:>9.3f} {row['mean_ms']:>9.3f} "
+              f"{row['p50_ms']:>9.3f} {row['p95_ms']:>9.3f} {row['p99_ms']:>9.3f} {row['max_ms']:>9.3f}", file=stream)
+    for name, value in data['counters'].items():
+        print(f"{name:<46} {value:>7}", file=stream)
+
+
+def dump_json(filename: Optional[str] = None) -> str:
+    """Return the statistics as JSON, also writing them to `filename` when given."""
+    text = json.dumps(snapshot(), indent=2)
+    if filename:
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(text)
+    return text
+
+
+def profile_next(operation: str, mode: str = 'cprofile', output: Optional[str] = None,
+                 limit: int = 25, interval: float = 0.001) -> None:
+    """
+    Profile the next call of one instrumented operation, e.g. 'E_Learning_Environment.search'
+    (a bare menu action name works too), enabling instrumentation if needed.
+    :param mode: 'cprofile' for deterministic profiling, 'sample' for a stack-sampling run that
+                 does not slow the action down as much.
+    :param output: cProfile: .prof file for pstats/snakeviz; sample: text file. Printed when omitted.
+    :param limit: Number of functions (or sampled lines) shown.
+    :param interval: Seconds between samples in 'sample' mode.
+    """
+    if mode not in ('cprofile', 'sample'):
+        raise ValueError("mode must be 'cprofile' or 'sample'.")
+    if '.' not in operation:
+        operation = f"E_Learning_Environment.{operation}"
+    enable()
+    _profile_requests[operation] = {'mode': mode, 'output': output, 'limit': limit, 'interval': interval}
+
+
+def _profiled(name: str, fn: Callable, args, kwargs):
+    options = _profile_requests.pop(name)
+    start = time.perf_counter()
+    ok = False
+    try:
+        if options['mode'] == 'cprofile':
+            profiler = cProfile.Profile()
+            try:
+                result = profiler.runcall(fn, *args, **kwargs)
+            finally:
+                _report_profile(name, profiler, options)
+        else:
+            with Sampler(options['interval']) as sampler:
+                result = fn(*args, **kwargs)
+            _write_report(name, sampler.report(options['limit']), options['output'])
+        ok = True
+        return result
+    finally:
+        record(name, time.perf_counter() - start, ok)
+
+
+def _report_profile(name: str, profiler: cProfile.Profile, options: dict) -> None:
+    if options['output']:
+        profiler.dump_stats(options['output'])
+        print(f"Profile of {name} written to {options['output']}.", file=sys.stderr)
+        return
+    text = io.StringIO()
+    pstats.Stats(profiler, stream=text).sort_stats('cumulative').print_stats(options['limit'])
+    _write_report(name, text.getvalue(), None)
+
+
+def _write_report(name: str, text: str, output: Optional[str]) -> None:
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"Profile of {name} written to {output}.", file=sys.stderr)
+    else:
+        print(f"\nProfile of {name}:\n{text}", file=sys.stderr)
+
+
+class Sampler:
+    """
+    Stack-sampling profiler for the calling thread: a background thread records the thread's
+    current stack every `interval` seconds. Cheap enough to leave the profiled code at near full speed.
+    """
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.samples: Counter = Counter()  # Tuple of 'file:function' frames, outermost first -> samples
+        self._thread_id = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self) -> 'Sampler':
+        self._thread_id = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}:{frame.f_lineno}")
+                frame = frame.f_back
+            self.samples[tuple(reversed(stack))] += 1
+
+    def report(self, limit: int = 25) -> str:
+        """The lines seen most often in the sampled stacks, with their own and cumulative share of samples."""
+        total = sum(self.samples.values())
+        if not total:
+            return "No samples taken (the call was shorter than the sampling interval).\n"
+        own, cumulative = Counter(), Counter()
+        for stack, n in self.samples.items():
+            own[stack[-1]] += n
+            for frame in set(stack):
+                cumulative[frame] += n
+        lines = [f"{total} samples every {self.interval * 1e3:g} ms", f"{'own %':>7} {'cum %':>7}  function"]
+        for frame, n in cumulative.most_common(limit):
+            lines.append(f"{own[frame] / total:>7.1%} {n / total:>7.1%}  {frame}")
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,135 @@
+import json
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+
+class Journal:
+    """
+    Append-only write-ahead log of platform mutations.
+    Records are buffered and written in groups: one write + fsync covers every record
+    appended since the last commit, either when `group_size` records are pending or
+    when `commit_interval` seconds have passed (checked by a background flusher).
+    """
+
+    def __init__(self, filename: str, start_seq: int = 0, group_size: int = 64,
+                 commit_interval: float = 0.05, compact_after: int = 10000,
+                 on_compact: Optional[Callable[[], None]] = None):
+        self.filename = filename
+        self.seq = start_seq  # Sequence number of the last appended record
+        self.group_size = group_size
+        self.commit_interval = commit_interval
+        self.compact_after = compact_after
+        self.on_compact = on_compact  # Called from the flusher thread once enough records piled up
+        self._pending = []
+        self._since_rotation = 0
+        self._lock = threading.RLock()
+        self._file = open(filename, 'a', encoding='utf-8')
+        self._closed = False
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+
+    @property
+    def old_filename(self) -> str:
+        """Segment kept aside while a compaction folds it into the snapshot."""
+        return self.filename + '.old'
+
+    def append(self, op: str, fields: dict) -> None:
+        """Append a mutation record; it becomes durable at the next group commit."""
+        with self._lock:
+            self.seq += 1
+            entry = {'seq': self.seq, 'op': op}
+            entry.update(fields)
+            self._pending.append(json.dumps(entry, separators=(',', ':'), default=str))
+            self._since_rotation += 1
+            if len(self._pending) >= self.group_size:
+                self._commit_locked()
+
+    def commit(self) -> None:
+        """Write and fsync every pending record."""
+        with self._lock:
+            self._commit_locked()
+
+    def _commit_locked(self) -> None:
+        if not self._pending or self._closed:
+            return
+        self._file.write('\n'.join(self._pending) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending.clear()
+
+    def _flush_loop(self) -> None:
+        while not self._closed:
+            time.sleep(self.commit_interval)
+            self.commit()
+            # Compaction is started here rather than in append(), so it never runs
+            # inside a caller that is holding entity locks.
+            if (self.on_compact and self._since_rotation >= self.compact_after
+                    and not os.path.exists(self.old_filename)):
+                self.on_compact()
+
+    def rotate(self) -> int:
+        """
+        Commit, move the current segment aside and start a fresh one.
+        :return: The sequence number of the last record in the rotated segment.
+        """
+        with self._lock:
+            self._commit_locked()
+            self._file.close()
+            os.replace(self.filename, self.old_filename)
+            self._file = open(self.filename, 'a', encoding='utf-8')
+            self._since_rotation = 0
+            return self.seq
+
+    def discard_old(self) -> None:
+        """Drop the rotated segment once a snapshot covering it is durable."""
+        if os.path.exists(self.old_filename):
+            os.remove(self.old_filename)
+
+    def close(self) -> None:
+        with self._lock:
+            self._commit_locked()
+            self._closed = True
+            self._file.close()
+
+    @staticmethod
+    def replay(filename: str, after_seq: int, apply: Callable[[dict], None]) -> int:
+        """
+        Feed every record with seq > after_seq from the rotated and current segments to `apply`.
+        A torn final line left by a crash mid-write is ignored.
+        :return: The highest sequence number seen.
+        """
+        last_seq = after_seq
+        for path in (filename + '.old', filename):
+            if not os.path.exists(path):
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    if entry['seq'] <= last_seq:
+                        continue
+                    apply(entry)
+                    last_seq = entry['seq']
+        return last_seq
+
+
+_active: Optional[Journal] = None
+
+
+def activate(journal: Optional[Journal]) -> None:
+    """
+    Route mutation records to `journal`, or any object with an append(op, fields) method
+    such as a storage backend (None switches journaling off).
+    """
+    global _active
+    _active = journal
+
+
+def record(op: str, **fields) -> None:
+    """Append a mutation record to the active journal, if journaling is on."""
+    if _active is not None:
+        _active.append(op, fields)
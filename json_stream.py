@@ -0,0 +1,158 @@
+import json
+import os
+from typing import Callable, Iterator, Optional, Tuple
+
+_WHITESPACE = ' \t\n\r'
+
+
+class _Reader:
+    """Chunked text reader that keeps only the unconsumed tail of the file in memory."""
+
+    def __init__(self, fp, chunk_size: int):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.consumed = 0  # Characters dropped from the front of the buffer
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Read another chunk, discarding what has already been parsed. Returns False at EOF."""
+        if self.eof:
+            return False
+        chunk = self._fp.read(self._chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.consumed += self.pos
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buf, self.pos)
+        self.pos += 1
+
+    def value(self, decoder: json.JSONDecoder):
+        """Decode one complete JSON value, reading more of the file as needed."""
+        self.peek()
+        while True:
+            try:
+                obj, end = decoder.raw_decode(self.buf, self.pos)
+                # A value ending exactly at the buffer edge may be truncated (e.g. a number).
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+    @property
+    def position(self) -> int:
+        return self.consumed + self.pos
+
+
+def _walk(reader: _Reader, decoder: json.JSONDecoder,
+          on_count: Optional[Callable[[str, int, bool], None]] = None) -> Iterator[Tuple[str, bool]]:
+    """
+    Walk a top-level JSON object of arrays, yielding (section, is array record) with the reader
+    positioned at the start of each record (or of a non-array value); the caller decodes the value
+    with reader.value() before resuming.
+    :param on_count: Optional callback(section, records so far, section finished) after each array
+                     record and at the end of each array.
+    """
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        section = reader.value(decoder)
+        reader.expect(':')
+        if reader.peek() == '[':
+            reader.expect('[')
+            count = 0
+            if reader.peek() != ']':
+                while True:
+                    reader.peek()
+                    yield section, True
+                    count += 1
+                    if on_count:
+                        on_count(section, count, False)
+                    if reader.peek() == ',':
+                        reader.expect(',')
+                        continue
+                    break
+            reader.expect(']')
+            if on_count:
+                on_count(section, count, True)
+        else:
+            reader.peek()
+            yield section, False
+        if reader.peek() == ',':
+            reader.expect(',')
+            continue
+        reader.expect('}')
+        return
+
+
+def iter_sections(filename: str, chunk_size: int = 1 << 16,
+                  progress: Optional[Callable[[str, int, int, int], None]] = None,
+                  progress_every: int = 10000) -> Iterator[Tuple[str, object]]:
+    """
+    Stream a top-level JSON object of arrays, yielding (section, record) one record at a time.
+    Non-array values are yielded whole as a single (section, value) pair.
+    :param filename: Path to the JSON file.
+    :param chunk_size: Number of characters read from disk at a time.
+    :param progress: Optional callback(section, records, position, total_size).
+    :param progress_every: Report progress after this many records in a section.
+    """
+    total_size = os.path.getsize(filename)
+    decoder = json.JSONDecoder()
+    with open(filename, 'r', encoding='utf-8', newline='') as fp:
+        reader = _Reader(fp, chunk_size)
+
+        def on_count(section, count, done):
+            if done or count % progress_every == 0:
+                progress(section, count, reader.position, total_size)
+
+        for section, _ in _walk(reader, decoder, on_count if progress else None):
+            yield section, reader.value(decoder)
+
+
+def iter_spans(filename: str, chunk_size: int = 1 << 16) -> Iterator[Tuple[str, object, int, int]]:
+    """
+    Stream a file in the iter_sections layout as (section, record, start, end), where start and
+    end are the record's byte offsets in the file (None for a non-array value). The file is read
+    as Latin-1 so that character positions are byte positions; records holding non-ASCII text
+    are decoded again from their UTF-8 bytes.
+    """
+    decoder = json.JSONDecoder()
+    with open(filename, 'r', encoding='latin-1', newline='') as fp:
+        reader = _Reader(fp, chunk_size)
+        for section, in_array in _walk(reader, decoder):
+            start = reader.position
+            value = reader.value(decoder)
+            text = reader.buf[start - reader.consumed:reader.pos]
+            if not text.isascii():
+                value = json.loads(text.encode('latin-1'))
+            if in_array:
+                yield section, value, start, reader.position
+            else:
+                yield section, value, None, None
+
+
+def print_progress(section: str, records: int, position: int, total_size: int) -> None:
+    """Console progress reporter for iter_sections."""
+    percent = (position / total_size * 100) if total_size else 100.0
+    print(f"Loading {section}: {records} records ({percent:.1f}% of file)")
@@ -0,0 +1,532 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import instrumentation
+import json_stream
+import student
+import events
+from announcement_store import date_key
+
+VERSION = 1
+
+# Lookup tables of the offset index: name -> (data.json section, key field). Each maps a key to
+# the byte spans of its records; None keys a whole section.
+TABLES = {
+    'students': ('students', 'student_id'),
+    'student_names': ('students', 'name'),
+    'instructors': ('instructors', 'instructor_id'),
+    'instructor_names': ('instructors', 'name'),
+    'courses': ('courses', 'course_code'),
+    'courses_by_instructor': ('courses', 'instructor_id'),
+    'schedules': ('schedules', 'course_code'),
+    'assignments': ('assignments', 'course_code'),
+    'enrollments': ('enrollments', 'student_id'),
+    'rosters': ('enrollments', 'course_code'),
+    'grades': ('grades', 'course_code'),
+    'student_grades': ('grades', 'student_id'),
+    'announcements': ('announcements', None),
+    'admins': ('admins', None),
+}
+
+
+def sidecar_path(json_filename: str) -> str:
+    """Offset index kept next to a JSON data file (data.json -> data.idx)."""
+    return os.path.splitext(json_filename)[0] + '.idx'
+
+
+def _signature(filename: str) -> List[int]:
+    st = os.stat(filename)
+    return [st.st_size, st.st_mtime_ns]
+
+
+class _TableBuilder:
+    __slots__ = ('keys', 'starts', 'lengths', 'last_key', 'last_seq')
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.starts = array('Q')
+        self.lengths = array('Q')
+        self.last_key = None
+        self.last_seq = -2
+
+    def add(self, key: str, seq: int, start: int, end: int) -> None:
+        if key == self.last_key and seq == self.last_seq + 1:
+            # Consecutive records with the same key share one span ("rec,\nrec"), read back as a JSON array
+            self.lengths[-1] = end - self.starts[-1]
+        else:
+            self.keys.append(key)
+            self.starts.append(start)
+            self.lengths.append(end - start)
+            self.last_key = key
+        self.last_seq = seq
+
+
+class IndexBuilder:
+    """Collects (section, record, byte span) as a data file is scanned or written, then writes the offset index."""
+
+    def __init__(self):
+        self.tables = {name: _TableBuilder() for name in TABLES}
+        self._by_section: Dict[str, List[Tuple[_TableBuilder, Optional[str]]]] = {}
+        for name, (section, field) in TABLES.items():
+            self._by_section.setdefault(section, []).append((self.tables[name], field))
+        self._seq: Dict[str, int] = {}
+        self.journal_seq = 0
+
+    def add(self, section: str, record, start: Optional[int], end: Optional[int]) -> None:
+        if start is None:
+            if section == 'journal_seq':
+                self.journal_seq = record
+            return
+        seq = self._seq.get(section, 0)
+        self._seq[section] = seq + 1
+        for table, field in self._by_section.get(section, ()):
+            table.add('' if field is None else str(record.get(field, '')), seq, start, end)
+
+    def write(self, filename: str, source: List[int]) -> None:
+        """
+        Write the index: a JSON header, then per table the keys (sorted, as one UTF-8 blob with an
+        array of end offsets) and the span starts and lengths, each 8-byte aligned so they can be
+        used straight from a memory map.
+        """
+        parts: List[bytes] = []
+        tables = {}
+        offset = 0
+        for name, table in self.tables.items():
+            order = sorted(range(len(table.keys)), key=table.keys.__getitem__)
+            encoded = [table.keys[i].encode('utf-8') for i in order]
+            ends = array('Q')
+            total = 0
+            for key in encoded:
+                total += len(key)
+                ends.append(total)
+            blobs = (b''.join(encoded), ends.tobytes(), array('Q', (table.starts[i] for i in order)).tobytes(),
+                     array('Q', (table.lengths[i] for i in order)).tobytes())
+            offsets = []
+            for blob in blobs:
+                offsets.append(offset)
+                parts.append(blob + b'\0' * (-len(blob) % 8))
+                offset += len(parts[-1])
+            tables[name] = [len(order)] + offsets
+        header = json.dumps({'version': VERSION, 'byteorder': sys.byteorder, 'source': source,
+                             'journal_seq': self.journal_seq, 'tables': tables}).encode('utf-8')
+        header += b' ' * (-(len(header) + 8) % 8)
+        temp_filename = filename + '.tmp'
+        with open(temp_filename, 'wb') as f:
+            f.write(struct.pack('<Q', len(header)))
+            f.write(header)
+            for part in parts:
+                f.write(part)
+        os.replace(temp_filename, filename)
+
+
+def build_index(data_filename: str, index_filename: str) -> None:
+    """Scan a data file once and write its offset index."""
+    builder = IndexBuilder()
+    source = _signature(data_filename)
+    for section, record, start, end in json_stream.iter_spans(data_filename):
+        builder.add(section, record, start, end)
+    builder.write(index_filename, source)
+
+
+class _Keys:
+    """Sequence view of a table's sorted keys (as bytes) for bisect."""
+
+    def __init__(self, blob: memoryview, ends: memoryview):
+        self._blob = blob
+        self._ends = ends
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    def __getitem__(self, i: int) -> bytes:
+        return bytes(self._blob[self._ends[i - 1] if i else 0:self._ends[i]])
+
+
+class RecordIndex:
+    """
+    Memory-mapped offset index over a data file: opening it costs the same whatever the size of
+    the data, and a lookup is a binary search over the keys followed by one read of the matching
+    byte spans of data.json.
+    """
+
+    def __init__(self, data_filename: str, index_filename: str):
+        self._files = []
+        self._maps = []
+        self._views: List[memoryview] = []
+        self._tables = {}
+        data = self._map(data_filename)
+        index = self._map(index_filename)
+        header_length, = struct.unpack_from('<Q', index, 0)
+        header = json.loads(bytes(index[8:8 + header_length]))
+        if header.get('version') != VERSION or header.get('byteorder') != sys.byteorder:
+            self.close()
+            raise ValueError("offset index was written by another version or platform")
+        if header['source'] != _signature(data_filename):
+            self.close()
+            raise ValueError("offset index does not match the data file")
+        self.journal_seq = header['journal_seq']
+        self._data = data
+        base = 8 + header_length
+        view = self._view(memoryview(index))
+        for name, (n, keys, ends, starts, lengths) in header['tables'].items():
+            ends_view = self._array(view, base + ends, n)
+            size = ends_view[n - 1] if n else 0
+            self._tables[name] = (
+                _Keys(self._view(view[base + keys:base + keys + size]), ends_view),
+                self._array(view, base + starts, n),
+                self._array(view, base + lengths, n),
+            )
+
+    def _view(self, view: memoryview) -> memoryview:
+        self._views.append(view)
+        return view
+
+    def _array(self, view: memoryview, offset: int, n: int) -> memoryview:
+        return self._view(self._view(view[offset:offset + 8 * n]).cast('Q'))
+
+    def _map(self, filename: str):
+        f = open(filename, 'rb')
+        self._files.append(f)
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return mapped
+
+    def close(self) -> None:
+        self._tables = {}
+        while self._views:
+            self._views.pop().release()  # Views go before the maps they point into
+        for mapped in self._maps:
+            mapped.close()
+        for f in self._files:
+            f.close()
+        self._maps, self._files = [], []
+
+    def entries(self, table: str, key: str) -> range:
+        """Positions of a key's spans in a table."""
+        keys = self._tables[table][0]
+        encoded = key.encode('utf-8')
+        return range(bisect_left(keys, encoded), bisect_right(keys, encoded))
+
+    def read(self, table: str, positions: Iterable[int]) -> List[dict]:
+        """The records in the spans at `positions`, in file order."""
+        _, starts, lengths = self._tables[table]
+        records = []
+        for i in positions:
+            records.extend(json.loads(b'[' + self._data[starts[i]:starts[i] + lengths[i]] + b']'))
+        return records
+
+    def records(self, table: str, key: str = '') -> List[dict]:
+        return self.read(table, self.entries(table, key))
+
+    def groups(self, table: str) -> Iterator[Tuple[str, range]]:
+        """(key, positions of its spans) for every key of a table, in key order."""
+        keys = self._tables[table][0]
+        i, n = 0, len(keys)
+        while i < n:
+            key = keys[i]
+            j = bisect_right(keys, key, i)
+            yield key.decode('utf-8'), range(i, j)
+            i = j
+
+
+class LazyList(list):
+    """
+    List of a platform's students, instructors or courses under a lazy backend. It holds only the
+    entities hydrated so far until it is read as a whole (iterated, measured, indexed or searched);
+    then `complete(current items)` hydrates the rest and returns the full list, which replaces
+    the contents.
+    """
+
+    def __init__(self, items: Iterable, complete: Callable[[list], list]):
+        super().__init__(items)
+        self._complete = complete
+
+    def _materialize(self) -> None:
+        if self._complete is not None:
+            complete, self._complete = self._complete, None
+            self[:] = complete(list(super().__iter__()))
+
+    def __iter__(self):
+        self._materialize()
+        return super().__iter__()
+
+    def __reversed__(self):
+        self._materialize()
+        return super().__reversed__()
+
+    def __len__(self) -> int:
+        self._materialize()
+        return super().__len__()
+
+    def __getitem__(self, i):
+        self._materialize()
+        return super().__getitem__(i)
+
+    def __contains__(self, item) -> bool:
+        self._materialize()
+        return super().__contains__(item)
+
+    def index(self, *args):
+        self._materialize()
+        return super().index(*args)
+
+    def copy(self) -> list:
+        self._materialize()
+        return super().copy()
+
+
+class LazyJsonStorage:
+    """
+    data.json storage backend for PlatformAdmin that hydrates entities on first access.
+    Startup only opens a memory-mapped ID -> byte offset index of the file (data.idx, rebuilt by one
+    scan when missing or out of date) and loads the announcements and admins. An instructor
+    is built with the courses they teach (schedules and assignments included), a student with
+    their enrollments and grades, a course roster when an instructor opens it; every entity
+    stays cached in the registry once built. save() writes the whole file, taking the hydrated
+    entities from memory and copying the rest from the old file, and writes the new index with it.
+    """
+
+    lazy = True
+
+    def __init__(self, filename: str = 'data.json', index_filename: Optional[str] = None):
+        self.filename = filename
+        self.index_filename = index_filename or sidecar_path(filename)
+        self._index: Optional[RecordIndex] = None
+        self._admin = None
+        self._rosters_loaded = set()  # course_codes whose full roster and grades are in memory
+
+    def _open_index(self) -> None:
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+        if not os.path.exists(self.filename):
+            events.warning(f"File '{self.filename}' not found. Starting with empty data.")
+            return
+        try:
+            self._index = RecordIndex(self.filename, self.index_filename)
+            return
+        except FileNotFoundError:
+            events.info(f"Building offset index {self.index_filename} for {self.filename}.")
+        except (OSError, ValueError, KeyError, struct.error) as e:
+            events.info(f"Rebuilding offset index {self.index_filename} ({e}).")
+        build_index(self.filename, self.index_filename)
+        self._index = RecordIndex(self.filename, self.index_filename)
+
+    def _records(self, table: str, key: str = '') -> List[dict]:
+        return self._index.records(table, key) if self._index else []
+
+    def _groups(self, table: str) -> Iterator[Tuple[str, range]]:
+        return self._index.groups(table) if self._index else iter(())
+
+    def load(self, admin) -> None:
+        """Open the offset index, load the announcements and admins and hook up lazy hydration."""
+        self._admin = admin
+        self._rosters_loaded.clear()
+        self._open_index()
+        admin._begin_load()
+        for section in ('announcements', 'admins'):
+            for record in self._records(section):
+                admin._load_record(section, record)
+        admin.journal_seq = self._index.journal_seq if self._index else 0
+        admin._finish_load()
+        registry = admin.registry
+        registry.student_loader = self.load_student
+        registry.instructor_loader = self.load_instructor
+        registry.course_loader = self.load_course
+        admin.instructors = LazyList(admin.instructors, self._completer('instructors', registry.get_instructor))
+        admin.courses = LazyList(admin.courses, self._completer('courses', registry.get_course))
+        admin.students = LazyList(admin.students, self._completer('students', registry.get_student))
+
+    def _completer(self, table: str, get: Callable[[str], object]) -> Callable[[list], list]:
+        def complete(current: list) -> list:
+            complete_list = [entity for entity in (get(key) for key, _ in self._groups(table)) if entity is not None]
+            listed = {id(entity) for entity in complete_list}
+            return complete_list + [entity for entity in current if id(entity) not in listed]
+        return complete
+
+    def load_instructor(self, instructor_id: str):
+        """Hydrate an instructor together with every course they teach."""
+        records = self._records('instructors', instructor_id)
+        if not records:
+            return None
+        admin = self._admin
+        admin._load_record('instructors', records[0])
+        instrumentation.count('lazy.instructors')
+        for course_data in self._records('courses_by_instructor', instructor_id):
+            if course_data['course_code'] in admin.registry.courses:
+                continue
+            admin._load_course(course_data)
+            for schedule_data in self._records('schedules', course_data['course_code']):
+                admin._load_schedule(schedule_data)
+            for assignment_data in self._records('assignments', course_data['course_code']):
+                admin._load_assignment(assignment_data)
+            instrumentation.count('lazy.courses')
+        return admin.registry.instructors.get(instructor_id)
+
+    def load_course(self, course_code: str):
+        """Hydrate a course by hydrating its instructor."""
+        records = self._records('courses', course_code)
+        if not records:
+            return None
+        instructor_id = records[0].get('instructor_id')
+        if self._admin.registry.get_instructor(instructor_id) is None:
+            events.warning(f"Warning: Instructor ID {instructor_id} not found for course '{records[0].get('course_name', 'Unknown')}'. Skipping.")
+        return self._admin.registry.courses.get(course_code)
+
+    def load_student(self, student_id: str):
+        """Hydrate one student with their courses, enrollments and grades."""
+        records = self._records('students', student_id)
+        if not records:
+            return None
+        admin = self._admin
+        student_obj = student.Student.from_dict(records[0], {})
+        admin.add_student(student_obj)
+        for course_data in records[0].get('enrolled_courses', []):
+            course_obj = admin.registry.get_course(course_data['course_code'])
+            if course_obj:
+                admin._link_enrollment(student_obj, course_obj)
+        for enrollment_data in self._records('enrollments', student_id):
+            admin._load_enrollment(enrollment_data)
+        self._load_grades(self._records('student_grades', student_id))
+        instrumentation.count('lazy.students')
+        return student_obj
+
+    def find_student_by_name(self, name: str):
+        records = self._records('student_names', name)
+        return self._admin.registry.get_student(records[0]['student_id']) if records else None
+
+    def find_instructor_by_name(self, name: str):
+        records = self._records('instructor_names', name)
+        return self._admin.registry.get_instructor(records[0]['instructor_id']) if records else None
+
+    def load_roster(self, course_obj) -> None:
+        """Hydrate every student enrolled in a course, plus all of the course's grades."""
+        if course_obj.course_code in self._rosters_loaded:
+            return
+        self._rosters_loaded.add(course_obj.course_code)
+        for enrollment_data in self._records('rosters', course_obj.course_code):
+            self._admin.registry.get_student(enrollment_data['student_id'])
+        self._load_grades(self._records('grades', course_obj.course_code))
+        instrumentation.count('lazy.rosters')
+
+    def _load_grades(self, records: List[dict]) -> None:
+        registry = self._admin.registry
+        for grade_data in records:
+            course_obj = registry.get_course(grade_data['course_code'])
+            if course_obj and (grade_data['student_id'], grade_data['assignment_title']) not in course_obj.grades:
+                self._admin._load_grade(grade_data)
+
+    def hydrate_all(self, admin) -> None:
+        """Hydrate every instructor, course, student and roster, for admin reports and batch jobs."""
+        for instructor_id, _ in self._groups('instructors'):
+            admin.registry.get_instructor(instructor_id)
+        for student_id, _ in self._groups('students'):
+            admin.registry.get_student(student_id)
+        for course_obj in list(admin.registry.courses.values()):
+            self.load_roster(course_obj)
+
+    def user_directory(self):
+        """(email, name) pairs for every student and instructor, read from the file without hydrating anyone."""
+        registry = self._admin.registry
+        directory = []
+        for table, hydrated in (('students', registry.students), ('instructors', registry.instructors)):
+            pairs = []
+            for key, positions in self._groups(table):
+                entity = hydrated.get(key)
+                if entity is None:
+                    record = self._index.read(table, positions)[0]
+                    pairs.append((record['email'], record['name']))
+                else:
+                    pairs.append((entity.email, entity.name))
+            listed = {key for key, _ in self._groups(table)}
+            pairs.extend((entity.email, entity.name) for key, entity in hydrated.items() if key not in listed)
+            directory.append(pairs)
+        return tuple(directory)
+
+    def append(self, op: str, fields: dict) -> None:
+        """Mutations stay in memory until save() (same interface as journal.Journal)."""
+
+    def _merged(self, table: str, hydrated: dict, fresh: Callable) -> Iterator[dict]:
+        """
+        A section's records in key order: generated by `fresh(entity, raw records)` for keys whose
+        entity is hydrated, copied from the old file otherwise; then those of entities the file lacks.
+        """
+        listed = set()
+        for key, positions in self._groups(table):
+            listed.add(key)
+            entity = hydrated.get(key)
+            if entity is None:
+                yield from self._index.read(table, positions)
+            else:
+                yield from fresh(entity, lambda: self._index.read(table, positions))
+        for key, entity in list(hydrated.items()):
+            if key not in listed:
+                yield from fresh(entity, list)
+
+    def save(self, admin) -> None:
+        """Write data.json and its offset index; untouched records are carried over from the old file."""
+        registry = admin.registry
+        sections = (
+            ('instructors', self._merged('instructors', registry.instructors, lambda i, raw: [i.to_dict()])),
+            ('courses', self._merged('courses', registry.courses, lambda c, raw: [c.to_dict()])),
+            ('students', self._merged('students', registry.students, lambda s, raw: [s.to_dict()])),
+            ('enrollments', self._merged('enrollments', registry.students, lambda s, raw: [
+                {'student_id': s.student_id, 'course_code': c.course_code} for c in s.enrolled_courses])),
+            ('schedules', self._merged('schedules', registry.courses, lambda c, raw: [
+                {'course_code': c.course_code, 'day': c.schedule.day, 'time': c.schedule.time}
+            ] if getattr(c, 'schedule', None) else [])),
+            ('assignments', self._merged('assignments', registry.courses, lambda c, raw: [
+                {'course_code': c.course_code, 'title': a.title, 'description': a.description,
+                 'due_date': a.due_date.isoformat()} for a in c.assignments])),
+            ('grades', self._merged('grades', registry.courses, _course_grades)),
+            ('announcements', ({'announcement_id': a.announcement_id, 'title': a.title, 'content': a.content,
+                                'date': date_key(a.date), 'recipient_groups': list(a.recipient_groups)}
+                               for a in admin.announcements)),
+            ('admins', iter(admin.admins)),
+        )
+        builder = IndexBuilder()
+        builder.journal_seq = admin.journal_seq
+        temp_filename = self.filename + '.tmp'
+        with open(temp_filename, 'wb') as f:
+            position = f.write(b'{\n')
+            for section, records in sections:
+                position += f.write(f'"{section}": [\n'.encode('utf-8'))
+                first = True
+                for record in records:
+                    if not first:
+                        position += f.write(b',\n')
+                    first = False
+                    line = json.dumps(record, separators=(',', ':')).encode('utf-8')
+                    builder.add(section, record, position, position + len(line))
+                    position += f.write(line)
+                position += f.write(b'\n],\n')
+            f.write(f'"journal_seq": {admin.journal_seq}\n}}\n'.encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+        os.replace(temp_filename, self.filename)
+        builder.write(self.index_filename, _signature(self.filename))
+        self._index = RecordIndex(self.filename, self.index_filename)
+
+    def close(self) -> None:
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+
+
+def _course_grades(course_obj, raw: Callable[[], List[dict]]) -> Iterable[dict]:
+    """A hydrated course's grades: those in the file, overlaid with the ones in memory."""
+    grades = {(g['student_id'], g['assignment_title']): g for g in raw()}
+    for grade_obj in course_obj.grades.values():
+        record = {'course_code': course_obj.course_code, **grade_obj.to_dict()}
+        grades[(record['student_id'], record['assignment_title'])] = record
+    return grades.values()
@@ -0,0 +1,70 @@
+import threading
+from contextlib import contextmanager
+
+STRIPES = 1024  # Number of striped locks shared by every student and course
+
+
+class LockManager:
+    """
+    Striped, reentrant per-student and per-course locks. Each student_id / course_code
+    maps to one of a fixed pool of RLocks, so memory stays bounded however many
+    entities exist. Multi-entity operations take their stripes in index order, which
+    rules out lock-ordering deadlocks.
+    """
+
+    def __init__(self, stripes: int = STRIPES):
+        self._locks = [threading.RLock() for _ in range(stripes)]
+
+    def _stripe(self, kind: str, key: str) -> int:
+        return hash((kind, key)) % len(self._locks)
+
+    def _stripes_for(self, students=(), courses=()):
+        stripes = {self._stripe('student', s.student_id) for s in students}
+        stripes.update(self._stripe('course', c.course_code) for c in courses)
+        return sorted(stripes)
+
+    @contextmanager
+    def hold(self, students=(), courses=()):
+        """Hold the locks of every given student and course for the duration of the block."""
+        acquired = []
+        try:
+            for stripe in self._stripes_for(students, courses):
+                self._locks[stripe].acquire()
+                acquired.append(stripe)
+            yield
+        finally:
+            for stripe in reversed(acquired):
+                self._locks[stripe].release()
+
+    @contextmanager
+    def hold_all(self):
+        """Hold every stripe, e.g. for a bulk operation touching arbitrary entities."""
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
+
+
+_manager = LockManager()
+
+
+def course_lock(course):
+    """Lock guarding a course's roster, assignments, grades and discussion threads."""
+    return _manager.hold(courses=(course,))
+
+
+def student_lock(student):
+    """Lock guarding a student's enrolled courses."""
+    return _manager.hold(students=(student,))
+
+
+def enrollment_lock(student, course):
+    """Both locks an enrollment change needs, taken in a deadlock-free order."""
+    return _manager.hold(students=(student,), courses=(course,))
+
+
+def all_locks():
+    return _manager.hold_all()
@@ -1,18 +1,52 @@
+import sys
+import instrumentation
 from e_learning_environment import E_Learning_Environment
 from platform_admin import PlatformAdmin
+from data_store import DataStore
+import json_stream
+from sqlite_storage import SqliteStorage
+from lazy_store import LazyJsonStorage
 
 if __name__ == "__main__":
+    if "--instrument" in sys.argv:
+        instrumentation.enable()  # Latency histograms of loads, saves, menu actions and grade/enrollment operations
+    if "--profile" in sys.argv[:-1]:
+        action = sys.argv[sys.argv.index("--profile") + 1]
+        instrumentation.profile_next(action, output=f"{action}.prof")  # cProfile the next run of one menu action
     try:
         # Initialize the PlatformAdmin and load data
-        platform_admin = PlatformAdmin()
+        if "--sqlite" in sys.argv:
+            storage = SqliteStorage('data.db')
+            if storage.is_empty():
+                # First run on SQLite: migrate the existing data.json
+                json_admin = PlatformAdmin()
+                json_admin.load_data('data.json')
+                storage.import_data(json_admin.snapshot_data())
+            platform_admin = PlatformAdmin(storage=storage)
+        elif "--lazy" in sys.argv:
+            # Open only the offset index of data.json; entities are built on first access
+            platform_admin = PlatformAdmin(storage=LazyJsonStorage('data.json'))
+        else:
+            platform_admin = PlatformAdmin()
         
         # Check if load_data method exists
-        if hasattr(platform_admin, 'load_data'):
-            platform_admin.load_data('data.json')  # Load data from JSON
+        if "--journal" in sys.argv:
+            platform_admin.open_journal('data.json')  # Snapshot + journal replay; mutations are journaled
+            DataStore.shared('data.json').adopt(platform_admin)
+        elif platform_admin.storage:
+            platform_admin.load_data()
+            DataStore.shared('data.json').adopt(platform_admin)
+        elif "--stream" in sys.argv:
+            # Parse data.json one record at a time (the default above STREAM_THRESHOLD), reporting progress
+            platform_admin.load_data('data.json', stream=True, progress=json_stream.print_progress)
+            DataStore.shared('data.json').adopt(platform_admin)
+        elif hasattr(platform_admin, 'load_data'):
+            platform_admin = DataStore.shared('data.json').get()  # The only parse of data.json
         else:
             raise AttributeError("PlatformAdmin does not have a 'load_data' method.")
-        # Initialize the E-Learning Environment
-        e_learning_system = E_Learning_Environment()
+        platform_admin.write_binary = "--binary" in sys.argv  # Keep data.snap next to data.json for fast startup
+        # Initialize the E-Learning Environment with the already loaded platform
+        e_learning_system = E_Learning_Environment(platform_admin)
 
         # Ensure platform_admin can be set in E-Learning system
         if hasattr(e_learning_system, 'platform_admin'):
@@ -32,12 +66,20 @@ if __name__ == "__main__":
         else:
             raise AttributeError("E_Learning_Environment does not have a 'set_courses' method.")
         
-        # Start the main menu
-        e_learning_system.main_menu()
+        if "--serve" in sys.argv:
+            import server
+            server.run(platform_admin)  # Many concurrent sessions over TCP instead of the console menu
+        else:
+            # Start the main menu
+            e_learning_system.main_menu()
 
     except AttributeError as e:
         print(f"AttributeError: {e}")  # More specific error handling
     except FileNotFoundError as e:
         print(f"FileNotFoundError: {e}")  # Handle missing file
     except Exception as e:
-        print(f"An unexpected error occurred: {e}")  # Generic error for all other cases
\ No newline at end of file
+        print(f"An unexpected error occurred: {e}")  # Generic error for all other cases
+    finally:
+        if instrumentation.enabled:
+            instrumentation.dump_text()
+            instrumentation.dump_json('instrumentation.json')
\ No newline at end of file
@@ -3,12 +3,13 @@ from abc import ABC, abstractmethod
 
 # Abstract Base Class for Person
 class Person(ABC):
+    __slots__ = ('__name', '__email', '_contact_number', '_address')
+
     def __init__(self, name: str, email: str, contact_number: str, address: str):
         self.__name = name
         self.__email = email
         self._contact_number = contact_number
         self._address = address
-        self.courses = [] 
 
     @property
     def name(self) -> str:
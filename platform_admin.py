@@ -1,149 +1,779 @@
 import json
 import os
+import threading
+from datetime import datetime, timedelta
 from typing import List
+import announcement
+from announcement_store import AnnouncementStore, date_key
+import assignment
 import course
+import grade
 import instructor
 import student
 import schedule
+import enrollment
+import journal
+import json_stream
+import binary_snapshot
+import events
+import locks
+import post_store
+import reports
+import search_index
+from discussion import DiscussionThread
+import schedule_index
+from registry import EntityRegistry
+
+STREAM_THRESHOLD = 64 * 1024 * 1024  # JSON files larger than this (in bytes) are streamed by default
 
 class PlatformAdmin:
-    def __init__(self):
+    def __init__(self, storage=None):
         self.students = []
         self.instructors = []
         self.courses = []
-        self.enrollments = []  # Handles enrollments
-      
+        self.enrollments = enrollment.Enrollment()  # Handles enrollments
+        self.announcements = AnnouncementStore()  # Indexed by recipient group and date
+        self.admins = []
+        self.registry = EntityRegistry()  # ID -> entity indexes, kept in step with the lists above
+        self.journal = None  # Write-ahead journal, set by open_journal()
+        self.journal_seq = 0  # Last journal record folded into the loaded snapshot
+        self._compaction = None  # Background snapshot writer, if one is running
+        self.storage = storage  # Pluggable backend (e.g. SqliteStorage); None means data.json
+        self.write_binary = False  # Also write a binary snapshot next to data.json on save
+        self.on_snapshot_written = None  # Called with the filename after write_snapshot (save or compaction)
+        self.posts = post_store.PostStore()  # Discussion posts; durable once load_data opens the store on disk
+        self.search_index = search_index.SearchIndex()  # Full-text index; persisted once load_data opens it
+        self.search_filename = None
+        self.threads = {}  # thread_id -> DiscussionThread of any course, kept by open_posts and create_thread
 
-    @staticmethod
-    def admin_login():
-        """Authenticate admin user."""
-        email = input("Enter admin email: ")
-        password = input("Enter admin password: ")
+    def add_student(self, student_obj) -> None:
+        """Register a student with the platform."""
+        self.students.append(student_obj)
+        self.registry.add_student(student_obj)
 
-        try:
-            if os.path.exists("data.json"):
-                with open("data.json", "r") as file:
-                    data = json.load(file)
-
-                admins = data.get("admins", [])
-                if any(admin["email"] == email and admin["password"] == password for admin in admins):
-                    print("Login successful. Welcome, Admin!")
-                    return True
-                else:
-                    print("Invalid email or password. Access denied.")
-                    return False
+    def add_instructor(self, instructor_obj) -> None:
+        """Register an instructor with the platform."""
+        self.instructors.append(instructor_obj)
+        self.registry.add_instructor(instructor_obj)
+
+    def add_course(self, course_obj) -> None:
+        """Register a course with the platform."""
+        self.courses.append(course_obj)
+        self.registry.add_course(course_obj)
+
+    def bulk_enroll(self, id_pairs):
+        """
+        Enroll many (student_id, course_code) pairs at once through the registry.
+        :return: An enrollment.BulkEnrollmentResult; unknown IDs are reported as rejections.
+        """
+        resolved = []
+        unknown = []
+        for student_id, course_code in id_pairs:
+            student_obj = self.registry.get_student(student_id)
+            course_obj = self.registry.get_course(course_code)
+            if student_obj and course_obj:
+                resolved.append((student_obj, course_obj))
             else:
-                print("Error: data.json file not found.")
-                return False
+                reason = "unknown student" if not student_obj else "unknown course"
+                unknown.append((student_id, course_code, reason))
+        result = self.enrollments.enroll_many(resolved)
+        result.rejected.extend(unknown)
+        return result
 
-        except json.JSONDecodeError:
-            print("Error decoding JSON. Please check the file format.")
+    def find_student_by_name(self, name):
+        """Find a student by name, hydrating them from storage if needed."""
+        student_obj = self.registry.find_student_by_name(name)
+        if student_obj is None and self.storage:
+            student_obj = self.storage.find_student_by_name(name)
+        return student_obj
+
+    def find_instructor_by_name(self, name):
+        """Find an instructor by name, hydrating the rosters of the courses they teach."""
+        instructor_obj = self.registry.find_instructor_by_name(name)
+        if instructor_obj is None and hasattr(self.storage, 'find_instructor_by_name'):
+            instructor_obj = self.storage.find_instructor_by_name(name)
+        if instructor_obj and self.storage:
+            for course_obj in self.registry.get_courses_by_instructor(instructor_obj.instructor_id):
+                self.storage.load_roster(course_obj)
+        return instructor_obj
+
+    def user_directory(self):
+        """
+        Return (students, instructors) as lists of (email, name) pairs, served from memory
+        (or from the storage backend's index when students are hydrated lazily).
+        """
+        if self.storage:
+            return self.storage.user_directory()
+        return (
+            [(s.email, s.name) for s in self.students],
+            [(i.email, i.name) for i in self.instructors],
+        )
+
+    def set_schedule(self, course_obj, day, time):
+        """Give a course a new day and time, updating the cached timetables of its students and instructor."""
+        with locks.all_locks():
+            self._load_schedule({'course_code': course_obj.course_code, 'day': day, 'time': time})
+            journal.record('schedule', course_code=course_obj.course_code, day=day, time=time)
+        events.info(f"Schedule for {course_obj.course_name} set to {day} {time}.")
+
+    def assignments_due(self, person, days=7, now=None):
+        """Assignments of a student's or instructor's courses as (overdue, due in the next `days` days), by due date."""
+        now = now or datetime.now()
+        if hasattr(person, 'student_id'):
+            courses = person.enrolled_courses
+        else:
+            courses = self.registry.get_courses_by_instructor(person.instructor_id)
+        codes = [course_obj.course_code for course_obj in courses]
+        due_dates = self.registry.due_dates
+        return due_dates.overdue(now, codes), due_dates.upcoming(now, now + timedelta(days=days), codes)
+
+    def gpa_summary(self, student_obj):
+        """The student's open-term and cumulative GPA from the GPA engine (None while nothing is graded)."""
+        gpa = self.registry.gpa
+        return {'term': gpa.term, 'term_gpa': gpa.term_gpa(student_obj.student_id),
+                'cumulative_gpa': gpa.cumulative_gpa(student_obj.student_id),
+                'units': gpa.units(student_obj.student_id)}
+
+    def hydrate(self):
+        """Bring every entity, roster and grade into memory under a lazy storage backend (a no-op otherwise)."""
+        if self.storage:
+            self.storage.hydrate_all(self)
+
+    def close_term(self, next_term):
+        """
+        Recompute every GPA from the gradebooks and open a new term.
+        :return: student_id -> GPA of the term just closed.
+        """
+        self.hydrate()
+        with locks.all_locks():
+            closed = self.registry.gpa.term
+            term_gpas = self.registry.gpa.close_term(self.courses, next_term)
+        events.info(f"Term '{closed}' closed with {len(term_gpas)} graded student(s); term '{next_term}' is open.")
+        return term_gpas
+
+    def generate_reports(self, directory='reports', workers=None, incremental=True):
+        """Write per-course report files and a merged summary, rebuilding only changed courses by default."""
+        self.hydrate()
+        return reports.generate_reports(self, directory, workers, incremental)
+
+    def student_timetable(self, student_obj):
+        """The student's weekly sessions as (start, end, course), sorted by day and time."""
+        return self.enrollments.schedules.timetable(student_obj)
+
+    def instructor_timetable(self, instructor_obj):
+        """The instructor's weekly sessions as (start, end, course), sorted by day and time."""
+        return self.registry.instructor_schedules.timetable(instructor_obj)
+
+    def open_posts(self, directory):
+        """Open the on-disk discussion store and attach its threads to their courses."""
+        self.posts.close()
+        self.posts = post_store.PostStore(directory)
+        self.posts.resolve_author = self._author_name
+        for course_obj in self.registry.courses.values():  # Courses hydrated later start with no threads anyway
+            course_obj.discussion_threads = []
+        self.threads = {}
+        for record in self.posts.threads():
+            course_obj = self.registry.get_course(record['course_code'])
+            if not course_obj:
+                events.warning(f"Warning: Course code {record['course_code']} not found for thread '{record['title']}'.")
+                continue
+            creator = self._find_person(record['creator_role'], record['creator_id'])
+            thread = DiscussionThread(
+                course_obj, record['title'], creator, self.posts, record['thread_id'], record['created']
+            )
+            course_obj.discussion_threads.append(thread)
+            self.threads[thread.thread_id] = thread
+
+    def open_search(self, filename):
+        """
+        Open the search index saved next to the data file and bring it up to date: posts past each
+        thread's indexed position, and announcements and assignments added or removed since it was
+        saved. Only a missing or unreadable index is rebuilt from scratch.
+        """
+        search_index.activate(None)
+        index = None
+        if os.path.exists(filename):
+            try:
+                index = search_index.SearchIndex.load(filename)
+            except (OSError, ValueError, KeyError) as e:
+                events.warning(f"Warning: Search index '{filename}' could not be read ({e}); rebuilding it.")
+        thread_ids = {record['thread_id'] for record in self.posts.threads()}
+        if index is not None and any(thread_id not in thread_ids or mark > self.posts.count(thread_id)
+                                     for thread_id, mark in index.post_marks.items()):
+            events.warning(f"Warning: Search index '{filename}' does not match the discussion store; rebuilding it.")
+            index = None
+        self.search_index = index or search_index.SearchIndex()
+        self.search_filename = filename
+        # Under a lazy backend a saved index is only caught up for the courses already in memory
+        self._sync_search(complete=index is None or not (self.storage and self.storage.lazy))
+        search_index.activate(self.search_index)
+
+    def defer_search(self, filename):
+        """
+        Open the search index at `filename` on first use instead of now. Until then nothing is
+        indexed; opening it catches up on whatever changed in the meantime, as at startup.
+        """
+        search_index.activate(None)
+        self.search_index = None
+        self.search_filename = filename
+
+    def _sync_search(self, complete=True):
+        index = self.search_index
+        courses = list(self.courses if complete else self.registry.courses.values())
+        for course_obj in courses:
+            for thread in course_obj.discussion_threads:
+                index.add_thread(thread.thread_id, course_obj.course_code, thread.title)
+                first, count = index.post_marks[thread.thread_id] + 1, thread.post_count
+                for start in range(first, count + 1, self.posts.segment_size):
+                    for post in self.posts.read(thread.thread_id, start, start + self.posts.segment_size - 1):
+                        index.add_post(thread.thread_id, course_obj.course_code, post['id'], post['message'])
+        live = set()
+        for announcement_obj in self.announcements:
+            key = search_index.announcement_key(announcement_obj)
+            live.add(key)
+            index.add_announcement(key, announcement_obj.title, announcement_obj.content,
+                                   announcement_obj.recipient_groups)
+            index.set_groups(key, announcement_obj.recipient_groups)  # They may have changed since it was saved
+        for course_obj in courses:
+            for assignment_obj in course_obj.assignments:
+                key = search_index.assignment_key(course_obj.course_code, assignment_obj)
+                live.add(key)
+                index.add_assignment(key, course_obj.course_code, assignment_obj.title, assignment_obj.description)
+        assignment_keys = index.keyed(search_index.ASSIGNMENT)
+        if not complete:
+            assignment_keys = [key for key in assignment_keys if key.split('|', 1)[0] in self.registry.courses]
+        for key in index.keyed(search_index.ANNOUNCEMENT) + assignment_keys:
+            if key not in live:
+                index.remove(key)
+
+    def save_search(self, filename=None):
+        """
+        Write the search index next to the data file so the next start only catches up.
+        :param filename: Where to write it; defaults to the index opened with the data.
+        """
+        filename = filename or self.search_filename
+        if self.search_index is None and self.search_filename and filename != self.search_filename:
+            self.open_search(self.search_filename)  # A deferred index is still needed to save it elsewhere
+        if filename and self.search_index is not None:
+            self.search_index.save(filename)
+
+    def search(self, query, course_codes=None, role=None, limit=10):
+        """
+        Full-text search over discussion threads and posts, announcements and assignments.
+        :param course_codes: Only search these courses (plus announcements); None searches everything.
+        :param role: Only return announcements addressed to this recipient group.
+        :return: Up to `limit` result dicts (kind, score, course_code, title, text, thread_id, post_id), best first.
+        """
+        if self.search_index is None:
+            self.open_search(self.search_filename)
+        index = self.search_index
+        results = []
+        for score, doc in index.search(query, courses=course_codes, group=role, limit=limit):
+            kind = index.doc_kind[doc]
+            result = {'kind': search_index.KIND_NAMES[kind], 'score': round(score, 4), 'course_code': None,
+                      'title': None, 'text': None, 'thread_id': None, 'post_id': None}
+            if kind in (search_index.POST, search_index.THREAD):
+                thread = self.threads.get(index.doc_ref[doc])
+                if thread is None:
+                    continue
+                result.update(course_code=thread.course.course_code, title=thread.title, thread_id=thread.thread_id)
+                if kind == search_index.POST:
+                    post_id = index.doc_ref2[doc]
+                    posts = self.posts.read(thread.thread_id, post_id, post_id)
+                    result.update(post_id=post_id, text=posts[0]['message'] if posts else None)
+            elif kind == search_index.ANNOUNCEMENT:
+                key = index.keys[index.doc_ref[doc]]
+                announcement_obj = self.announcements.get(search_index.announcement_id(key))
+                if announcement_obj is None or search_index.announcement_key(announcement_obj) != key:
+                    continue
+                result.update(title=announcement_obj.title, text=announcement_obj.content)
+            else:
+                course_code = index.courses[index.doc_course[doc]]
+                course_obj = self.registry.get_course(course_code)
+                key = index.keys[index.doc_ref[doc]]
+                assignment_obj = course_obj.get_assignment(search_index.assignment_title(key)) if course_obj else None
+                if assignment_obj is None or search_index.assignment_key(course_code, assignment_obj) != key:
+                    continue
+                result.update(course_code=course_code, title=assignment_obj.title, text=assignment_obj.description)
+            results.append(result)
+            if len(results) == limit:
+                break
+        return results
+
+    def _find_person(self, role, person_id):
+        if role == 'Instructor':
+            return self.registry.get_instructor(person_id)
+        return self.registry.get_student(person_id)
+
+    def _author_name(self, role, person_id):
+        person = self._find_person(role, person_id)
+        return person.name if person else None
+
+    def create_thread(self, course_obj, title, creator):
+        """Start a discussion thread in a course; it is recorded in the post store straight away."""
+        with locks.course_lock(course_obj):
+            thread = DiscussionThread(course_obj, title, creator, self.posts)
+            course_obj.discussion_threads.append(thread)
+            self.threads[thread.thread_id] = thread
+        events.info(f"Thread '{title}' created in {course_obj.course_name}.")
+        return thread
+
+    def schedule_conflict_report(self):
+        """
+        Find every student and instructor with overlapping sections, with one sweep over each
+        person's weekly intervals (O(n log n) in their number of sections, no pairwise comparison).
+        :return: A list of (person, course, other_course) tuples, instructors first.
+        """
+        self.hydrate()
+        report = []
+        for instructor_obj in self.instructors:
+            taught = self.registry.get_courses_by_instructor(instructor_obj.instructor_id)
+            report.extend((instructor_obj, course_obj, other)
+                          for course_obj, other in schedule_index.overlapping_pairs(taught))
+        for student_obj in self.students:
+            report.extend((student_obj, course_obj, other)
+                          for course_obj, other in schedule_index.overlapping_pairs(student_obj.enrolled_courses))
+        return report
+
+    def post_announcement(self, title, content, date, recipient_groups):
+        """Create an announcement, keep it with the platform data and journal it."""
+        announcement_obj = announcement.Announcement(title, content, date, list(recipient_groups))
+        with locks.all_locks():  # Held by compact() too, so the record cannot fall between snapshot and rotation
+            self.announcements.append(announcement_obj)
+            journal.record('announcement', announcement_id=announcement_obj.announcement_id, title=title,
+                           content=content, date=date_key(date), recipient_groups=list(recipient_groups))
+        return announcement_obj
+
+    def expire_announcements(self, before):
+        """
+        Remove announcements dated before `before` (a datetime, date or YYYY-MM-DD string).
+        :return: The number of announcements removed.
+        """
+        with locks.all_locks():
+            removed = self.announcements.expire(before)
+            if removed:
+                journal.record('expire_announcements', before=date_key(before))
+        events.info(f"{removed} announcement(s) dated before {before} expired.")
+        return removed
+
+    def admin_login(self):
+        """Authenticate admin user against the admins loaded with the platform data."""
+        email = input("Enter admin email: ")
+        password = input("Enter admin password: ")
+
+        if not self.admins:
+            print("Error: no admin accounts are loaded.")
             return False
-        except Exception as e:
-            print(f"An unexpected error occurred: {e}")
+        if any(admin["email"] == email and admin["password"] == password for admin in self.admins):
+            print("Login successful. Welcome, Admin!")
+            return True
+        else:
+            print("Invalid email or password. Access denied.")
             return False
 
-    def load_data(self, filename='data.json'):
+    # Sections in the order their records depend on one another
+    LOAD_ORDER = ('instructors', 'courses', 'students', 'enrollments', 'schedules',
+                  'assignments', 'grades', 'announcements', 'admins')
+
+    def load_data(self, filename='data.json', stream=None, progress=None, binary=None):
         """
         Load data from a JSON file and initialize the platform's entities.
         :param filename: Path to the JSON file.
+        :param stream: Parse the file one record at a time instead of loading it whole,
+                       so peak memory is bounded by the object graph rather than graph plus raw JSON.
+                       By default files larger than STREAM_THRESHOLD are streamed.
+        :param progress: Optional callback(section, records, position, total_size) used when streaming.
+        :param binary: Load the binary snapshot next to the JSON file instead. By default it is
+                       used whenever it exists and is at least as new as the JSON file.
         """
         try:
-            if not os.path.exists(filename):
-                print(f"File '{filename}' not found. Starting with empty data.")
+            if self.storage:
+                self.storage.load(self)
+                journal.activate(self.storage)  # Each mutation is written in its own transaction
+                self.open_posts(post_store.sidecar_path(filename))
+                self.defer_search(search_index.sidecar_path(filename))  # Startup does not read the index
                 return
 
-            with open(filename, 'r') as f:
-                data = json.load(f)
+            binary_filename = binary_snapshot.sidecar_path(filename)
+            if binary is None:
+                binary = os.path.exists(binary_filename) and (
+                    not os.path.exists(filename)
+                    or os.path.getmtime(binary_filename) >= os.path.getmtime(filename)
+                )
 
-            # Load instructors
-            self.instructors = [
-                instructor.Instructor(**inst_data)
-                for inst_data in data.get('instructors', [])
-            ]
+            if not os.path.exists(binary_filename if binary else filename):
+                events.warning(f"File '{filename}' not found. Starting with empty data.")
+                return
 
-            # Load courses
-            self.courses = []
-            for course_data in data.get('courses', []):
-                instructor_id = course_data.get('instructor_id')
-                instructor_obj = next((i for i in self.instructors if i.instructor_id == instructor_id), None)
+            if binary:
+                records = binary_snapshot.iter_records(binary_filename)
+            elif stream or (stream is None and os.path.getsize(filename) > STREAM_THRESHOLD):
+                records = json_stream.iter_sections(filename, progress=progress)
+            else:
+                with open(filename, 'r') as f:
+                    data = json.load(f)
+                records = (
+                    (section, record)
+                    for section in self.LOAD_ORDER
+                    for record in data.get(section, [])
+                )
+                self.journal_seq = data.get('journal_seq', 0)
 
-                if not instructor_obj:
-                    print(f"Warning: Instructor ID {instructor_id} not found for course '{course_data.get('course_name', 'Unknown')}'. Skipping.")
-                    continue
+            self._begin_load()
+            for section, record in records:
+                self._load_record(section, record)
+            self._finish_load()
+            self.open_posts(post_store.sidecar_path(filename))
+            self.open_search(search_index.sidecar_path(filename))
 
-                course_obj = course.Course(
-                    course_data['course_name'],
-                    course_data['course_code'],
-                    instructor_obj,
-                    course_data['units']
-                )
-                self.courses.append(course_obj)
-
-            # Load students
-            self.students = [
-                student.Student.from_dict(student_data, self.courses)
-                for student_data in data.get('students', [])
-            ]
-
-            # Load enrollments
-            self.enrollments = []
-            for enrollment_data in data.get('enrollments', []):
-                student_obj = next((s for s in self.students if s.student_id == enrollment_data['student_id']), None)
-                course_obj = next((c for c in self.courses if c.course_code == enrollment_data['course_code']), None)
-
-                if student_obj and course_obj:
-                    student_obj.enroll(course_obj)
-                    course_obj.enrolled_students.append(student_obj)
-                else:
-                    if not student_obj:
-                        print(f"Warning: Student ID {enrollment_data['student_id']} not found.")
-                    if not course_obj:
-                        print(f"Warning: Course code {enrollment_data['course_code']} not found.")
-
-            # Load schedules
-            schedules = data.get('schedules', [])
-            for schedule_data in schedules:
-                course_obj = next((c for c in self.courses if c.course_code == schedule_data['course_code']), None)
-                if course_obj:
-                    # Ensure to use the correct class name 'Schedule' instead of 'schedules'
-                    schedule_obj = schedule.Schedule(course_obj, schedule_data['day'], schedule_data['time'])
-                    course_obj.schedule = schedule_obj
-                else:
-                    print(f"Warning: Course code {schedule_data['course_code']} not found for schedule.")
-            
         except json.JSONDecodeError:
-            print("Error decoding JSON. Please ensure the file is formatted correctly.")
+            events.error("Error decoding JSON. Please ensure the file is formatted correctly.")
         except FileNotFoundError:
-            print(f"File '{filename}' not found. Ensure the file exists in the correct path.")
+            events.error(f"File '{filename}' not found. Ensure the file exists in the correct path.")
         except Exception as e:
-            print(f"An unexpected error occurred while loading data: {e}")
+            events.error(f"An unexpected error occurred while loading data: {e}")
+
+    def _begin_load(self):
+        """Reset entity lists and the deferred links used while records arrive out of dependency order."""
+        self.instructors = []
+        self.courses = []
+        self.students = []
+        self.enrollments = enrollment.Enrollment()
+        self.announcements = AnnouncementStore()
+        self.admins = []
+        search_index.activate(None)  # Reactivated by open_search once the graph is loaded
+        self.registry.clear()
+        self.registry.student_loader = None
+        self.registry.instructor_loader = None
+        self.registry.course_loader = None
+        self._pending_courses = []  # Course records whose instructor has not been seen yet
+        self._pending_student_courses = []  # (Student, [course_code]) not resolvable yet
+        self._pending_enrollments = []  # Enrollment records waiting on a student or course
+        self._pending_schedules = []  # Schedule records waiting on a course
+        self._pending_coursework = []  # Assignment and grade records waiting on their course
+
+    def _load_record(self, section, record):
+        """Build the entity for a single record, deferring links to entities not loaded yet."""
+        if section == 'instructors':
+            self.add_instructor(instructor.Instructor(
+                record['name'], record['email'], record['contact_number'], record['address'],
+                record['instructor_id'], record.get('role', 'Instructor')
+            ))
+        elif section == 'courses':
+            if self.registry.get_instructor(record.get('instructor_id')):
+                self._load_course(record)
+            else:
+                self._pending_courses.append(record)
+        elif section == 'students':
+            student_obj = student.Student.from_dict(record, {})  # Courses are linked below, index included
+            self.add_student(student_obj)
+            missing = []
+            for course_data in record.get('enrolled_courses', []):
+                course_obj = self.registry.courses.get(course_data['course_code'])
+                if course_obj:
+                    self._link_enrollment(student_obj, course_obj)
+                else:
+                    missing.append(course_data['course_code'])
+            if missing:
+                self._pending_student_courses.append((student_obj, missing))
+        elif section == 'enrollments':
+            if (self.registry.get_student(record['student_id'])
+                    and self.registry.get_course(record['course_code'])):
+                self._load_enrollment(record)
+            else:
+                self._pending_enrollments.append((record['student_id'], record['course_code']))
+        elif section == 'schedules':
+            if self.registry.get_course(record['course_code']):
+                self._load_schedule(record)
+            else:
+                self._pending_schedules.append(record)
+        elif section in ('assignments', 'grades'):
+            if self.registry.get_course(record['course_code']):
+                self._apply_record(section, record)
+            else:
+                self._pending_coursework.append((section, record))
+        elif section == 'announcements':
+            self._load_announcement(record)
+        elif section == 'admins':
+            self.admins.append(record)
+        elif section == 'journal_seq':
+            self.journal_seq = record
+
+    def _finish_load(self):
+        """Resolve links that were deferred because their target appeared later in the file."""
+        for course_data in self._pending_courses:
+            instructor_id = course_data.get('instructor_id')
+            if not self.registry.get_instructor(instructor_id):
+                events.warning(f"Warning: Instructor ID {instructor_id} not found for course '{course_data.get('course_name', 'Unknown')}'. Skipping.")
+                continue
+            self._load_course(course_data)
+
+        for student_obj, course_codes in self._pending_student_courses:
+            for course_code in course_codes:
+                course_obj = self.registry.get_course(course_code)
+                if course_obj:
+                    self._link_enrollment(student_obj, course_obj)
+
+        for student_id, course_code in self._pending_enrollments:
+            self._load_enrollment({'student_id': student_id, 'course_code': course_code})
+
+        for schedule_data in self._pending_schedules:
+            self._load_schedule(schedule_data)
+
+        for section, record in self._pending_coursework:
+            self._apply_record(section, record)
+
+        del self._pending_courses, self._pending_student_courses
+        del self._pending_enrollments, self._pending_schedules, self._pending_coursework
+
+    def _load_course(self, course_data):
+        course_obj = course.Course(
+            course_data['course_name'],
+            course_data['course_code'],
+            self.registry.get_instructor(course_data.get('instructor_id')),
+            course_data['units']
+        )
+        self.add_course(course_obj)
+
+    def _load_enrollment(self, enrollment_data):
+        student_obj = self.registry.get_student(enrollment_data['student_id'])
+        course_obj = self.registry.get_course(enrollment_data['course_code'])
+
+        if student_obj and course_obj:
+            self._link_enrollment(student_obj, course_obj)
+        else:
+            if not student_obj:
+                events.warning(f"Warning: Student ID {enrollment_data['student_id']} not found.")
+            if not course_obj:
+                events.warning(f"Warning: Course code {enrollment_data['course_code']} not found.")
+
+    def _link_enrollment(self, student_obj, course_obj):
+        """
+        Record a loaded enrollment on the student, the course roster and the enrollment index alike,
+        whether it came from the enrollments section or a student's embedded enrolled_courses.
+        """
+        student_obj.enroll(course_obj)
+        course_obj.enrolled_students.append(student_obj)
+        self.enrollments.add_existing(student_obj, course_obj)
+
+    def _load_unenrollment(self, enrollment_data):
+        student_obj = self.registry.get_student(enrollment_data['student_id'])
+        course_obj = self.registry.get_course(enrollment_data['course_code'])
+        if student_obj and course_obj:
+            course_obj.remove_student(student_obj)
+            self.enrollments.remove_existing(student_obj, course_obj)
+
+    def _load_enrollments(self, batch):
+        for student_id, course_code in batch['pairs']:
+            self._load_enrollment({'student_id': student_id, 'course_code': course_code})
+
+    def _load_schedule(self, schedule_data):
+        course_obj = self.registry.get_course(schedule_data['course_code'])
+        if course_obj:
+            schedule_obj = schedule.Schedule(course_obj, schedule_data['day'], schedule_data['time'])
+            course_obj.schedule = schedule_obj
+            # Only the timetables that already hold this course are touched
+            self.enrollments.schedules.reschedule(course_obj)
+            self.registry.instructor_schedules.reschedule(course_obj)
+        else:
+            events.warning(f"Warning: Course code {schedule_data['course_code']} not found for schedule.")
+
+    def _load_assignment(self, assignment_data):
+        course_obj = self.registry.get_course(assignment_data['course_code'])
+        if not course_obj:
+            events.warning(f"Warning: Course code {assignment_data['course_code']} not found for assignment.")
+            return
+        due_date = datetime.fromisoformat(assignment_data['due_date'])
+        assignment_obj = assignment.Assignment(assignment_data['title'], assignment_data['description'], due_date, course_obj)
+        course_obj.add_assignment(assignment_obj)
+        self.registry.due_dates.add(assignment_obj)
+        search_index.assignment_added(course_obj.course_code, assignment_obj)
+
+    def _load_grade(self, grade_data):
+        course_obj = self.registry.get_course(grade_data['course_code'])
+        student_obj = self.registry.get_student(grade_data['student_id'])
+        if not course_obj or not student_obj:
+            events.warning(f"Warning: Grade for student {grade_data['student_id']} in course {grade_data['course_code']} could not be linked.")
+            return
+        assignment_obj = course_obj.get_assignment(grade_data['assignment_title'])
+        if not assignment_obj:
+            events.warning(f"Warning: Assignment '{grade_data['assignment_title']}' not found in course {grade_data['course_code']}.")
+            return
+        grade_obj = grade.Grade(student_obj, assignment_obj, grade_data['score'], grade_data.get('feedback'))
+        assignment_obj.record_grade(grade_obj.score, grade_obj.feedback or '', student_obj.student_id)
+        course_obj.grades[(student_obj.student_id, assignment_obj.title)] = grade_obj
+        course_obj.gradebook.add(student_obj.student_id, assignment_obj.title, grade_obj.score)
+
+    def _load_announcement(self, announcement_data):
+        self.announcements.append(announcement.Announcement(
+            announcement_data['title'],
+            announcement_data['content'],
+            announcement_data['date'],
+            list(announcement_data.get('recipient_groups', [])),
+            announcement_data.get('announcement_id')
+        ))
+
+    def _load_expiry(self, expiry_data):
+        self.announcements.expire(expiry_data['before'])
+
+    def _load_announcement_groups(self, groups_data):
+        self.announcements.regroup(groups_data['announcement_id'], groups_data['recipient_groups'])
+
+    def _apply_record(self, op, record):
+        """Apply a snapshot coursework record or a replayed journal record."""
+        loaders = {
+            'enroll': self._load_enrollment,
+            'enroll_many': self._load_enrollments,
+            'unenroll': self._load_unenrollment,
+            'assignment': self._load_assignment,
+            'assignments': self._load_assignment,
+            'grade': self._load_grade,
+            'grades': self._load_grade,
+            'announcement': self._load_announcement,
+            'schedule': self._load_schedule,
+            'expire_announcements': self._load_expiry,
+            'announcement_groups': self._load_announcement_groups,
+        }
+        loader = loaders.get(op)
+        if loader:
+            loader(record)
+        else:
+            events.warning(f"Warning: Unknown record type '{op}' ignored.")
+
+    def snapshot_data(self) -> dict:
+        """Serialize the platform into the data.json layout."""
+        return {
+            "students": [student.to_dict() for student in self.students],
+            "instructors": [instructor.to_dict() for instructor in self.instructors],
+            "courses": [course.to_dict() for course in self.courses],
+            "enrollments": [
+                {"student_id": student.student_id, "course_code": course.course_code}
+                for student in self.students for course in student.enrolled_courses
+            ],
+            "schedules": [
+                {"course_code": course.course_code, "day": course.schedule.day, "time": course.schedule.time}
+                for course in self.courses if hasattr(course, 'schedule') and course.schedule
+            ],
+            "assignments": [
+                {"course_code": course.course_code, "title": a.title, "description": a.description,
+                 "due_date": a.due_date.isoformat()}
+                for course in self.courses for a in course.assignments
+            ],
+            "grades": [
+                {"course_code": course.course_code, **g.to_dict()}
+                for course in self.courses for g in course.grades.values()
+            ],
+            "announcements": [
+                {"announcement_id": a.announcement_id, "title": a.title, "content": a.content,
+                 "date": date_key(a.date), "recipient_groups": list(a.recipient_groups)}
+                for a in self.announcements
+            ],
+            "admins": self.admins,
+            "journal_seq": self.journal.seq if self.journal else self.journal_seq,
+        }
+
+    def write_snapshot(self, data: dict, filename: str) -> None:
+        """Write a snapshot atomically: a crash leaves either the old file or the new one."""
+        tmp_filename = filename + '.tmp'
+        with open(tmp_filename, 'w') as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filename, filename)
+        if self.write_binary:
+            # Written after the JSON so it is the newer file and load_data picks it up
+            binary_snapshot.write(data, binary_snapshot.sidecar_path(filename))
+        if self.on_snapshot_written:
+            self.on_snapshot_written(filename)
 
     def save_data(self, filename='data.json'):
         """
         Save the current platform data to a JSON file.
+        In journal mode every mutation is already in the journal, so this only commits it.
         :param filename: Path to the JSON file.
         """
         try:
-            data = {
-                "students": [student.to_dict() for student in self.students],
-                "instructors": [instructor.to_dict() for instructor in self.instructors],
-                "courses": [course.to_dict() for course in self.courses],
-                "enrollments": [
-                    {"student_id": student.student_id, "course_code": course.course_code}
-                    for student in self.students for course in student.enrolled_courses
-                ],
-                "schedules": [
-                    {"course_code": course.course_code, "day": course.schedule.day, "time": course.schedule.time}
-                    for course in self.courses if hasattr(course, 'schedule') and course.schedule
-                ]
-            }
-
-            with open(filename, 'w') as f:
-                json.dump(data, f, indent=4)
-            print(f"Data successfully saved to {filename}.")
+            # Sidecars go next to the file actually written, which is not `filename` in journal or storage mode
+            if self.journal:
+                target = self.snapshot_filename
+            elif self.storage:
+                target = self.storage.filename
+            else:
+                target = filename
+            self.save_search(search_index.sidecar_path(target))
+            posts_directory = post_store.sidecar_path(target)
+            if not self.posts.directory or os.path.abspath(self.posts.directory) != os.path.abspath(posts_directory):
+                self.posts.save_to(posts_directory)
+            if self.journal:
+                self.journal.commit()
+                events.info(f"Journal committed to {self.journal.filename}.")
+                return
+
+            if self.storage:
+                self.storage.save(self)
+                events.info(f"Data successfully saved to {self.storage.filename}.")
+                return
+
+            self.write_snapshot(self.snapshot_data(), filename)
+            events.info(f"Data successfully saved to {filename}.")
 
         except Exception as e:
-            print(f"Error saving data: {e}")
+            events.error(f"Error saving data: {e}")
+
+    def open_journal(self, filename='data.json', journal_filename=None, **journal_options):
+        """
+        Switch to journal mode: load the snapshot, replay the journal on top of it,
+        then append every further mutation to the journal instead of rewriting the snapshot.
+        :param filename: Path to the JSON snapshot.
+        :param journal_filename: Path to the journal (defaults to `<filename>.journal`).
+        :param journal_options: Passed through to journal.Journal (group_size, commit_interval, compact_after).
+        """
+        self.snapshot_filename = filename
+        journal_filename = journal_filename or filename + '.journal'
+        self.load_data(filename)
+        last_seq = journal.Journal.replay(
+            journal_filename, self.journal_seq, lambda entry: self._apply_record(entry['op'], entry)
+        )
+        self.journal = journal.Journal(journal_filename, start_seq=last_seq,
+                                       on_compact=self.compact, **journal_options)
+        journal.activate(self.journal)
+        if os.path.exists(self.journal.old_filename):
+            # A previous compaction did not finish; everything is replayed now, so fold it in.
+            self.write_snapshot(self.snapshot_data(), filename)
+            self.journal.discard_old()
+
+    def compact(self, background=True):
+        """
+        Fold the journal into a new snapshot. The object graph is serialized to a dict
+        while every entity lock is held (so it matches the journal position exactly: every journaled
+        mutation takes at least one of these locks while it applies and records its change), the journal
+        segment is rotated, and the snapshot is written and the old segment dropped in the background.
+        """
+        if not self.journal or (self._compaction and self._compaction.is_alive()):
+            return
+        with locks.all_locks():
+            data = self.snapshot_data()
+            self.journal.rotate()
+
+        def write():
+            try:
+                self.write_snapshot(data, self.snapshot_filename)
+                self.journal.discard_old()
+            except Exception as e:
+                events.error(f"Error compacting journal: {e}")
+
+        if background:
+            self._compaction = threading.Thread(target=write)
+            self._compaction.start()
+        else:
+            write()
 
-   
\ No newline at end of file
+    def close_journal(self):
+        """Commit the journal, wait for any compaction and leave journal mode."""
+        if not self.journal:
+            return
+        if self._compaction:
+            self._compaction.join()
+        self.journal.close()
+        journal.activate(None)
+        self.journal = None
@@ -0,0 +1,219 @@
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+SEGMENT_SIZE = 1000  # Posts per segment file
+OPEN_SEGMENTS = 256  # Tail segment files kept open for appending
+CACHED_SEGMENTS = 64  # Full (immutable) segments kept in memory after a read
+
+MANIFEST = 'threads.jsonl'
+
+
+def sidecar_path(filename: str) -> str:
+    """The post store directory kept next to a data file (data.json -> data.discussions)."""
+    return os.path.splitext(filename)[0] + '.discussions'
+
+
+class _ThreadLog:
+    """Append position, last activity and the current (tail) segment of one thread."""
+    __slots__ = ('count', 'last_activity', 'tail')
+
+    def __init__(self):
+        self.count = 0
+        self.last_activity: Optional[str] = None
+        self.tail: List[dict] = []  # Posts of the segment currently being appended to
+
+
+class PostStore:
+    """
+    Append-only storage for discussion posts. Each thread is a directory of JSON-lines
+    segments of `segment_size` posts, named after the first post ID they hold, so a post's
+    segment follows from its ID and a page is read from one or two segments. Thread counts and
+    last activity come from the last segment only, so listing threads never reads old posts.
+    threads.jsonl records every thread's course, title and creator.
+
+    With directory=None the store is kept in memory only (for scratch platforms and benchmarks).
+    """
+
+    def __init__(self, directory: Optional[str] = None, segment_size: int = SEGMENT_SIZE, fsync: bool = False):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.fsync = fsync  # fsync every append, not just flush it to the OS
+        self.resolve_author = None  # Optional callback(role, author_id) -> display name
+        self._lock = threading.RLock()
+        self._threads: Dict[int, dict] = {}  # thread_id -> manifest record
+        self._logs: Dict[int, _ThreadLog] = {}
+        self._segments: Dict[tuple, List[dict]] = {}  # In-memory mode: (thread_id, segment) -> posts
+        self._cache: OrderedDict = OrderedDict()  # (thread_id, segment) -> posts, full segments only
+        self._handles: OrderedDict = OrderedDict()  # thread_id -> open tail segment file
+        if directory and os.path.exists(os.path.join(directory, MANIFEST)):
+            self._open()
+
+    def _open(self) -> None:
+        for record in self._read_file(os.path.join(self.directory, MANIFEST), repair=True):
+            self._threads[record['thread_id']] = record
+        for thread_id in self._threads:
+            log = self._logs[thread_id] = _ThreadLog()
+            thread_dir = self._thread_dir(thread_id)
+            segments = sorted(os.listdir(thread_dir)) if os.path.isdir(thread_dir) else []
+            if segments:
+                log.tail = self._read_file(os.path.join(thread_dir, segments[-1]), repair=True)
+                first_id = int(os.path.splitext(segments[-1])[0])
+                log.count = first_id - 1 + len(log.tail)
+                log.last_activity = log.tail[-1]['timestamp'] if log.tail else None
+
+    def _thread_dir(self, thread_id: int) -> str:
+        return os.path.join(self.directory, str(thread_id))
+
+    def _segment_path(self, thread_id: int, segment: int) -> str:
+        return os.path.join(self._thread_dir(thread_id), f"{segment * self.segment_size + 1:09d}.jsonl")
+
+    @staticmethod
+    def _read_file(path: str, repair: bool = False) -> List[dict]:
+        """
+        Read a JSON-lines file up to the first incomplete line (a crash mid-append).
+        :param repair: Truncate that torn tail so later appends start on a clean line.
+        """
+        records = []
+        valid = 0
+        with open(path, 'rb+' if repair else 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError("incomplete line")
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+                valid += len(line)
+            if repair:
+                f.truncate(valid)
+        return records
+
+    def threads(self) -> List[dict]:
+        """Manifest records of every thread: thread_id, course_code, title, creator_id, creator_role, created."""
+        return list(self._threads.values())
+
+    def create_thread(self, course_code: str, title: str, creator_id: str, creator_role: str) -> dict:
+        with self._lock:
+            record = {'thread_id': len(self._threads) + 1, 'course_code': course_code, 'title': title,
+                      'creator_id': creator_id, 'creator_role': creator_role, 'created': datetime.now().isoformat()}
+            if self.directory:
+                os.makedirs(self.directory, exist_ok=True)
+                self._write_line(os.path.join(self.directory, MANIFEST), record)
+            self._threads[record['thread_id']] = record
+            self._logs[record['thread_id']] = _ThreadLog()
+            return record
+
+    def _write_line(self, path: str, record: dict, handle=None) -> None:
+        line = json.dumps(record, separators=(',', ':')) + '\n'
+        if handle is None:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                self._sync(f)
+        else:
+            handle.write(line)
+            self._sync(handle)
+
+    def _sync(self, f) -> None:
+        f.flush()
+        if self.fsync:
+            os.fsync(f.fileno())
+
+    def append(self, thread_id: int, author_id: str, author_role: str, message: str) -> dict:
+        """Append a post and return it. Posts are numbered 1, 2, ... within their thread."""
+        with self._lock:
+            log = self._logs[thread_id]
+            post = {'id': log.count + 1, 'author_id': author_id, 'role': author_role,
+                    'timestamp': datetime.now().isoformat(), 'message': message}
+            segment = log.count // self.segment_size
+            if self.directory:
+                self._write_line(None, post, self._handle(thread_id, segment))
+            else:
+                self._segments.setdefault((thread_id, segment), []).append(post)
+            if len(log.tail) == self.segment_size:
+                log.tail = []
+            log.tail.append(post)
+            log.count += 1
+            log.last_activity = post['timestamp']
+            return post
+
+    def _handle(self, thread_id: int, segment: int):
+        """The open file of the thread's tail segment, rolling over to a new file when a segment fills."""
+        path = self._segment_path(thread_id, segment)
+        handle = self._handles.get(thread_id)
+        if handle is not None and handle.name != path:
+            handle.close()
+            handle = None
+        if handle is None:
+            os.makedirs(self._thread_dir(thread_id), exist_ok=True)
+            handle = open(path, 'a', encoding='utf-8')
+            if len(self._handles) >= OPEN_SEGMENTS:
+                self._handles.popitem(last=False)[1].close()
+        self._handles[thread_id] = handle
+        self._handles.move_to_end(thread_id)
+        return handle
+
+    def count(self, thread_id: int) -> int:
+        return self._logs[thread_id].count
+
+    def last_activity(self, thread_id: int) -> Optional[str]:
+        return self._logs[thread_id].last_activity
+
+    def _segment(self, thread_id: int, segment: int) -> List[dict]:
+        log = self._logs[thread_id]
+        if segment == (log.count - 1) // self.segment_size:
+            return log.tail
+        if not self.directory:
+            return self._segments.get((thread_id, segment), [])
+        key = (thread_id, segment)
+        posts = self._cache.get(key)
+        if posts is None:
+            posts = self._cache[key] = self._read_file(self._segment_path(thread_id, segment))
+            if len(self._cache) > CACHED_SEGMENTS:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        return posts
+
+    def read(self, thread_id: int, first_id: int, last_id: int) -> List[dict]:
+        """Posts first_id..last_id (inclusive, clipped to the thread), oldest first."""
+        with self._lock:
+            first_id, last_id = max(1, first_id), min(self._logs[thread_id].count, last_id)
+            posts = []
+            for segment in range((first_id - 1) // self.segment_size, (last_id - 1) // self.segment_size + 1):
+                start = segment * self.segment_size + 1
+                rows = self._segment(thread_id, segment)
+                posts.extend(rows[max(0, first_id - start):last_id - start + 1])
+            return posts
+
+    def save_to(self, directory: str) -> None:
+        """
+        Write a copy of the whole store to `directory` (replacing any store there), for saving the
+        platform under another name; this store keeps working where it is.
+        """
+        temp_directory = directory + '.tmp'
+        shutil.rmtree(temp_directory, ignore_errors=True)
+        copy = PostStore(temp_directory, self.segment_size)
+        with self._lock:
+            os.makedirs(temp_directory)
+            for record in self._threads.values():
+                copy._write_line(os.path.join(temp_directory, MANIFEST), record)
+                count = self._logs[record['thread_id']].count
+                for start in range(1, count + 1, self.segment_size):
+                    path = copy._segment_path(record['thread_id'], (start - 1) // self.segment_size)
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    with open(path, 'w', encoding='utf-8') as f:
+                        for post in self.read(record['thread_id'], start, start + self.segment_size - 1):
+                            f.write(json.dumps(post, separators=(',', ':')) + '\n')
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(temp_directory, directory)
+
+    def close(self) -> None:
+        with self._lock:
+            for handle in self._handles.values():
+                handle.close()
+            self._handles.clear()
@@ -0,0 +1,116 @@
+from typing import Dict, List, Optional
+from due_index import DueDateIndex
+from gpa_engine import GpaEngine
+from schedule_index import ScheduleIndex
+
+
+class EntityRegistry:
+    """Hash indexes over the platform's students, instructors and courses."""
+
+    def __init__(self):
+        self.students: Dict[str, 'Student'] = {}  # student_id -> Student
+        self.instructors: Dict[str, 'Instructor'] = {}  # instructor_id -> Instructor
+        self.courses: Dict[str, 'Course'] = {}  # course_code -> Course
+        self.courses_by_instructor: Dict[str, List['Course']] = {}  # instructor_id -> [Course]
+        self.students_by_name: Dict[str, 'Student'] = {}  # name -> first student registered under it
+        self.instructors_by_name: Dict[str, 'Instructor'] = {}  # name -> first instructor registered under it
+        self.student_loader = None  # Called with a student_id on a miss by lazy storage backends
+        self.instructor_loader = None  # Likewise with an instructor_id; hydrates the courses they teach too
+        self.course_loader = None  # Likewise with a course_code
+        # Weekly intervals of each instructor's courses, for teaching-conflict checks
+        self.instructor_schedules = ScheduleIndex(
+            lambda instructor: self.courses_by_instructor.get(instructor.instructor_id, []))
+        self.due_dates = DueDateIndex()  # Every registered course's assignments, by due date
+        self.gpa = GpaEngine(self.students)  # Unit-weighted GPAs, fed by the courses' gradebooks
+
+    def clear(self) -> None:
+        """Drop every index entry."""
+        self.students.clear()
+        self.instructors.clear()
+        self.courses.clear()
+        self.courses_by_instructor.clear()
+        self.students_by_name.clear()
+        self.instructors_by_name.clear()
+        self.instructor_schedules.invalidate()
+        self.due_dates.clear()
+        self.gpa.clear()
+
+    def rebuild(self, students, instructors, courses) -> None:
+        """Rebuild all indexes from the given entity lists in a single pass each."""
+        self.clear()
+        for instructor in instructors:
+            self.add_instructor(instructor)
+        for course in courses:
+            self.add_course(course)
+        for student in students:
+            self.add_student(student)
+
+    def add_student(self, student: 'Student') -> None:
+        self.students[student.student_id] = student
+        self.students_by_name.setdefault(student.name, student)
+
+    def add_instructor(self, instructor: 'Instructor') -> None:
+        self.instructors[instructor.instructor_id] = instructor
+        self.instructors_by_name.setdefault(instructor.name, instructor)
+
+    def add_course(self, course: 'Course') -> None:
+        previous = self.courses.get(course.course_code)
+        if previous is not None:
+            self._unlink_course(previous)
+        self.courses[course.course_code] = course
+        instructor_id = course.instructor.instructor_id
+        self.courses_by_instructor.setdefault(instructor_id, []).append(course)
+        self.instructor_schedules.add(course.instructor, course)
+        course.due_index = self.due_dates
+        course.gradebook.listener = self.gpa.listener(course)
+        for assignment in course.assignments:
+            self.due_dates.add(assignment)
+
+    def remove_course(self, course: 'Course') -> None:
+        if self.courses.get(course.course_code) is course:
+            del self.courses[course.course_code]
+            self._unlink_course(course)
+
+    def _unlink_course(self, course: 'Course') -> None:
+        self.due_dates.remove_course(course)
+        course.due_index = None
+        course.gradebook.listener = None
+        taught = self.courses_by_instructor.get(course.instructor.instructor_id, [])
+        if course in taught:
+            taught.remove(course)
+            self.instructor_schedules.remove(course.instructor, course)
+
+    def instructor_conflicts(self, course: 'Course') -> List['Course']:
+        """Other courses of the course's instructor that meet at an overlapping time."""
+        return self.instructor_schedules.conflicts(course.instructor, course)
+
+    def get_student(self, student_id: str) -> Optional['Student']:
+        student = self.students.get(student_id)
+        if student is None and self.student_loader is not None:
+            student = self.student_loader(student_id)
+        return student
+
+    def get_instructor(self, instructor_id: str) -> Optional['Instructor']:
+        instructor = self.instructors.get(instructor_id)
+        if instructor is None and self.instructor_loader is not None:
+            instructor = self.instructor_loader(instructor_id)
+        return instructor
+
+    def get_course(self, course_code: str) -> Optional['Course']:
+        course = self.courses.get(course_code)
+        if course is None and self.course_loader is not None:
+            course = self.course_loader(course_code)
+        return course
+
+    def find_student_by_name(self, name: str) -> Optional['Student']:
+        """The first registered student with this name (hydrated students only)."""
+        return self.students_by_name.get(name)
+
+    def find_instructor_by_name(self, name: str) -> Optional['Instructor']:
+        """The first registered instructor with this name (hydrated instructors only)."""
+        return self.instructors_by_name.get(name)
+
+    def get_courses_by_instructor(self, instructor_id: str) -> List['Course']:
+        if instructor_id not in self.instructors and self.instructor_loader is not None:
+            self.instructor_loader(instructor_id)
+        return list(self.courses_by_instructor.get(instructor_id, []))
@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+from gradebook import Gradebook
+import events
+
+MANIFEST = 'manifest.json'  # course_code -> fingerprint of the inputs its report was built from
+SUMMARY = 'summary.json'
+HISTOGRAM_BINS = 10
+REPORT_VERSION = 2  # Part of every fingerprint; bumped when the reports change, so old ones are rebuilt
+
+
+class ReportRun:
+    """Outcome of generate_reports: the courses rebuilt, skipped as unchanged and dropped."""
+
+    def __init__(self):
+        self.rebuilt: List[str] = []
+        self.unchanged: List[str] = []
+        self.removed: List[str] = []
+
+    def summary(self) -> str:
+        return f"{len(self.rebuilt)} rebuilt, {len(self.unchanged)} unchanged, {len(self.removed)} removed"
+
+
+def course_input(course, enrolled: int) -> dict:
+    """
+    Everything a course report needs, as plain picklable data: the gradebook columns travel as
+    raw array bytes, so sending a course to a worker process is a few memory copies.
+    """
+    gradebook = course.gradebook
+    return {
+        'course_code': course.course_code,
+        'course_name': course.course_name,
+        'instructor_id': course.instructor.instructor_id,
+        'instructor': course.instructor.name,
+        'units': course.units,
+        'enrolled': enrolled,
+        'assignments': [{'title': a.title, 'due_date': a.due_date.isoformat()} for a in course.assignments],
+        'threads': len(course.discussion_threads),
+        'student_ids': list(gradebook.student_ids),
+        'assignment_titles': list(gradebook.assignment_titles),
+        'student_col': gradebook.student_col.tobytes(),
+        'assignment_col': gradebook.assignment_col.tobytes(),
+        'score_col': gradebook.score_col.tobytes(),
+    }
+
+
+def fingerprint(data: dict) -> str:
+    """Digest of a course's report inputs; the report is rebuilt only when this changes."""
+    digest = hashlib.sha1(f"v{REPORT_VERSION}".encode('utf-8'))
+    for key in sorted(data):
+        value = data[key]
+        digest.update(key.encode('utf-8'))
+        digest.update(value if isinstance(value, bytes) else json.dumps(value, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _gradebook(data: dict) -> Gradebook:
+    columns = []
+    for column, typecode in (('student_col', 'I'), ('assignment_col', 'I'), ('score_col', 'd')):
+        values = array(typecode)
+        values.frombytes(data[column])
+        columns.append(values)
+    return Gradebook.from_columns(data['student_ids'], data['assignment_titles'], *columns)
+
+
+def build_report(data: dict, directory: str) -> dict:
+    """
+    Compute one course's report, write it to <directory>/<course code>.json and return its
+    summary row. Runs in a worker process.
+    """
+    gradebook = _gradebook(data)
+    enrolled = data['enrolled']
+    assignments = []
+    for assignment in data['assignments']:
+        stats = gradebook.summary(assignment['title'])
+        counts, edges = gradebook.histogram(HISTOGRAM_BINS, assignment_title=assignment['title'])
+        assignments.append(dict(
+            assignment, **stats, histogram={'counts': counts, 'edges': edges},
+            completion_rate=round(stats['count'] / enrolled, 4) if enrolled else 0.0,
+        ))
+    overall = gradebook.summary()
+    counts, edges = gradebook.histogram(HISTOGRAM_BINS)
+    expected = enrolled * len(data['assignments'])
+    report = {
+        'course_code': data['course_code'],
+        'course_name': data['course_name'],
+        'instructor_id': data['instructor_id'],
+        'instructor': data['instructor'],
+        'units': data['units'],
+        'enrolled': enrolled,
+        'discussion_threads': data['threads'],
+        'grades': overall,
+        'histogram': {'counts': counts, 'edges': edges},
+        'completion_rate': round(overall['count'] / expected, 4) if expected else 0.0,
+        'assignments': assignments,
+    }
+    _write_json(os.path.join(directory, f"{data['course_code']}.json"), report)
+    row = {key: report[key] for key in ('course_code', 'course_name', 'instructor_id', 'instructor', 'units',
+                                        'enrolled', 'completion_rate')}
+    row.update(assignments=len(assignments), graded=overall['count'], mean=overall['mean'])
+    return row
+
+
+def _build_many(batch: List[dict], directory: str) -> List[dict]:
+    return [build_report(data, directory) for data in batch]
+
+
+def _write_json(filename: str, data) -> None:
+    temp_filename = filename + '.tmp'
+    with open(temp_filename, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    os.replace(temp_filename, filename)
+
+
+def _read_json(filename: str, default):
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def instructor_loads(rows: List[dict]) -> List[dict]:
+    """Per-instructor totals over the course summary rows: courses, units, students and grades."""
+    loads: Dict[str, dict] = {}
+    for row in rows:
+        load = loads.setdefault(row['instructor_id'], {'instructor_id': row['instructor_id'],
+                                                       'instructor': row['instructor'], 'courses': 0,
+                                                       'units': 0, 'students': 0, 'graded': 0})
+        load['courses'] += 1
+        load['units'] += row['units']
+        load['students'] += row['enrolled']
+        load['graded'] += row['graded']
+    return sorted(loads.values(), key=lambda load: load['instructor_id'])
+
+
+def generate_reports(platform_admin, directory: str = 'reports', workers: Optional[int] = None,
+                     incremental: bool = True, batch_size: int = 64) -> ReportRun:
+    """
+    Write a JSON report per course and a merged summary.json with instructor loads. Courses are
+    sent to a process pool in batches of `batch_size`; with workers=1 they are built in this process.
+    :param incremental: Only rebuild courses whose inputs changed since the last run (per
+                        manifest.json); the others keep their report file and summary row.
+    """
+    os.makedirs(directory, exist_ok=True)
+    run = ReportRun()
+    manifest = _read_json(os.path.join(directory, MANIFEST), {}) if incremental else {}
+    previous_rows = {row['course_code']: row
+                     for row in _read_json(os.path.join(directory, SUMMARY), {}).get('courses', [])}
+    rows: Dict[str, dict] = {}
+    pending: List[dict] = []
+    fingerprints: Dict[str, str] = {}
+    for course in platform_admin.courses:
+        data = course_input(course, len(platform_admin.enrollments.get_students_by_course(course)))
+        code = course.course_code
+        fingerprints[code] = fingerprint(data)
+        if (manifest.get(code) == fingerprints[code] and code in previous_rows
+                and os.path.exists(os.path.join(directory, f"{code}.json"))):
+            rows[code] = previous_rows[code]
+            run.unchanged.append(code)
+        else:
+            pending.append(data)
+            run.rebuilt.append(code)
+
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    if workers == 1 or len(batches) <= 1:
+        results = [_build_many(batch, directory) for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_build_many, batches, [directory] * len(batches)))
+    for batch_rows in results:
+        for row in batch_rows:
+            rows[row['course_code']] = row
+
+    for code in set(manifest) - set(fingerprints):
+        run.removed.append(code)
+        try:
+            os.remove(os.path.join(directory, f"{code}.json"))
+        except FileNotFoundError:
+            pass
+    course_rows = [rows[course.course_code] for course in platform_admin.courses]
+    _write_json(os.path.join(directory, SUMMARY), {
+        'courses': course_rows,
+        'instructors': instructor_loads(course_rows),
+        'totals': {'courses': len(course_rows), 'enrolled': sum(row['enrolled'] for row in course_rows),
+                   'graded': sum(row['graded'] for row in course_rows)},
+    })
+    _write_json(os.path.join(directory, MANIFEST), fingerprints)
+    events.info(f"Course reports in {directory}: {run.summary()}.")
+    return run
@@ -1,6 +1,97 @@
+import re
+from datetime import datetime
+from typing import List, Tuple
 from course import Course
+import events
+
+DAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+TIME_FORMATS = ('%I:%M %p', '%I:%M%p', '%I %p', '%I%p', '%H:%M')
+
+
+def parse_days(day: str) -> List[int]:
+    """
+    Parse a day field such as "Monday", "Mon/Wed" or "Tuesday, Thursday" into weekday indexes (Monday = 0).
+    :raises ValueError: If a day name is not recognized.
+    """
+    indexes = []
+    for name in re.split(r'\s*(?:,|/|&|\band\b)\s*', day.strip().lower()):
+        if not name:
+            continue
+        index = next((i for i, full in enumerate(DAYS) if len(name) >= 2 and full.startswith(name)), None)
+        if index is None:
+            raise ValueError(f"Unknown day '{name}'.")
+        if index not in indexes:
+            indexes.append(index)
+    if not indexes:
+        raise ValueError("No day given.")
+    return indexes
+
+
+def parse_time(value: str) -> int:
+    """Parse a clock time such as "09:00 AM" or "14:30" into minutes after midnight."""
+    value = value.strip().upper()
+    for fmt in TIME_FORMATS:
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        return parsed.hour * 60 + parsed.minute
+    raise ValueError(f"Unknown time '{value}'.")
+
+
+def parse_time_range(time: str) -> Tuple[int, int]:
+    """
+    Parse a range such as "09:00 AM - 11:00 AM" into (start, end) minutes after midnight.
+    A range ending at or before its start runs past midnight.
+    """
+    parts = re.split(r'\s*(?:-|–|\bto\b)\s*', time.strip(), maxsplit=1)
+    if len(parts) != 2:
+        raise ValueError(f"Time '{time}' is not a range.")
+    start, end = parse_time(parts[0]), parse_time(parts[1])
+    if end <= start:
+        end += MINUTES_PER_DAY
+    return start, end
+
+
+def weekly_intervals(day: str, time: str) -> List[Tuple[int, int]]:
+    """
+    Normalize a day and time range into half-open (start, end) intervals in minutes from Monday 00:00,
+    sorted by start. A session running past Sunday midnight is split in two.
+    """
+    start, end = parse_time_range(time)
+    intervals = []
+    for index in parse_days(day):
+        offset = index * MINUTES_PER_DAY
+        if offset + end > MINUTES_PER_WEEK:
+            intervals.append((offset + start, MINUTES_PER_WEEK))
+            intervals.append((0, offset + end - MINUTES_PER_WEEK))
+        else:
+            intervals.append((offset + start, offset + end))
+    return sorted(intervals)
+
+
+def format_week_minute(minute: int) -> Tuple[str, str]:
+    """Turn minutes from Monday 00:00 back into a (day, "09:00 AM") pair."""
+    day, minute = divmod(minute % MINUTES_PER_WEEK, MINUTES_PER_DAY)
+    hour, minute = divmod(minute, 60)
+    return DAYS[day].capitalize(), f"{(hour - 1) % 12 + 1:02d}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+def format_timetable(entries) -> List[str]:
+    """Format (start, end, course) timetable entries as one line per weekly session."""
+    lines = []
+    for start, end, course in entries:
+        day, start_time = format_week_minute(start)
+        _, end_time = format_week_minute(end)
+        lines.append(f"{day} {start_time} - {end_time}: {course.course_name} (Code: {course.course_code})")
+    return lines
+
 
 class Schedule:
+    __slots__ = ('__course', '__day', '__time', '__intervals')
+
     def __init__(self, course: Course, day: str, time: str):
         """
         Initialize a schedule entry.
@@ -11,6 +102,11 @@ class Schedule:
         self.__course = course
         self.__day = day
         self.__time = time
+        try:
+            self.__intervals = weekly_intervals(day, time)  # Parsed once, used by the conflict checks
+        except ValueError as e:
+            events.warning(f"Warning: Schedule for {course.course_code} cannot be checked for conflicts: {e}")
+            self.__intervals = []
 
     @property
     def course(self) -> Course:
@@ -27,6 +123,16 @@ class Schedule:
         """Return the time of the schedule."""
         return self.__time
 
+    @property
+    def intervals(self) -> List[Tuple[int, int]]:
+        """Half-open weekly (start, end) intervals in minutes from Monday 00:00."""
+        return self.__intervals
+
+    def overlaps(self, other: 'Schedule') -> bool:
+        """Return True if the two schedules share any time in the week."""
+        return any(start < other_end and other_start < end
+                   for start, end in self.__intervals for other_start, other_end in other.intervals)
+
     def to_dict(self) -> dict:
         """
         Convert the schedule to a dictionary format.
@@ -39,15 +145,17 @@ class Schedule:
         }
 
     @classmethod
-    def from_dict(cls, data: dict, all_courses: list[Course]):
+    def from_dict(cls, data: dict, all_courses):
         """
         Create a Schedule object from a dictionary.
         :param data: A dictionary containing schedule details.
-        :param all_courses: A list of available Course objects to match the course_code.
+        :param all_courses: A dict of available Course objects keyed by course_code (or a list of them).
         :return: A Schedule object.
         """
-        # Look up the course based on the course_code from the list of all courses
-        course = next((c for c in all_courses if c.course_code == data["course"]), None)
+        if not isinstance(all_courses, dict):
+            all_courses = {c.course_code: c for c in all_courses}
+        # Look up the course based on the course_code
+        course = all_courses.get(data["course"])
         if not course:
             raise ValueError(f"Course with code {data['course']} not found.")
         # Return the newly created Schedule object
@@ -0,0 +1,167 @@
+import heapq
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Tuple
+
+
+def course_intervals(course) -> List[Tuple[int, int]]:
+    """The parsed weekly intervals of a course, or [] if it has no schedule."""
+    schedule = getattr(course, 'schedule', None)
+    return schedule.intervals if schedule else []
+
+
+class IntervalIndex:
+    """
+    The weekly intervals of one student's or instructor's courses, sorted by start.
+    `_reach[i]` is the latest end among the first i+1 intervals, so an overlap test is
+    a single bisect plus one comparison even when the stored intervals overlap each other.
+    """
+    __slots__ = ('_starts', '_ends', '_courses', '_reach')
+
+    def __init__(self):
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        self._courses: List[object] = []
+        self._reach: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def add(self, course) -> None:
+        for start, end in course_intervals(course):
+            pos = bisect_left(self._starts, start)
+            self._starts.insert(pos, start)
+            self._ends.insert(pos, end)
+            self._courses.insert(pos, course)
+            self._reach.insert(pos, 0)
+            self._update_reach(pos)
+
+    def remove(self, course) -> None:
+        keep = [i for i, c in enumerate(self._courses) if c is not course]
+        if len(keep) == len(self._courses):
+            return
+        self._starts = [self._starts[i] for i in keep]
+        self._ends = [self._ends[i] for i in keep]
+        self._courses = [self._courses[i] for i in keep]
+        self._reach = [0] * len(keep)
+        self._update_reach(0)
+
+    def _update_reach(self, pos: int) -> None:
+        reach = self._reach[pos - 1] if pos else 0
+        for i in range(pos, len(self._ends)):
+            reach = max(reach, self._ends[i])
+            self._reach[i] = reach
+
+    def entries(self) -> List[Tuple[int, int, object]]:
+        """The (start, end, course) intervals in week order."""
+        return list(zip(self._starts, self._ends, self._courses))
+
+    def overlapping(self, start: int, end: int) -> List[object]:
+        """Return the courses with an interval overlapping the half-open [start, end)."""
+        pos = bisect_left(self._starts, end)  # Intervals from pos on start too late to overlap
+        if pos == 0 or self._reach[pos - 1] <= start:
+            return []
+        found = []
+        for i in range(pos - 1, -1, -1):
+            if self._reach[i] <= start:
+                break
+            if self._ends[i] > start and self._courses[i] not in found:
+                found.append(self._courses[i])
+        return found
+
+
+class ScheduleIndex:
+    """
+    Per-owner (student or instructor) interval indexes, used for schedule conflict checks and
+    as each owner's weekly timetable. An owner's index is built on first use from
+    `courses_of(owner)`, so it does not matter whether courses were linked or scheduled before
+    or after the index existed. Afterwards it is kept up to date by add/remove and, when a
+    course's schedule changes, by `reschedule`, which only touches that course's owners.
+
+    A lazy build touches the owner maps of all the owner's courses, more than the student and
+    course locks its callers hold, so every method runs under the index's own lock. It is a leaf
+    lock (nothing else is acquired while it is held), so taking it inside those locks is safe.
+    """
+
+    def __init__(self, courses_of: Callable[[object], Iterable[object]]):
+        self.courses_of = courses_of
+        self._lock = threading.RLock()
+        self._indexes: Dict[object, IntervalIndex] = {}
+        self._owners: Dict[object, Dict[object, None]] = {}  # course -> owners whose index holds it
+
+    def _index(self, owner) -> IntervalIndex:
+        index = self._indexes.get(owner)
+        if index is None:
+            index = self._indexes[owner] = IntervalIndex()
+            for course in list(self.courses_of(owner)):
+                index.add(course)
+                self._owners.setdefault(course, {})[owner] = None
+        return index
+
+    def timetable(self, owner) -> List[Tuple[int, int, object]]:
+        """The owner's (start, end, course) intervals sorted by day and time."""
+        with self._lock:
+            return self._index(owner).entries()
+
+    def conflicts(self, owner, course) -> List[object]:
+        """Return the owner's courses whose schedule overlaps `course` (O(log n) when there is none)."""
+        found = []
+        with self._lock:
+            index = self._index(owner)
+            for start, end in course_intervals(course):
+                for other in index.overlapping(start, end):
+                    if other is not course and other not in found:
+                        found.append(other)
+        return found
+
+    def add(self, owner, course) -> None:
+        with self._lock:
+            if owner in self._indexes and owner not in self._owners.get(course, ()):
+                self._indexes[owner].add(course)
+                self._owners.setdefault(course, {})[owner] = None
+
+    def remove(self, owner, course) -> None:
+        with self._lock:
+            owners = self._owners.get(course)
+            if owners and owner in owners:
+                self._indexes[owner].remove(course)
+                del owners[owner]
+                if not owners:
+                    del self._owners[course]
+
+    def reschedule(self, course) -> None:
+        """Re-index a course whose schedule changed, in the indexes of the owners that hold it."""
+        with self._lock:
+            for owner in list(self._owners.get(course, ())):
+                index = self._indexes[owner]
+                index.remove(course)
+                index.add(course)
+
+    def invalidate(self) -> None:
+        """Drop every owner's index; each is rebuilt on next use."""
+        with self._lock:
+            self._indexes.clear()
+            self._owners.clear()
+
+
+def overlapping_pairs(courses: Iterable[object]) -> List[Tuple[object, object]]:
+    """
+    Find every pair of courses whose schedules overlap with a single sweep over the week:
+    intervals are visited by start time, and each one overlaps exactly the intervals still open.
+    O(n log n + k) for n intervals and k overlapping pairs.
+    """
+    intervals = sorted(
+        (start, end, i, course) for i, course in enumerate(courses) for start, end in course_intervals(course)
+    )
+    open_intervals: List[Tuple[int, int, object]] = []  # Heap of (end, i, course)
+    pairs: Dict[Tuple[int, int], Tuple[object, object]] = {}
+    for start, end, i, course in intervals:
+        while open_intervals and open_intervals[0][0] <= start:
+            heapq.heappop(open_intervals)
+        for _, j, other in open_intervals:
+            if j != i:
+                key = (min(i, j), max(i, j))
+                if key not in pairs:
+                    pairs[key] = (other, course) if j < i else (course, other)
+        heapq.heappush(open_intervals, (end, i, course))
+    return [pairs[key] for key in sorted(pairs)]
@@ -0,0 +1,411 @@
+import heapq
+import json
+import math
+import os
+import re
+import struct
+import sys
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; queries fall back to a pure-Python accumulator
+    np = None
+
+MAGIC = b'ELSRCH'
+VERSION = 2
+
+# Document kinds
+POST, THREAD, ANNOUNCEMENT, ASSIGNMENT = range(4)
+KIND_NAMES = ('post', 'thread', 'announcement', 'assignment')
+
+K1 = 1.2  # BM25 term-frequency saturation
+B = 0.75  # BM25 length normalization
+
+STOPWORDS = frozenset(
+    'a an and are as at be by for from has have in is it its of on or that the this to was were will with'.split()
+)
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased alphanumeric tokens, without stopwords."""
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def sidecar_path(json_filename: str) -> str:
+    """Search index kept next to a JSON data file (data.json -> data.search)."""
+    return os.path.splitext(json_filename)[0] + '.search'
+
+
+def _to_le(arr: array) -> bytes:
+    if sys.byteorder == 'big':
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _from_le(typecode: str, data: bytes) -> array:
+    arr = array(typecode)
+    arr.frombytes(data)
+    if sys.byteorder == 'big':
+        arr.byteswap()
+    return arr
+
+
+class SearchIndex:
+    """
+    Incremental inverted index with BM25 ranking over discussion posts and thread titles,
+    announcements and assignments. Documents get increasing IDs, so each term's postings
+    (doc IDs and term frequencies in `array` columns) stay sorted by plain appends. Each document
+    remembers its course, and each announcement a bitmask of its recipient groups, so queries can be
+    scoped to a set of courses and to the announcements a group may see before anything is ranked.
+
+    Postings loaded from disk stay in two flat base arrays sliced per term; postings added
+    afterwards go to per-term delta arrays. Loading is therefore a few large reads, with no
+    per-term copying. Removed documents (expired announcements, deleted assignments) are tombstoned.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.doc_kind = array('B')
+        self.doc_ref = array('I')  # Post/thread: thread_id; announcement/assignment: index into keys
+        self.doc_ref2 = array('I')  # Post: post id
+        self.doc_len = array('I')
+        self.doc_course = array('i')  # Index into courses, -1 for platform-wide documents
+        self.courses: List[str] = []
+        self._course_index: Dict[str, int] = {}
+        self.doc_groups = array('Q')  # Bitmask over groups of an announcement's recipient groups, 0 otherwise
+        self.groups: List[str] = []
+        self._group_index: Dict[str, int] = {}
+        self.keys: List[str] = []  # Keys of announcement and assignment documents
+        self.key_docs: Dict[str, int] = {}  # key -> doc id (live documents only)
+        self.post_marks: Dict[int, int] = {}  # thread_id -> last post id indexed
+        self.deleted = set()
+        self.total_len = 0
+        self._base_docs = array('I')
+        self._base_tfs = array('I')
+        self._base_span: Dict[str, Tuple[int, int]] = {}  # term -> (start, end) in the base arrays
+        self._delta: Dict[str, Tuple[array, array]] = {}  # term -> (doc ids, tfs) added since loading
+
+    def __len__(self) -> int:
+        return len(self.doc_len) - len(self.deleted)
+
+    # Indexing
+
+    def _group_mask(self, groups: Iterable[str]) -> int:
+        mask = 0
+        for group in groups:
+            bit = self._group_index.get(group)
+            if bit is None:
+                if len(self.groups) == 64:
+                    raise ValueError("A search index holds at most 64 recipient groups.")
+                bit = self._group_index[group] = len(self.groups)
+                self.groups.append(group)
+            mask |= 1 << bit
+        return mask
+
+    def _add_document(self, kind: int, ref: int, ref2: int, course_code: Optional[str], text: str,
+                      groups: int = 0) -> int:
+        tokens = tokenize(text)
+        if course_code is None:
+            course = -1
+        else:
+            course = self._course_index.get(course_code)
+            if course is None:
+                course = self._course_index[course_code] = len(self.courses)
+                self.courses.append(course_code)
+        doc = len(self.doc_len)
+        self.doc_kind.append(kind)
+        self.doc_ref.append(ref)
+        self.doc_ref2.append(ref2)
+        self.doc_len.append(len(tokens))
+        self.doc_course.append(course)
+        self.doc_groups.append(groups)
+        self.total_len += len(tokens)
+        counts: Dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        for term, tf in counts.items():
+            postings = self._delta.get(term)
+            if postings is None:
+                postings = self._delta[term] = (array('I'), array('I'))
+            postings[0].append(doc)
+            postings[1].append(tf)
+        return doc
+
+    def _add_keyed(self, kind: int, key: str, course_code: Optional[str], text: str, groups: int = 0) -> None:
+        if key in self.key_docs:
+            return
+        self.keys.append(key)
+        self.key_docs[key] = self._add_document(kind, len(self.keys) - 1, 0, course_code, text, groups)
+
+    def add_thread(self, thread_id: int, course_code: str, title: str) -> None:
+        with self._lock:
+            if thread_id not in self.post_marks:
+                self.post_marks[thread_id] = 0
+                self._add_document(THREAD, thread_id, 0, course_code, title)
+
+    def add_post(self, thread_id: int, course_code: str, post_id: int, message: str) -> None:
+        with self._lock:
+            if post_id > self.post_marks.get(thread_id, 0):
+                self.post_marks[thread_id] = post_id
+                self._add_document(POST, thread_id, post_id, course_code, message)
+
+    def add_announcement(self, key: str, title: str, content: str, groups: Iterable[str] = ()) -> None:
+        with self._lock:
+            self._add_keyed(ANNOUNCEMENT, key, None, f"{title} {content}", self._group_mask(groups))
+
+    def set_groups(self, key: str, groups: Iterable[str]) -> None:
+        """Replace the recipient groups of an indexed announcement."""
+        with self._lock:
+            doc = self.key_docs.get(key)
+            if doc is not None:
+                self.doc_groups[doc] = self._group_mask(groups)
+
+    def add_assignment(self, key: str, course_code: str, title: str, description: str) -> None:
+        with self._lock:
+            self._add_keyed(ASSIGNMENT, key, course_code, f"{title} {description}")
+
+    def remove(self, key: str) -> None:
+        """Tombstone an announcement or assignment document."""
+        with self._lock:
+            doc = self.key_docs.pop(key, None)
+            if doc is not None:
+                self.deleted.add(doc)
+                self.total_len -= self.doc_len[doc]
+
+    def keyed(self, kind: int) -> List[str]:
+        """Keys of the live documents of a keyed kind (announcements or assignments)."""
+        return [key for key, doc in self.key_docs.items() if self.doc_kind[doc] == kind]
+
+    # Querying
+
+    def _postings(self, term: str) -> List[Tuple[memoryview, memoryview]]:
+        parts = []
+        span = self._base_span.get(term)
+        if span:
+            parts.append((memoryview(self._base_docs)[span[0]:span[1]], memoryview(self._base_tfs)[span[0]:span[1]]))
+        delta = self._delta.get(term)
+        if delta:
+            parts.append((memoryview(delta[0]), memoryview(delta[1])))
+        return parts
+
+    def search(self, query: str, courses: Optional[Iterable[str]] = None, include_global: bool = True,
+               kinds: Optional[Iterable[int]] = None, group: Optional[str] = None,
+               limit: int = 10) -> List[Tuple[float, int]]:
+        """
+        Rank documents against a query with BM25.
+        :param courses: Course codes to search in (None for every course).
+        :param include_global: With `courses`, also return platform-wide documents (announcements).
+        :param kinds: Document kinds to return (None for all).
+        :param group: Only return announcements addressed to this recipient group (None for all).
+        :return: Up to `limit` (score, doc id) pairs, best first.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        with self._lock:
+            n_docs = len(self)
+            if not terms or not n_docs:
+                return []
+            avg_len = max(self.total_len / n_docs, 1.0)
+            allowed = None
+            if courses is not None:
+                allowed = {self._course_index[c] for c in courses if c in self._course_index}
+                if include_global:
+                    allowed.add(-1)
+            kinds = set(kinds) if kinds is not None else None
+            if group is not None:
+                bit = self._group_index.get(group)
+                group = 0 if bit is None else 1 << bit  # An unknown group sees no announcement
+            per_term = []
+            for term in terms:
+                parts = self._postings(term)
+                df = sum(len(docs) for docs, _ in parts)
+                if df:
+                    idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                    per_term.append((idf, parts))
+            if not per_term:
+                return []
+            if np is not None:
+                return self._score_numpy(per_term, avg_len, allowed, kinds, group, limit)
+            return self._score_python(per_term, avg_len, allowed, kinds, group, limit)
+
+    def _accept(self, doc: int, allowed, kinds, group) -> bool:
+        return (doc not in self.deleted
+                and (allowed is None or self.doc_course[doc] in allowed)
+                and (kinds is None or self.doc_kind[doc] in kinds)
+                and (group is None or self.doc_kind[doc] != ANNOUNCEMENT or self.doc_groups[doc] & group))
+
+    def _score_python(self, per_term, avg_len, allowed, kinds, group, limit):
+        doc_len = self.doc_len
+        norm = K1 * (1 - B)
+        slope = K1 * B / avg_len
+        scores: Dict[int, float] = {}
+        for idf, parts in per_term:
+            weight = idf * (K1 + 1)
+            for docs, tfs in parts:
+                for doc, tf in zip(docs, tfs):
+                    scores[doc] = scores.get(doc, 0.0) + weight * tf / (tf + norm + slope * doc_len[doc])
+        candidates = ((doc, score) for doc, score in scores.items() if self._accept(doc, allowed, kinds, group))
+        return [(score, doc) for doc, score in heapq.nlargest(limit, candidates, key=lambda item: item[1])]
+
+    def _score_numpy(self, per_term, avg_len, allowed, kinds, group, limit):
+        doc_len = np.frombuffer(self.doc_len, dtype=np.uint32)
+        all_docs, all_scores = [], []
+        for idf, parts in per_term:
+            for docs, tfs in parts:
+                docs = np.frombuffer(docs, dtype=np.uint32)
+                tfs = np.frombuffer(tfs, dtype=np.uint32).astype(np.float64)
+                lengths = doc_len[docs]
+                all_docs.append(docs)
+                all_scores.append(idf * tfs * (K1 + 1) / (tfs + K1 * (1 - B + B * lengths / avg_len)))
+        docs = np.concatenate(all_docs)
+        scores = np.concatenate(all_scores)
+        if len(per_term) > 1 or len(all_docs) > 1:
+            docs, inverse = np.unique(docs, return_inverse=True)
+            scores = np.bincount(inverse, weights=scores)
+        mask = np.ones(len(docs), dtype=bool)
+        if self.deleted:
+            mask &= ~np.isin(docs, np.fromiter(self.deleted, dtype=np.uint32))
+        if allowed is not None:
+            mask &= np.isin(np.frombuffer(self.doc_course, dtype=np.int32)[docs], list(allowed))
+        if kinds is not None:
+            mask &= np.isin(np.frombuffer(self.doc_kind, dtype=np.uint8)[docs], list(kinds))
+        if group is not None:
+            groups = np.frombuffer(self.doc_groups, dtype=np.uint64)[docs]
+            mask &= ((np.frombuffer(self.doc_kind, dtype=np.uint8)[docs] != ANNOUNCEMENT)
+                     | ((groups & np.uint64(group)) != 0))
+        docs, scores = docs[mask], scores[mask]
+        if len(docs) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            docs, scores = docs[top], scores[top]
+        order = np.argsort(-scores, kind='stable')
+        return [(float(scores[i]), int(docs[i])) for i in order]
+
+    # Persistence
+
+    def save(self, filename: str) -> None:
+        """Write the index atomically (temp file, fsync, rename)."""
+        with self._lock:
+            terms = sorted(set(self._base_span) | set(self._delta))
+            offsets = array('Q', [0])
+            docs, tfs = array('I'), array('I')
+            for term in terms:
+                for term_docs, term_tfs in self._postings(term):
+                    docs.extend(term_docs)
+                    tfs.extend(term_tfs)
+                offsets.append(len(docs))
+            meta = json.dumps({
+                'courses': self.courses, 'groups': self.groups, 'keys': self.keys, 'key_docs': self.key_docs,
+                'post_marks': {str(k): v for k, v in self.post_marks.items()},
+                'deleted': sorted(self.deleted), 'total_len': self.total_len, 'terms': terms,
+            }, separators=(',', ':')).encode('utf-8')
+            columns = [self.doc_kind, self.doc_ref, self.doc_ref2, self.doc_len, self.doc_course, self.doc_groups,
+                       offsets, docs, tfs]
+            temp_filename = filename + '.tmp'
+            with open(temp_filename, 'wb') as f:
+                f.write(MAGIC + struct.pack('<HI', VERSION, len(meta)) + meta)
+                for column in columns:
+                    data = _to_le(column)
+                    f.write(struct.pack('<Q', len(data)) + data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_filename, filename)
+
+    @classmethod
+    def load(cls, filename: str) -> 'SearchIndex':
+        """
+        Read an index written by save.
+        :raises ValueError: If the file is not a search index of this version.
+        """
+        index = cls()
+        with open(filename, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"'{filename}' is not a search index.")
+            version, meta_len = struct.unpack('<HI', f.read(6))
+            if version != VERSION:
+                raise ValueError(f"Unsupported search index version {version}.")
+            meta = json.loads(f.read(meta_len))
+            columns = []
+            for typecode in ('B', 'I', 'I', 'I', 'i', 'Q', 'Q', 'I', 'I'):
+                (size,) = struct.unpack('<Q', f.read(8))
+                columns.append(_from_le(typecode, f.read(size)))
+        (index.doc_kind, index.doc_ref, index.doc_ref2, index.doc_len, index.doc_course, index.doc_groups,
+         offsets, index._base_docs, index._base_tfs) = columns
+        index.courses = meta['courses']
+        index._course_index = {code: i for i, code in enumerate(index.courses)}
+        index.groups = meta['groups']
+        index._group_index = {group: i for i, group in enumerate(index.groups)}
+        index.keys = meta['keys']
+        index.key_docs = meta['key_docs']
+        index.post_marks = {int(k): v for k, v in meta['post_marks'].items()}
+        index.deleted = set(meta['deleted'])
+        index.total_len = meta['total_len']
+        index._base_span = {term: (offsets[i], offsets[i + 1]) for i, term in enumerate(meta['terms'])}
+        return index
+
+
+_active: Optional[SearchIndex] = None
+
+
+def activate(index: Optional[SearchIndex]) -> None:
+    """Keep `index` up to date as posts, announcements and assignments are added (None switches it off)."""
+    global _active
+    _active = index
+
+
+def announcement_key(announcement) -> str:
+    """
+    Unique key of an announcement's document: its ID, with its date and title so that an ID taken
+    over by another announcement (after the first one expired) never matches a stale document.
+    """
+    return f"{announcement.announcement_id}|{announcement.date}|{announcement.title}"
+
+
+def announcement_id(key: str) -> Optional[int]:
+    """The announcement ID in an announcement key (None for keys written before IDs existed)."""
+    head = key.split('|', 1)[0]
+    return int(head) if head.isdigit() else None
+
+
+def assignment_key(course_code: str, assignment) -> str:
+    return f"{course_code}|{assignment.title}|{assignment.due_date.isoformat()}"
+
+
+def assignment_title(key: str) -> str:
+    """The assignment title in an assignment key (course codes and ISO dates contain no '|')."""
+    return key.split('|', 1)[1].rsplit('|', 1)[0]
+
+
+def thread_created(thread) -> None:
+    if _active is not None:
+        _active.add_thread(thread.thread_id, thread.course.course_code, thread.title)
+
+
+def post_added(thread, post: dict) -> None:
+    if _active is not None:
+        _active.add_post(thread.thread_id, thread.course.course_code, post['id'], post['message'])
+
+
+def announcement_added(announcement) -> None:
+    if _active is not None:
+        _active.add_announcement(announcement_key(announcement), announcement.title, announcement.content,
+                                 announcement.recipient_groups)
+
+
+def announcement_regrouped(announcement) -> None:
+    if _active is not None:
+        _active.set_groups(announcement_key(announcement), announcement.recipient_groups)
+
+
+def announcement_removed(announcement) -> None:
+    if _active is not None:
+        _active.remove(announcement_key(announcement))
+
+
+def assignment_added(course_code: str, assignment) -> None:
+    if _active is not None:
+        _active.add_assignment(assignment_key(course_code, assignment), course_code,
+                               assignment.title, assignment.description)
@@ -0,0 +1,438 @@
+import asyncio
+import inspect
+import json
+import sys
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+from schedule import format_timetable
+from student import Student
+import events
+
+HOST = '127.0.0.1'
+PORT = 8765
+
+
+class LatencyStats:
+    """
+    Request counts and latency percentiles per operation. Percentiles are taken over
+    the last `window` requests of each operation, so memory stays bounded on a long-running server.
+    Requests are recorded by the event loop while STATS reads them from a worker thread.
+    """
+
+    def __init__(self, window: int = 10_000):
+        self.window = window
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, op: str, seconds: float, ok: bool = True) -> None:
+        with self._lock:
+            self.counts[op] = self.counts.get(op, 0) + 1
+            if not ok:
+                self.errors[op] = self.errors.get(op, 0) + 1
+            samples = self._samples.get(op)
+            if samples is None:
+                samples = self._samples[op] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def summary(self) -> Dict[str, dict]:
+        """Return {op: {count, errors, p50_ms, p95_ms, p99_ms, max_ms}}."""
+        with self._lock:
+            snapshot = [(op, sorted(samples)) for op, samples in self._samples.items()]
+        result = {}
+        for op, ordered in snapshot:
+            result[op] = {
+                'count': self.counts[op],
+                'errors': self.errors.get(op, 0),
+                'p50_ms': round(percentile(ordered, 50) * 1000, 3),
+                'p95_ms': round(percentile(ordered, 95) * 1000, 3),
+                'p99_ms': round(percentile(ordered, 99) * 1000, 3),
+                'max_ms': round(ordered[-1] * 1000, 3),
+            }
+        return result
+
+    def display(self) -> None:
+        print(f"{'operation':<14} {'count':>8} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        for op, row in sorted(self.summary().items()):
+            print(f"{op:<14} {row['count']:>8} {row['errors']:>7} {row['p50_ms']:>8.3f} "
+                  f"{row['p95_ms']:>8.3f} {row['p99_ms']:>8.3f} {row['max_ms']:>8.3f}")
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def _announcement_dict(announcement) -> dict:
+    return {'title': announcement.title, 'date': str(announcement.date), 'content': announcement.content}
+
+
+def _assignment_dict(assignment) -> dict:
+    return {'course': assignment.course.course_code, 'title': assignment.title,
+            'due_date': assignment.due_date.isoformat()}
+
+
+class CommandError(Exception):
+    """A request that cannot be served; the message is sent back to the client."""
+
+
+class Session:
+    """
+    One connected user. The commands mirror the options of the student and instructor
+    menus, but take their arguments from the request line and return data instead of printing.
+    """
+
+    def __init__(self, platform_admin):
+        self.platform_admin = platform_admin
+        self.user = None
+
+    @property
+    def role(self) -> Optional[str]:
+        return self.user.role if self.user else None
+
+    def login(self, role: str, name: str):
+        """LOGIN student|instructor|<name>"""
+        if role.lower() == 'student':
+            user = self.platform_admin.find_student_by_name(name)
+        elif role.lower() == 'instructor':
+            user = self.platform_admin.find_instructor_by_name(name)
+        else:
+            raise CommandError("Role must be 'student' or 'instructor'.")
+        if not user:
+            raise CommandError(f"{role.capitalize()} not found.")
+        self.user = user
+        return {'name': user.name, 'role': user.role}
+
+    # Student commands
+
+    def grades(self):
+        """GRADES"""
+        result = []
+        for course in self.platform_admin.enrollments.get_courses_by_student(self.user):
+            for assignment in list(course.assignments):
+                score = course.gradebook.get(self.user.student_id, assignment.title)
+                if score is not None:
+                    result.append({'course': course.course_name, 'assignment': assignment.title, 'grade': score})
+        return result
+
+    def submit(self, course_name: str, assignment_title: str, content: str):
+        """SUBMIT <course name>|<assignment title>|<content>"""
+        course = next((c for c in self.user.enrolled_courses if c.course_name == course_name), None)
+        if not course:
+            raise CommandError("You are not enrolled in this course.")
+        if course.get_assignment(assignment_title) is None:
+            raise CommandError("Assignment not found in this course.")
+        return f"Assignment '{assignment_title}' submitted successfully for course '{course_name}'."
+
+    def enroll(self, course_name: str):
+        """ENROLL <course name>"""
+        course = next((c for c in self.platform_admin.courses if c.course_name == course_name), None)
+        if not course:
+            raise CommandError("Course not found.")
+        if course in self.user.enrolled_courses:
+            raise CommandError(f"You are already enrolled in {course_name}.")
+        if not self.platform_admin.enrollments.enroll_student(self.user, course):
+            raise CommandError(f"Could not enroll in {course_name}.")  # The reason is in the domain messages
+        return f"Enrolled in {course_name} successfully!"
+
+    def gpa(self):
+        """GPA (open-term and cumulative, unit-weighted)"""
+        return self.platform_admin.gpa_summary(self.user)
+
+    def _courses(self):
+        """The student's enrolled courses or the instructor's taught courses."""
+        if isinstance(self.user, Student):
+            return list(self.user.enrolled_courses)
+        return self.platform_admin.registry.get_courses_by_instructor(self.user.instructor_id)
+
+    def courses(self):
+        """COURSES"""
+        return [{'code': c.course_code, 'name': c.course_name, 'instructor': c.instructor.name} for c in self._courses()]
+
+    # Commands open to both roles
+
+    def schedules(self):
+        """SCHEDULES"""
+        return [c.schedule.display_schedule() if c.schedule else f"Course: {c.course_name} has no schedule assigned."
+                for c in self.platform_admin.courses]
+
+    def timetable(self):
+        """TIMETABLE"""
+        if isinstance(self.user, Student):
+            entries = self.platform_admin.student_timetable(self.user)
+        else:
+            entries = self.platform_admin.instructor_timetable(self.user)
+        return format_timetable(entries)
+
+    def threads(self):
+        """THREADS (post counts and last activity, without the posts)"""
+        return [{'course': course.course_name, 'title': thread.title,
+                 'creator': thread.creator.name if thread.creator else None,
+                 'posts': thread.post_count, 'last_activity': thread.last_activity}
+                for course in self._courses() for thread in list(course.discussion_threads)]
+
+    def _thread(self, course_name: str, thread_title: str):
+        course = next((c for c in self._courses() if c.course_name.strip().lower() == course_name.strip().lower()), None)
+        if not course:
+            raise CommandError("Course not found.")
+        thread = next((t for t in course.discussion_threads
+                       if t.title.strip().lower() == thread_title.strip().lower()), None)
+        if not thread:
+            raise CommandError("Discussion thread not found.")
+        return thread
+
+    def posts(self, course_name: str, thread_title: str, before: str = '', after: str = '', limit: str = '20'):
+        """POSTS <course name>|<thread title>[|<before post id>|<after post id>|<limit>] (latest page by default)"""
+        thread = self._thread(course_name, thread_title)
+        if before:
+            posts = thread.before(int(before), int(limit))
+        elif after:
+            posts = thread.after(int(after), int(limit))
+        else:
+            posts = thread.latest(int(limit))
+        return {'count': thread.post_count, 'posts': posts}
+
+    def post(self, course_name: str, thread_title: str, message: str):
+        """POST <course name>|<thread title>|<message>"""
+        thread = self._thread(course_name, thread_title)
+        if not message.strip():
+            raise CommandError("Cannot post an empty message.")
+        thread.add_post(self.user, message)
+        return "Post added successfully!"
+
+    def announcements(self, cursor: str = '', limit: str = '20'):
+        """ANNOUNCEMENTS [<cursor>|<limit>] (newest first; pass back next_cursor for older ones)"""
+        page, next_cursor = self.platform_admin.announcements.page(self.user.role, int(limit), cursor or None)
+        return {'announcements': [_announcement_dict(a) for a in page], 'next_cursor': next_cursor}
+
+    def new_announcements(self):
+        """NEW (announcements posted since this user last asked)"""
+        return [_announcement_dict(a) for a in self.platform_admin.announcements.unseen(self.user)]
+
+    def due(self, days: str = '7'):
+        """DUE [<days>] (overdue assignments and those due in the next <days> days)"""
+        overdue, upcoming = self.platform_admin.assignments_due(self.user, int(days))
+        return {'overdue': [_assignment_dict(a) for a in overdue], 'upcoming': [_assignment_dict(a) for a in upcoming]}
+
+    def search(self, query: str, course_code: str = '', limit: str = '10'):
+        """SEARCH <query>[|<course code>|<limit>] (ranked matches in the user's courses and announcements)"""
+        codes = [c.course_code for c in self._courses()]
+        if course_code:
+            if course_code not in codes:
+                raise CommandError("Course not found.")
+            codes = [course_code]
+        return self.platform_admin.search(query, codes, self.user.role, int(limit))
+
+    # Instructor commands
+
+    def _taught_course(self, course_code: str):
+        course = self.platform_admin.registry.get_course(course_code)
+        if not course or course.instructor != self.user:
+            raise CommandError(f"Course with code {course_code} not found.")
+        return course
+
+    def assign(self, course_code: str, title: str, description: str, due_date: str):
+        """ASSIGN <course code>|<title>|<description>|<due date>"""
+        course = self._taught_course(course_code)
+        count = len(course.assignments)
+        course.assign_assignment(title, description, due_date)
+        if len(course.assignments) == count:
+            raise CommandError("Assignment was not created.")
+        return f"Assignment '{title}' added to course '{course.course_name}'."
+
+    def grade(self, course_code: str, student_id: str, assignment_title: str, score: str, feedback: str = ''):
+        """GRADE <course code>|<student id>|<assignment title>|<score>|<feedback>"""
+        course = self._taught_course(course_code)
+        student = next((s for s in list(course.enrolled_students) if s.student_id == student_id), None)
+        if not student:
+            raise CommandError(f"Student with ID {student_id} is not enrolled in this course.")
+        assignment = course.get_assignment(assignment_title)
+        if not assignment:
+            raise CommandError("Assignment not found. Please check the title and try again.")
+        try:
+            course.enter_grade(student, assignment, float(score), feedback)
+        except ValueError:
+            raise CommandError("Invalid score. Please enter a number between 0 and 100.")
+        return f"Grade for student '{student.name}' added to assignment '{assignment.title}'."
+
+    def students(self):
+        """STUDENTS"""
+        return [{'course': c.course_code, 'students': [{'name': s.name, 'id': s.student_id}
+                                                       for s in list(c.enrolled_students)]}
+                for c in self.platform_admin.registry.get_courses_by_instructor(self.user.instructor_id)]
+
+    def new_thread(self, course_code: str, title: str):
+        """THREAD <course code>|<title>"""
+        course = self._taught_course(course_code)
+        if any(t.title == title for t in course.discussion_threads):
+            raise CommandError(f"A thread titled '{title}' already exists.")
+        self.platform_admin.create_thread(course, title, self.user)
+        return f"Thread '{title}' created in {course.course_name}."
+
+    def announce(self, title: str, content: str, date: str, recipient_groups: str):
+        """ANNOUNCE <title>|<content>|<date>|<group>,<group>,..."""
+        groups = [g.strip() for g in recipient_groups.split(',') if g.strip()]
+        self.platform_admin.post_announcement(title, content, date, groups)
+        return "Announcement created."
+
+
+# Command name -> (Session method, role allowed to call it; None for any logged-in user)
+COMMANDS = {
+    'GRADES': ('grades', 'Student'),
+    'SUBMIT': ('submit', 'Student'),
+    'ENROLL': ('enroll', 'Student'),
+    'GPA': ('gpa', 'Student'),
+    'COURSES': ('courses', None),
+    'SCHEDULES': ('schedules', None),
+    'TIMETABLE': ('timetable', None),
+    'THREADS': ('threads', None),
+    'POSTS': ('posts', None),
+    'POST': ('post', None),
+    'ANNOUNCEMENTS': ('announcements', None),
+    'NEW': ('new_announcements', None),
+    'SEARCH': ('search', None),
+    'DUE': ('due', None),
+    'ASSIGN': ('assign', 'Instructor'),
+    'GRADE': ('grade', 'Instructor'),
+    'STUDENTS': ('students', 'Instructor'),
+    'THREAD': ('new_thread', 'Instructor'),
+    'ANNOUNCE': ('announce', 'Instructor'),
+}
+
+
+class ELearningServer:
+    """
+    asyncio front end serving many sessions against one in-memory PlatformAdmin.
+
+    Line protocol: each request is one line, `COMMAND arg1|arg2|...`, and each response
+    is one line of JSON: {"ok": true, "result": ..., "messages": [...]} or {"ok": false, "error": "..."}.
+    Besides the menu commands there are LOGIN, HELP, STATS and QUIT.
+    """
+
+    def __init__(self, platform_admin, host: str = HOST, port: int = PORT, save_on_exit: bool = True):
+        self.platform_admin = platform_admin
+        self.host = host
+        self.port = port
+        self.save_on_exit = save_on_exit
+        self.stats = LatencyStats()
+        self.sessions = 0  # Currently connected clients
+        self._server = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, backlog=4096)
+        self.port = self._server.sockets[0].getsockname()[1]  # Resolves port 0 to the one picked
+        print(f"Serving the E-Learning Environment on {self.host}:{self.port}")
+
+    async def serve_forever(self) -> None:
+        if not self._server:
+            await self.start()
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            self.close()
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        self.close()
+
+    def close(self) -> None:
+        if self.save_on_exit:
+            self.platform_admin.save_data()
+            self.save_on_exit = False
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        session = Session(self.platform_admin)
+        self.sessions += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                start = time.perf_counter()
+                # Domain calls block (locks, journal and storage I/O), so they run on a worker thread
+                op, response = await asyncio.to_thread(
+                    self.dispatch, session, line.decode('utf-8', errors='replace').strip())
+                writer.write(json.dumps(response, default=str).encode('utf-8') + b'\n')
+                await writer.drain()
+                self.stats.record(op, time.perf_counter() - start, response['ok'])
+                if op == 'QUIT':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    def dispatch(self, session: Session, line: str):
+        """
+        Run one request line against the session. The domain messages emitted while it runs are
+        collected by a sink scoped to this call, so concurrent requests and the process-wide sink
+        never see each other's messages.
+        :return: (command name, response dict)
+        """
+        with events.scoped_sink(events.MemorySink(level=events.INFO)) as messages:
+            command, response = self._dispatch(session, line)
+        if messages.messages:
+            response['messages'] = [message for _, message in messages.messages]
+        return command, response
+
+    def _dispatch(self, session: Session, line: str):
+        command, _, rest = line.partition(' ')
+        command = command.upper()
+        args = rest.split('|') if rest else []
+        try:
+            if command == 'LOGIN':
+                result = self._call(session.login, command, args)
+            elif command == 'HELP':
+                result = {name: getattr(Session, method).__doc__ for name, (method, _) in COMMANDS.items()}
+            elif command == 'STATS':
+                result = {'sessions': self.sessions, 'latency': self.stats.summary()}
+            elif command == 'QUIT':
+                result = "Goodbye!"
+            elif command in COMMANDS:
+                method, role = COMMANDS[command]
+                if not session.user:
+                    raise CommandError("Please LOGIN first.")
+                if role and session.role != role:
+                    raise CommandError(f"{command} is only available to {role.lower()}s.")
+                result = self._call(getattr(session, method), command, args)
+            else:
+                command = 'UNKNOWN'
+                raise CommandError("Unknown command. Send HELP for the list of commands.")
+            response = {'ok': True, 'result': result}
+        except CommandError as e:
+            response = {'ok': False, 'error': str(e)}
+        except Exception as e:
+            response = {'ok': False, 'error': f"An unexpected error occurred: {e}"}
+        return command, response
+
+    @staticmethod
+    def _call(handler, command: str, args: List[str]):
+        try:
+            inspect.signature(handler).bind(*args)
+        except TypeError:
+            raise CommandError(f"Wrong number of arguments for {command}: {handler.__doc__}")
+        return handler(*args)
+
+
+def run(platform_admin, host: str = HOST, port: int = PORT) -> None:
+    """Serve `platform_admin` until interrupted, then save and print the latency table."""
+    server = ELearningServer(platform_admin, host, port)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        server.close()
+    print("Server stopped.")
+    server.stats.display()
+
+
+if __name__ == "__main__":
+    from data_store import DataStore
+    run(DataStore.shared('data.json').get(), port=int(sys.argv[1]) if len(sys.argv) > 1 else PORT)
@@ -0,0 +1,325 @@
+import json
+import sqlite3
+import threading
+from typing import List, Optional
+import student
+from announcement_store import date_key
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS instructors (
+    instructor_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT,
+    contact_number TEXT,
+    address TEXT,
+    role TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_instructors_name ON instructors (name);
+
+CREATE TABLE IF NOT EXISTS students (
+    student_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT,
+    contact_number TEXT,
+    address TEXT,
+    year_level TEXT,
+    program TEXT,
+    gpa REAL,
+    birth_date TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_students_name ON students (name);
+
+CREATE TABLE IF NOT EXISTS courses (
+    course_code TEXT PRIMARY KEY,
+    course_name TEXT NOT NULL,
+    instructor_id TEXT NOT NULL,
+    units INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_courses_instructor ON courses (instructor_id);
+
+CREATE TABLE IF NOT EXISTS enrollments (
+    student_id TEXT NOT NULL,
+    course_code TEXT NOT NULL,
+    PRIMARY KEY (student_id, course_code)
+);
+CREATE INDEX IF NOT EXISTS idx_enrollments_course ON enrollments (course_code);
+
+CREATE TABLE IF NOT EXISTS schedules (
+    course_code TEXT PRIMARY KEY,
+    day TEXT,
+    time TEXT
+);
+
+CREATE TABLE IF NOT EXISTS assignments (
+    course_code TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    due_date TEXT,
+    PRIMARY KEY (course_code, title)
+);
+
+CREATE TABLE IF NOT EXISTS grades (
+    course_code TEXT NOT NULL,
+    student_id TEXT NOT NULL,
+    assignment_title TEXT NOT NULL,
+    score REAL,
+    feedback TEXT,
+    PRIMARY KEY (course_code, student_id, assignment_title)
+);
+CREATE INDEX IF NOT EXISTS idx_grades_student ON grades (student_id);
+
+CREATE TABLE IF NOT EXISTS announcements (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT,
+    content TEXT,
+    date TEXT,
+    recipient_groups TEXT
+);
+
+CREATE TABLE IF NOT EXISTS admins (
+    email TEXT PRIMARY KEY,
+    password TEXT
+);
+"""
+
+
+class SqliteStorage:
+    """
+    SQLite storage backend for PlatformAdmin.
+    The course catalogue (instructors, courses, schedules, assignments) is loaded up front;
+    students, course rosters and grades are hydrated on first lookup. Every journaled
+    mutation is written in its own transaction, so there is nothing left to rewrite on exit.
+    The connection is shared by every session thread; a lock serializes its use, so writes and
+    the hydration of a student never interleave.
+    """
+
+    lazy = True
+
+    def __init__(self, filename: str = 'data.db'):
+        self.filename = filename
+        self.conn = sqlite3.connect(filename, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.RLock()
+        self._admin = None
+        self._rosters_loaded = set()  # course_codes whose full roster and grades are in memory
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM courses LIMIT 1").fetchone() is None
+
+    def import_data(self, data: dict) -> None:
+        """Populate the database from a data.json-style dict (see PlatformAdmin.snapshot_data)."""
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO instructors VALUES (:instructor_id, :name, :email, :contact_number, :address, :role)",
+                [dict(i, role=i.get('role', 'Instructor')) for i in data.get('instructors', [])]
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO students VALUES (:student_id, :name, :email, :contact_number, :address, "
+                ":year_level, :program, :gpa, :birth_date)",
+                [dict(s, gpa=s.get('gpa', 0.0), birth_date=s.get('birth_date')) for s in data.get('students', [])]
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO courses VALUES (:course_code, :course_name, :instructor_id, :units)",
+                data.get('courses', [])
+            )
+            enrollments = [(e['student_id'], e['course_code']) for e in data.get('enrollments', [])]
+            enrollments += [
+                (s['student_id'], c['course_code'])
+                for s in data.get('students', []) for c in s.get('enrolled_courses', [])
+            ]
+            self.conn.executemany("INSERT OR IGNORE INTO enrollments VALUES (?, ?)", enrollments)
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO schedules VALUES (:course_code, :day, :time)",
+                data.get('schedules', [])
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO assignments VALUES (:course_code, :title, :description, :due_date)",
+                data.get('assignments', [])
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO grades VALUES (:course_code, :student_id, :assignment_title, :score, :feedback)",
+                [dict(g, feedback=g.get('feedback')) for g in data.get('grades', [])]
+            )
+            self.conn.executemany(
+                "INSERT INTO announcements (id, title, content, date, recipient_groups) VALUES (?, ?, ?, ?, ?)",
+                [(a.get('announcement_id'), a['title'], a['content'], date_key(a['date']),
+                  json.dumps(a.get('recipient_groups', []))) for a in data.get('announcements', [])]
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO admins VALUES (:email, :password)", data.get('admins', [])
+            )
+
+    def load(self, admin) -> None:
+        """Load the catalogue into `admin` and hook up lazy student hydration."""
+        with self._lock:
+            self._admin = admin
+            self._rosters_loaded.clear()
+            admin._begin_load()
+            sections = (
+                ('instructors', "SELECT * FROM instructors"),
+                ('courses', "SELECT * FROM courses"),
+                ('schedules', "SELECT * FROM schedules"),
+                ('assignments', "SELECT * FROM assignments"),
+                ('admins', "SELECT * FROM admins"),
+            )
+            for section, query in sections:
+                for row in self.conn.execute(query):
+                    admin._load_record(section, dict(row))
+            for row in self.conn.execute("SELECT id AS announcement_id, title, content, date, recipient_groups "
+                                         "FROM announcements ORDER BY id"):
+                record = dict(row)
+                record['recipient_groups'] = json.loads(record['recipient_groups'] or '[]')
+                admin._load_record('announcements', record)
+            admin._finish_load()
+            admin.registry.student_loader = self.load_student
+
+    def load_student(self, student_id: str) -> Optional['student.Student']:
+        """Hydrate one student with their enrollments and grades."""
+        with self._lock:
+            student_obj = self._admin.registry.students.get(student_id)  # Another session may have been first
+            if student_obj is not None:
+                return student_obj
+            row = self.conn.execute("SELECT * FROM students WHERE student_id = ?", (student_id,)).fetchone()
+            if row is None:
+                return None
+            student_obj = self._hydrate([row], self.conn.execute(
+                "SELECT student_id, course_code FROM enrollments WHERE student_id = ?", (student_id,)))[0]
+            self._load_grades("SELECT * FROM grades WHERE student_id = ?", (student_id,))
+            return student_obj
+
+    def _hydrate(self, rows, enrollments) -> List['student.Student']:
+        """
+        Build and register a student per row, then link the (student_id, course_code) enrollments
+        that belong to one of them.
+        """
+        hydrated = {}
+        for row in rows:
+            student_obj = hydrated[row['student_id']] = student.Student(
+                row['name'], row['email'], row['contact_number'], row['address'], row['student_id'],
+                row['year_level'], row['program'], gpa=row['gpa'] or 0.0, birth_date=row['birth_date']
+            )
+            self._admin.add_student(student_obj)
+        for student_id, course_code in enrollments:
+            student_obj = hydrated.get(student_id)
+            course_obj = self._admin.registry.get_course(course_code)
+            if student_obj and course_obj:
+                student_obj.enroll(course_obj)
+                self._admin.enrollments.add_existing(student_obj, course_obj)
+        return list(hydrated.values())
+
+    def find_student_by_name(self, name: str) -> Optional['student.Student']:
+        with self._lock:
+            row = self.conn.execute("SELECT student_id FROM students WHERE name = ? LIMIT 1", (name,)).fetchone()
+        return self._admin.registry.get_student(row['student_id']) if row else None
+
+    def user_directory(self):
+        """(email, name) pairs for every student and instructor, without hydrating anyone."""
+        with self._lock:
+            students = [tuple(row) for row in self.conn.execute("SELECT email, name FROM students")]
+            instructors = [tuple(row) for row in self.conn.execute("SELECT email, name FROM instructors")]
+        return students, instructors
+
+    def load_roster(self, course_obj) -> None:
+        """
+        Hydrate every student enrolled in a course, plus all of the course's grades. The roster's
+        students, their enrollments and their grades each come from one join, however big the course.
+        """
+        params = (course_obj.course_code,)
+        with self._lock:
+            if course_obj.course_code in self._rosters_loaded:
+                return
+            self._rosters_loaded.add(course_obj.course_code)
+            registry = self._admin.registry
+            rows = self.conn.execute(
+                "SELECT s.* FROM enrollments e JOIN students s ON s.student_id = e.student_id "
+                "WHERE e.course_code = ?", params).fetchall()
+            if any(row['student_id'] not in registry.students for row in rows):
+                self._hydrate([row for row in rows if row['student_id'] not in registry.students], self.conn.execute(
+                    "SELECT other.student_id, other.course_code FROM enrollments e "
+                    "JOIN enrollments other ON other.student_id = e.student_id WHERE e.course_code = ?", params))
+                self._load_grades("SELECT g.* FROM enrollments e JOIN grades g ON g.student_id = e.student_id "
+                                  "WHERE e.course_code = ?", params)
+            for row in rows:
+                student_obj = registry.students[row['student_id']]
+                if student_obj not in course_obj.enrolled_students:
+                    course_obj.enrolled_students.append(student_obj)
+            self._load_grades("SELECT * FROM grades WHERE course_code = ?", params)
+
+    def hydrate_all(self, admin) -> None:
+        """Hydrate every student and course roster, for admin reports and batch jobs."""
+        for course_obj in admin.courses:
+            self.load_roster(course_obj)
+        with self._lock:
+            student_ids = [student_id for (student_id,) in self.conn.execute("SELECT student_id FROM students")]
+        for student_id in student_ids:  # Only students enrolled nowhere are still missing
+            admin.registry.get_student(student_id)
+
+    def _load_grades(self, query: str, params: tuple) -> None:
+        for row in self.conn.execute(query, params).fetchall():
+            course_obj = self._admin.registry.get_course(row['course_code'])
+            if course_obj and (row['student_id'], row['assignment_title']) not in course_obj.grades:
+                self._admin._load_grade(dict(row))
+
+    def append(self, op: str, fields: dict) -> None:
+        """Write one mutation record in its own transaction (same interface as journal.Journal)."""
+        with self._lock, self.conn:
+            if op == 'enroll':
+                self.conn.execute("INSERT OR IGNORE INTO enrollments VALUES (:student_id, :course_code)", fields)
+            elif op == 'unenroll':
+                self.conn.execute(
+                    "DELETE FROM enrollments WHERE student_id = :student_id AND course_code = :course_code", fields
+                )
+            elif op == 'enroll_many':
+                self.conn.executemany("INSERT OR IGNORE INTO enrollments VALUES (?, ?)", fields['pairs'])
+            elif op == 'assignment':
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO assignments VALUES (:course_code, :title, :description, :due_date)", fields
+                )
+            elif op == 'grade':
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO grades VALUES (:course_code, :student_id, :assignment_title, :score, :feedback)",
+                    fields
+                )
+            elif op == 'expire_announcements':
+                self.conn.execute("DELETE FROM announcements WHERE date < ?", (date_key(fields['before']),))
+            elif op == 'schedule':
+                self.conn.execute("INSERT OR REPLACE INTO schedules VALUES (:course_code, :day, :time)", fields)
+            elif op == 'announcement':
+                self.conn.execute(
+                    "INSERT INTO announcements (id, title, content, date, recipient_groups) VALUES (?, ?, ?, ?, ?)",
+                    (fields['announcement_id'], fields['title'], fields['content'], date_key(fields['date']),
+                     json.dumps(fields['recipient_groups']))
+                )
+            elif op == 'announcement_groups':
+                self.conn.execute("UPDATE announcements SET recipient_groups = ? WHERE id = ?",
+                                  (json.dumps(fields['recipient_groups']), fields['announcement_id']))
+
+    def save(self, admin) -> None:
+        """Upsert the hydrated entities (new students, GPA changes...) in one transaction."""
+        data = {
+            'students': [s.to_dict() for s in admin.students],
+            'instructors': [i.to_dict() for i in admin.instructors],
+            'courses': [c.to_dict() for c in admin.courses],
+            'admins': admin.admins,
+        }
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO instructors VALUES (:instructor_id, :name, :email, :contact_number, :address, :role)",
+                data['instructors']
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO students VALUES (:student_id, :name, :email, :contact_number, :address, "
+                ":year_level, :program, :gpa, :birth_date)",
+                data['students']
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO courses VALUES (:course_code, :course_name, :instructor_id, :units)",
+                data['courses']
+            )
+            self.conn.executemany("INSERT OR REPLACE INTO admins VALUES (:email, :password)", data['admins'])
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
@@ -1,6 +1,8 @@
 from person import Person
 
 class Student(Person):
+    __slots__ = ('__student_id', '__year_level', '__program', '__gpa', '__birth_date', 'role', '__enrolled_courses')
+
     def __init__(self, name, email, contact_number, address, student_id, year_level, program, gpa=0.0, birth_date=None, enrolled_courses=None, role="Student"):
         super().__init__(name, email, contact_number, address)
         self.__student_id = student_id
@@ -10,7 +12,6 @@ class Student(Person):
         self.__birth_date = birth_date
         self.role = role
         self.__enrolled_courses = enrolled_courses if enrolled_courses is not None else []
-        self.course = []
 
     def to_dict(self):
         """Convert the Student object to a dictionary."""
@@ -32,7 +33,7 @@ class Student(Person):
         """
         Create a Student object from a dictionary.
         :param data: A dictionary containing student details.
-        :param all_courses: A list of Course objects to map enrolled courses.
+        :param all_courses: A dict of Course objects keyed by course_code (or a list of them).
         :return: A Student object.
         """
         student = cls(
@@ -46,9 +47,11 @@ class Student(Person):
             gpa=data.get('gpa', 0.0),
             birth_date=data.get('birth_date')
         )
+        if not isinstance(all_courses, dict):
+            all_courses = {c.course_code: c for c in all_courses}
         # Map enrolled_courses to actual Course objects
         for course_data in data.get('enrolled_courses', []):
-            course = next((c for c in all_courses if c.course_code == course_data['course_code']), None)
+            course = all_courses.get(course_data['course_code'])
             if course:
                 student.enroll(course)
 
@@ -97,6 +100,14 @@ class Student(Person):
         if course not in self.__enrolled_courses:  # Avoid duplicates
             self.__enrolled_courses.append(course)
 
+    def unenroll(self, course):
+        """
+        Remove a course from the student's enrolled courses.
+        :param course: A Course object to drop.
+        """
+        if course in self.__enrolled_courses:
+            self.__enrolled_courses.remove(course)
+
     def display_info(self):
         """
         Display basic student information.
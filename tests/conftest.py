@@ -0,0 +1,48 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import datagen  # noqa: E402
+import events  # noqa: E402
+import journal  # noqa: E402
+import search_index  # noqa: E402
+from platform_admin import PlatformAdmin  # noqa: E402
+from roundtrip import canonical, mutate  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    """Keep the platform's info and warning messages out of the test output."""
+    with events.use_sink(events.NullSink()):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def isolated():
+    """Switch off the journal and search hooks a test's platform left active."""
+    yield
+    journal.activate(None)
+    search_index.activate(None)
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    """A small generated data.json in a temporary directory; sidecar files are written next to it."""
+    filename = str(tmp_path / 'data.json')
+    datagen.generate(filename, 200, n_announcements=10)
+    return filename
+
+
+@pytest.fixture
+def expected(data_file):
+    """What every backend should hold after mutate(), by new_student: the same changes made in eager mode."""
+    results = {}
+    for new_student in (True, False):
+        admin = PlatformAdmin()
+        admin.load_data(data_file)
+        mutate(admin, new_student)
+        results[new_student] = canonical(admin)
+    return results
@@ -0,0 +1,36 @@
+"""Helpers shared by the storage backend round-trip tests."""
+import json
+
+from datagen import Generator
+from student import Student
+
+
+def canonical(admin):
+    """The admin's data in a comparable form: record order and the journal position are ignored."""
+    admin.hydrate()
+    data = admin.snapshot_data()
+    data.pop('journal_seq')
+    for record in data['students']:
+        record['enrolled_courses'] = sorted(course['course_code'] for course in record['enrolled_courses'])
+    return {section: sorted(json.dumps(record, sort_keys=True) for record in records)
+            for section, records in data.items()}
+
+
+def mutate(admin, new_student=True):
+    """Journaled changes of every kind, plus (unless journaling is what is tested) a new student."""
+    admin.enrollments.on_conflict = 'flag'
+    student = admin.registry.get_student(Generator.student_id(0))
+    dropped = min(student.enrolled_courses, key=lambda c: c.course_code)
+    admin.enrollments.unenroll_student(student, dropped)
+    course = next(admin.registry.get_course(Generator.course_code(i)) for i in range(100)
+                  if admin.registry.get_course(Generator.course_code(i)) not in student.enrolled_courses + [dropped])
+    assert admin.enrollments.enroll_student(student, course)
+    course.assign_assignment('Project', 'Final project', '2031-01-15T23:59:00')
+    course.enter_grade(student, course.get_assignment('Project'), 88.5, 'Good work')
+    admin.set_schedule(course, 'Friday', '09:00 AM - 11:00 AM')
+    admin.post_announcement('Exam rooms', 'Rooms are listed online.', '2025-04-01', ['Student'])
+    admin.expire_announcements('2025-01-15')
+    if new_student:
+        newcomer = Student('Nia Okafor', 'nia@example.com', '5550001111', 'Campus', 'S9999999', 'Freshman', 'Physics')
+        admin.add_student(newcomer)
+        assert admin.enrollments.enroll_student(newcomer, course)
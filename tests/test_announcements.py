@@ -0,0 +1,86 @@
+from datetime import date, datetime
+
+from announcement import Announcement
+from announcement_store import AnnouncementStore, date_key
+from platform_admin import PlatformAdmin
+
+
+def make_store(n):
+    store = AnnouncementStore()
+    for i in range(n):
+        store.append(Announcement(f"Notice {i}", "content", date(2025, 1, 1 + i), ['Student'] if i % 2 else ['Instructor']))
+    return store
+
+
+def test_pages_walk_a_group_newest_first():
+    store = make_store(20)
+    titles, cursor = [], None
+    while True:
+        page, cursor = store.page('Student', limit=3, cursor=cursor)
+        titles.extend(a.title for a in page)
+        if cursor is None:
+            break
+    assert titles == [f"Notice {i}" for i in range(19, 0, -2)]
+    assert titles == [a.title for a in store.for_group('Student')]
+
+
+def test_expire_drops_announcements_before_the_cut_off():
+    store = make_store(10)
+    assert store.expire('2025-01-04') == 3
+    assert [a.title for a in store][0] == 'Notice 3'
+    assert store.expire(date(2025, 1, 4)) == 0
+    assert [a.title for a in store.for_group('Instructor')] == ['Notice 8', 'Notice 6', 'Notice 4']
+
+
+def test_date_key_is_the_same_for_objects_and_their_saved_strings():
+    moment = datetime(2025, 3, 1, 12, 30)
+    assert date_key(moment) == date_key(str(moment)) == date_key(moment.isoformat()) == '2025-03-01T12:30:00'
+    assert date_key(date(2025, 3, 1)) == date_key('2025-03-01') == '2025-03-01'
+
+
+def open_journal(filename):
+    admin = PlatformAdmin()
+    admin.open_journal(filename, commit_interval=0.01, compact_after=10 ** 9)
+    return admin
+
+
+def test_datetime_announcements_keep_their_order_and_expiry_after_a_reload(data_file):
+    admin = open_journal(data_file)
+    admin.post_announcement('Morning', 'Coffee at nine.', datetime(2031, 1, 1, 9, 0), ['Student'])
+    admin.post_announcement('Noon', 'Lunch at twelve.', datetime(2031, 1, 1, 12, 0), ['Student'])
+    admin.post_announcement('Evening', 'Film at eight.', '2031-01-01 20:00:00', ['Student'])
+    admin.expire_announcements(datetime(2031, 1, 1, 10, 0))
+    expected = [a.title for a in admin.announcements.for_group('Student')]
+    assert expected[:2] == ['Evening', 'Noon'] and 'Morning' not in expected
+    admin.close_journal()
+
+    replayed = open_journal(data_file)
+    try:
+        assert [a.title for a in replayed.announcements.for_group('Student')] == expected
+        replayed.compact(background=False)  # Folds the journal into data.json
+    finally:
+        replayed.close_journal()
+
+    reloaded = PlatformAdmin()
+    reloaded.load_data(data_file)
+    assert [a.title for a in reloaded.announcements.for_group('Student')] == expected
+    assert reloaded.announcements.expire('2031-01-01T12:00:00') == len(reloaded.announcements) - 2
+
+
+def test_recipient_group_changes_are_journaled(data_file):
+    admin = open_journal(data_file)
+    posted = admin.post_announcement('Lab safety', 'Goggles on.', '2031-02-01', ['Student'])
+    posted.add_recipient_group('Instructor')
+    posted.remove_recipient_group('Student')
+    admin.close_journal()
+
+    replayed = open_journal(data_file)
+    try:
+        announcement = replayed.announcements.get(posted.announcement_id)
+        assert announcement.recipient_groups == ['Instructor']
+        assert announcement in replayed.announcements.for_group('Instructor')
+        assert announcement not in replayed.announcements.for_group('Student')
+        assert [r['title'] for r in replayed.search('goggles', role='Instructor')] == ['Lab safety']
+        assert replayed.search('goggles', role='Student') == []
+    finally:
+        replayed.close_journal()
@@ -0,0 +1,5 @@
+import benchmarks
+
+
+def test_concurrent_mutations_keep_invariants():
+    assert benchmarks.stress_concurrency(workers=16, operations=5000, n_students=200, n_courses=10) == []
@@ -0,0 +1,44 @@
+import json
+import os
+
+from data_store import DataStore
+from platform_admin import PlatformAdmin
+
+
+def rewrite(filename):
+    """Change the file on disk behind the store's back (and make sure its signature moves)."""
+    with open(filename) as f:
+        data = json.load(f)
+    data['admins'].append({'email': 'new@example.com', 'password': 'secret'})
+    with open(filename, 'w') as f:
+        json.dump(data, f)
+    stat = os.stat(filename)
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def test_own_saves_do_not_reload_but_outside_changes_do(data_file):
+    store = DataStore(data_file)
+    admin = store.get()
+    assert store.get() is admin
+
+    admin.post_announcement('Saved', 'Written by this process.', '2031-01-01', ['Student'])
+    admin.save_data(data_file)
+    assert store.get() is admin
+
+    rewrite(data_file)
+    reloaded = store.get()
+    assert reloaded is not admin
+    assert 'new@example.com' in [a['email'] for a in reloaded.admins]
+
+
+def test_adopted_journal_platform_survives_compaction(data_file):
+    admin = PlatformAdmin()
+    admin.open_journal(data_file, commit_interval=0.01, compact_after=10 ** 9)
+    try:
+        store = DataStore(data_file)
+        store.adopt(admin)
+        admin.post_announcement('Live', 'Only in memory and the journal.', '2031-01-01', ['Student'])
+        admin.compact(background=False)  # Rewrites data.json
+        assert store.get() is admin
+    finally:
+        admin.close_journal()
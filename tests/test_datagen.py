@@ -0,0 +1,41 @@
+import json
+
+import datagen
+from platform_admin import PlatformAdmin
+
+
+def read(filename):
+    with open(filename, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_same_seed_same_file(tmp_path):
+    first, second, other = (str(tmp_path / name) for name in ('a.json', 'b.json', 'c.json'))
+    counts = datagen.generate(first, 300)
+    datagen.generate(second, 300)
+    datagen.generate(other, 300, seed=7)
+    with open(first) as a, open(second) as b, open(other) as c:
+        text = a.read()
+        assert text == b.read()
+        assert text != c.read()
+    data = read(first)
+    assert counts == {section: len(data[section]) for section in datagen.Generator.SECTIONS}
+    assert counts['students'] == 300
+
+
+def test_generated_data_is_consistent(tmp_path):
+    filename = str(tmp_path / 'data.json')
+    datagen.generate(filename, 150, n_announcements=5)
+    data = read(filename)
+    enrolled = {(e['student_id'], e['course_code']) for e in data['enrollments']}
+    assignments = {(a['course_code'], a['title']) for a in data['assignments']}
+    for g in data['grades']:
+        assert (g['student_id'], g['course_code']) in enrolled
+        assert (g['course_code'], g['assignment_title']) in assignments
+
+    admin = PlatformAdmin()
+    admin.load_data(filename)
+    assert len(admin.students) == 150
+    assert len(admin.enrollments) == len(enrolled)
+    assert sum(len(c.grades) for c in admin.courses) == len(data['grades'])
+    assert len(admin.announcements) == 5
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+from assignment import Assignment
+from course import Course
+from due_index import DueDateIndex
+from instructor import Instructor
+from platform_admin import PlatformAdmin
+from student import Student
+
+NOW = datetime(2031, 3, 1, 12, 0)
+
+
+def make_courses(n=2):
+    instructor = Instructor("Dr. Lee", "lee@example.com", "0000000000", "Campus", "I1")
+    return [Course(f"Course {i}", f"C{i}", instructor, 3) for i in range(n)]
+
+
+def due(course, title, days):
+    return Assignment(title, '', NOW + timedelta(days=days), course)
+
+
+def titles(assignments):
+    return [a.title for a in assignments]
+
+
+def test_range_queries_are_sorted_by_due_date():
+    first, second = make_courses()
+    index = DueDateIndex()
+    for assignment in (due(first, 'late', 9), due(second, 'past', -3), due(first, 'soon', 1),
+                       due(second, 'next', 2), due(first, 'older', -10)):
+        index.add(assignment)
+
+    assert titles(index.overdue(NOW)) == ['older', 'past']
+    assert titles(index.upcoming(NOW)) == ['soon', 'next', 'late']
+    assert titles(index.upcoming(NOW, NOW + timedelta(days=5))) == ['soon', 'next']
+    assert titles(index.upcoming(NOW, course_codes=['C1'])) == ['next']
+    assert titles(index.between(NOW - timedelta(days=5), NOW + timedelta(days=5), ['C0', 'C1'], limit=2)) == [
+        'past', 'soon']
+    assert index.find('C0', 'soon', NOW + timedelta(days=1)).course is first
+    assert index.find('C0', 'soon', NOW) is None
+
+
+def test_removal_and_sweep():
+    first, second = make_courses()
+    index = DueDateIndex()
+    assignments = [due(first, 'a', -2), due(second, 'b', -1), due(first, 'c', 1), due(second, 'd', 3)]
+    for assignment in assignments:
+        index.add(assignment)
+
+    assert titles(index.sweep(NOW)) == ['a', 'b']
+    assert index.sweep(NOW) == []
+    assert titles(index.sweep(NOW + timedelta(days=2))) == ['c']
+
+    index.remove(assignments[3])
+    index.remove_course(first)
+    assert titles(index.between()) == ['b'] and len(index) == 1
+
+
+def test_assignments_due_follows_enrollments():
+    admin = PlatformAdmin()
+    first, second = make_courses()
+    admin.add_instructor(first.instructor)
+    for course in (first, second):
+        admin.add_course(course)
+    first.assign_assignment('Essay', '', (NOW + timedelta(days=2)).isoformat())
+    first.assign_assignment('Essay', '', (NOW + timedelta(days=2)).isoformat())  # Duplicate, refused
+    second.assign_assignment('Lab', '', (NOW - timedelta(days=1)).isoformat())
+    student = Student("Ada", "ada@example.com", "0000000000", "Campus", "S1", "Freshman", "Physics")
+    admin.add_student(student)
+    admin.enrollments.enroll_student(student, first)
+
+    overdue, upcoming = admin.assignments_due(student, days=7, now=NOW)
+    assert overdue == [] and titles(upcoming) == ['Essay']
+    admin.enrollments.enroll_student(student, second)
+    overdue, upcoming = admin.assignments_due(student, days=1, now=NOW)
+    assert titles(overdue) == ['Lab'] and upcoming == []
+    assert titles(admin.assignments_due(first.instructor, now=NOW)[1]) == ['Essay']
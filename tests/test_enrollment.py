@@ -0,0 +1,120 @@
+import os
+import shutil
+
+from course import Course
+from enrollment import Enrollment
+from instructor import Instructor
+from platform_admin import PlatformAdmin
+from student import Student
+
+SAMPLE_DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data.json')
+
+
+def make_students(n):
+    return [Student(f"Student {i}", f"s{i}@example.com", "0000000000", "Campus", f"S{i}", "Freshman", "Physics")
+            for i in range(n)]
+
+
+def test_roster_follows_enrollments():
+    course = Course("Mechanics", "PHY101", Instructor("Dr. Lee", "lee@example.com", "0000000000", "Campus", "I1"), 3)
+    students = make_students(5)
+    enrollment = Enrollment()
+    for student in students:
+        assert enrollment.enroll_student(student, course)
+    assert not enrollment.enroll_student(students[0], course)
+    enrollment.unenroll_student(students[2], course)
+
+    expected = [students[0], students[1], students[3], students[4]]
+    assert list(course.enrolled_students) == expected  # Enrollment order is kept
+    assert len(course.enrolled_students) == 4
+    assert students[2] not in course.enrolled_students
+    assert course not in students[2].enrolled_courses
+    assert enrollment.get_students_by_course(course) == expected
+
+
+def enrollment_views(admin):
+    """The enrolled (student, course) pairs as seen by the students, the course rosters and the index."""
+    by_student = {(s.student_id, c.course_code) for s in admin.students for c in s.enrolled_courses}
+    by_roster = {(s.student_id, c.course_code) for c in admin.courses for s in c.enrolled_students}
+    by_index = {(s.student_id, c.course_code) for s in admin.students
+                for c in admin.enrollments.get_courses_by_student(s)}
+    return by_student, by_roster, by_index
+
+
+def test_embedded_enrollments_are_indexed(tmp_path):
+    # The sample file lists most enrollments only under each student's enrolled_courses
+    filename = str(tmp_path / 'data.json')
+    shutil.copy(SAMPLE_DATA, filename)
+    admin = PlatformAdmin()
+    admin.load_data(filename)
+    by_student, by_roster, by_index = enrollment_views(admin)
+    assert len(by_student) == 25
+    assert by_student == by_roster == by_index
+    student = admin.registry.get_student('S001')
+    assert all(admin.enrollments.is_student_enrolled(student, c) for c in student.enrolled_courses)
+
+    admin.save_data(filename)
+    reloaded = PlatformAdmin()
+    reloaded.load_data(filename)
+    assert enrollment_views(reloaded) == (by_student, by_student, by_student)
+
+
+def make_platform():
+    admin = PlatformAdmin()
+    instructor = Instructor("Dr. Lee", "lee@example.com", "0000000000", "Campus", "I1")
+    admin.add_instructor(instructor)
+    for code, day, time in (("PHY101", "Mon/Wed", "09:00 AM - 10:30 AM"), ("PHY102", "Monday", "10:00 AM - 11:00 AM"),
+                            ("PHY103", "Friday", "01:00 PM - 02:00 PM")):
+        course = Course(f"Course {code}", code, instructor, 3)
+        admin.add_course(course)
+        admin.set_schedule(course, day, time)
+    for student in make_students(3):
+        admin.add_student(student)
+    return admin
+
+
+def test_bulk_enroll_validates_the_whole_batch():
+    admin = make_platform()
+    admin.enrollments.enroll_student(admin.registry.get_student("S0"), admin.registry.get_course("PHY103"))
+    result = admin.bulk_enroll([("S0", "PHY101"), ("S0", "PHY103"), ("S1", "PHY101"), ("S1", "PHY101"),
+                                ("S1", "PHY102"), ("S9", "PHY101"), ("S2", "MATH1")])
+
+    assert [(s.student_id, c.course_code) for s, c in result.enrolled] == [("S0", "PHY101"), ("S1", "PHY101")]
+    assert sorted((getattr(s, 'student_id', s), getattr(c, 'course_code', c), reason)
+                  for s, c, reason in result.rejected) == [
+        ("S0", "PHY103", "already enrolled"), ("S1", "PHY101", "duplicate in batch"),
+        ("S1", "PHY102", "schedule conflict with PHY101"), ("S2", "MATH1", "unknown course"),
+        ("S9", "PHY101", "unknown student")]
+    assert result.summary() == "2 enrolled, 5 rejected"
+    course = admin.registry.get_course("PHY101")
+    assert [s.student_id for s in course.enrolled_students] == ["S0", "S1"]
+    assert admin.enrollments.is_student_enrolled(admin.registry.get_student("S1"), course)
+
+
+def test_bulk_enroll_can_flag_conflicts_instead():
+    admin = make_platform()
+    admin.enrollments.on_conflict = 'flag'
+    result = admin.bulk_enroll([("S0", "PHY101"), ("S0", "PHY102")])
+    assert len(result.enrolled) == 2 and not result.rejected
+    assert [(s.student_id, c.course_code, reason) for s, c, reason in result.flagged] == [
+        ("S0", "PHY102", "schedule conflict with PHY101")]
+
+
+def test_bulk_enroll_is_replayed_from_the_journal(data_file):
+    admin = PlatformAdmin()
+    admin.open_journal(data_file, commit_interval=0.01, compact_after=10 ** 9)
+    admin.enrollments.on_conflict = 'flag'
+    pairs = [(s.student_id, c.course_code) for s in admin.students[:20] for c in admin.courses[:3]
+             if c not in s.enrolled_courses]
+    enrolled = {(s.student_id, c.course_code) for s, c in admin.bulk_enroll(pairs).enrolled}
+    admin.close_journal()
+    assert enrolled == set(pairs)
+
+    replayed = PlatformAdmin()
+    replayed.open_journal(data_file, commit_interval=0.01, compact_after=10 ** 9)
+    try:
+        for student_id, course_code in pairs:
+            assert replayed.enrollments.is_student_enrolled(replayed.registry.get_student(student_id),
+                                                            replayed.registry.get_course(course_code))
+    finally:
+        replayed.close_journal()
@@ -0,0 +1,41 @@
+from datetime import datetime
+
+import pytest
+
+from announcement import Announcement
+from assignment import Assignment
+from course import Course
+from grade import Grade
+from instructor import Instructor
+from schedule import Schedule
+from student import Student
+
+
+def make_entities():
+    instructor = Instructor("Dr. Lee", "lee@example.com", "0000000000", "Campus", "I1")
+    course = Course("Optics", "PHY201", instructor, 3)
+    student = Student("Ada", "ada@example.com", "0000000000", "Campus", "S1", "Freshman", "Physics", 3.5, "2005-04-01")
+    assignment = Assignment("Lab 1", "Measure a lens.", datetime(2031, 2, 1, 12, 0), course)
+    return [instructor, course, student, assignment, Grade(student, assignment, 90, "Good"),
+            Schedule(course, "Monday", "09:00 AM - 10:30 AM"),
+            Announcement("Welcome", "Classes start Monday.", "2031-01-01", ["Student"])]
+
+
+@pytest.mark.parametrize('entity', make_entities(), ids=lambda entity: type(entity).__name__)
+def test_entities_have_no_instance_dict(entity):
+    assert not hasattr(entity, '__dict__')
+    with pytest.raises(AttributeError):
+        entity.unexpected_attribute = 1
+
+
+def test_slotted_entities_keep_their_public_attributes():
+    instructor, course, student, assignment, grade, schedule, _ = make_entities()
+    assert (student.name, student.student_id, student.year_level, student.program, student.gpa) == (
+        "Ada", "S1", "Freshman", "Physics", 3.5)
+    assert (course.course_code, course.instructor, course.units, course.schedule) == ("PHY201", instructor, 3, None)
+    assert (assignment.title, assignment.course, grade.score, grade.feedback) == ("Lab 1", course, 90, "Good")
+    assert schedule.course is course
+
+    data = student.to_dict()
+    copy = Student.from_dict(data, {})
+    assert copy.to_dict() == data
@@ -0,0 +1,60 @@
+import threading
+
+import events
+
+
+def test_sinks_filter_by_level():
+    sink = events.MemorySink(level=events.WARNING)
+    with events.use_sink(sink):
+        events.info("ignored")
+        events.warning("kept")
+        events.error("also kept")
+    assert sink.messages == [(events.WARNING, "kept"), (events.ERROR, "also kept")]
+
+
+def test_use_sink_restores_the_previous_sink():
+    outer, inner = events.MemorySink(), events.MemorySink()
+    with events.use_sink(outer):
+        with events.use_sink(inner):
+            events.info("inner")
+        events.info("outer")
+    assert inner.messages == [(events.INFO, "inner")]
+    assert outer.messages == [(events.INFO, "outer")]
+
+
+def test_buffered_file_sink_writes_in_batches(tmp_path):
+    filename = str(tmp_path / 'events.log')
+    sink = events.BufferedFileSink(filename, batch_size=3)
+    for i in range(4):
+        sink.emit(events.INFO, f"message {i}")
+    with open(filename) as f:
+        assert [line.split(' ', 2)[2] for line in f] == ["message 0\n", "message 1\n", "message 2\n"]
+    sink.emit(events.DEBUG, "below the level")
+    sink.flush()
+    with open(filename) as f:
+        lines = f.readlines()
+    assert len(lines) == 4 and lines[-1].endswith("INFO message 3\n")
+
+
+def test_scoped_sinks_are_per_thread():
+    shared = events.MemorySink()
+    scoped = {}
+    barrier = threading.Barrier(2)
+
+    def worker(name):
+        with events.scoped_sink(events.MemorySink()) as sink:
+            barrier.wait()
+            events.info(name)
+            barrier.wait()
+        scoped[name] = sink.messages
+        events.info(f"{name} done")
+
+    with events.use_sink(shared):
+        threads = [threading.Thread(target=worker, args=(name,)) for name in ('a', 'b')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert events.get_sink() is shared
+    assert scoped == {'a': [(events.INFO, 'a')], 'b': [(events.INFO, 'b')]}
+    assert sorted(message for _, message in shared.messages) == ['a done', 'b done']
@@ -0,0 +1,64 @@
+import random
+
+from course import Course
+from gpa_engine import GpaEngine
+from instructor import Instructor
+from platform_admin import PlatformAdmin
+
+
+def grade_stream(seed=7, n_students=200, n_courses=6, assignments=5):
+    rng = random.Random(seed)
+    instructor = Instructor("Dr. Kim", "kim@example.com", "0000000000", "Campus", "I1")
+    courses = [Course(f"Course {c}", f"C{c}", instructor, rng.choice((1, 2, 3, 4))) for c in range(n_courses)]
+    grades = [(f"S{s}", course, f"A{a}", round(rng.uniform(55, 100), 1))
+              for s in range(n_students) for course in courses for a in range(assignments) if rng.random() < 0.8]
+    return courses, grades
+
+
+def run(courses, grades):
+    engine = GpaEngine()
+    for student_id, course, _, score in grades:
+        engine.record(student_id, course, score)
+    return engine
+
+
+def test_gpa_does_not_depend_on_grade_order():
+    courses, grades = grade_stream()
+    engine = run(courses, grades)
+    student_ids = {student_id for student_id, *_ in grades}
+    expected = {s: engine.cumulative_gpa(s) for s in student_ids}
+    for seed in range(5):
+        shuffled = list(grades)
+        random.Random(seed).shuffle(shuffled)
+        engine = run(courses, shuffled)
+        assert {s: engine.cumulative_gpa(s) for s in student_ids} == expected
+
+
+def test_score_changes_match_a_recompute():
+    courses, grades = grade_stream(seed=11)
+    for course in courses:
+        course.gradebook.listener = None
+    engine = GpaEngine()
+    rng = random.Random(3)
+    for student_id, course, title, score in grades:
+        course.gradebook.listener = engine.listener(course)
+        course.gradebook.add(student_id, title, score)
+        if rng.random() < 0.3:
+            course.gradebook.add(student_id, title, round(rng.uniform(40, 100), 1))
+    incremental = {s: engine.cumulative_gpa(s) for s, *_ in grades}
+    engine.recompute(courses)
+    assert {s: engine.cumulative_gpa(s) for s, *_ in grades} == incremental
+
+
+def test_json_and_binary_loads_agree(data_file):
+    from_json = PlatformAdmin()
+    from_json.load_data(data_file)
+    from_json.write_binary = True
+    from_json.save_data(data_file)
+
+    from_json = PlatformAdmin()
+    from_json.load_data(data_file, binary=False)
+    from_binary = PlatformAdmin()
+    from_binary.load_data(data_file, binary=True)
+    assert ({s.student_id: s.gpa for s in from_binary.students}
+            == {s.student_id: s.gpa for s in from_json.students})
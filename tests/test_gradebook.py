@@ -0,0 +1,48 @@
+import pytest
+
+from assignment import Assignment
+from course import Course
+from datetime import datetime
+from instructor import Instructor
+from student import Student
+
+
+def make_course():
+    course = Course("Optics", "PHY201", Instructor("Dr. Lee", "lee@example.com", "0000000000", "Campus", "I1"), 3)
+    assignment = Assignment("Lab 1", "Measure a lens.", datetime(2031, 2, 1, 12, 0), course)
+    course.add_assignment(assignment)
+    return course, assignment
+
+
+def test_grades_without_a_student_id_count_in_the_average():
+    course, assignment = make_course()
+    assignment.add_grade(60)
+    assert assignment.average_grade() == 60
+
+    student = Student("Ada", "ada@example.com", "0000000000", "Campus", "S1", "Freshman", "Physics")
+    course.enter_grade(student, assignment, 90)
+    assert course.gradebook.has_assignment("Lab 1")
+    assert assignment.average_grade() == pytest.approx(75)
+
+    other = Assignment("Lab 2", "Build a telescope.", datetime(2031, 3, 1, 12, 0), course)
+    course.add_assignment(other)
+    other.add_grade(40)
+    assert other.average_grade() == 40  # The gradebook has cells, but none for this title
+
+
+def test_gradebook_mean_is_used_for_identified_grades():
+    course, assignment = make_course()
+    for i, score in enumerate((70, 80, 90)):
+        student = Student(f"Student {i}", f"s{i}@example.com", "0000000000", "Campus", f"S{i}", "Freshman", "Physics")
+        course.enter_grade(student, assignment, score)
+    assert assignment.average_grade() == pytest.approx(course.gradebook.mean("Lab 1")) == pytest.approx(80)
+
+
+def test_duplicate_grades_are_rejected_per_student():
+    course, assignment = make_course()
+    assignment.add_grade(50, student_id="S1")
+    assignment.add_grade(70, student_id="S1")
+    assignment.add_grade(60)
+    assignment.add_grade(65)
+    assignment.add_grade(80, student_id="S2")
+    assert [(g['student_id'], g['score']) for g in assignment.grades] == [("S1", 50), ("", 60), ("S2", 80)]
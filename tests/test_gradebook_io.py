@@ -0,0 +1,99 @@
+import json
+from datetime import datetime
+
+import pytest
+
+import gradebook_io
+from assignment import Assignment
+from platform_admin import PlatformAdmin
+
+
+def load(filename):
+    admin = PlatformAdmin()
+    admin.load_data(filename)
+    return admin
+
+
+def graded_course(admin):
+    return max(admin.courses, key=lambda c: (len(c.grades), c.course_code))
+
+
+def grade_rows(course):
+    return sorted((student_id, title, grade.score, grade.feedback or '')
+                  for (student_id, title), grade in course.grades.items())
+
+
+@pytest.fixture
+def ungraded_file(data_file, tmp_path):
+    """The same platform without any grades."""
+    with open(data_file) as f:
+        data = json.load(f)
+    data['grades'] = []
+    filename = str(tmp_path / 'ungraded.json')
+    with open(filename, 'w') as f:
+        json.dump(data, f)
+    return filename
+
+
+@pytest.mark.parametrize('extension', ['csv', 'jsonl'])
+def test_export_then_import_restores_the_grades(data_file, ungraded_file, tmp_path, extension):
+    course = graded_course(load(data_file))
+    filename = str(tmp_path / f'grades.{extension}')
+    assert gradebook_io.export_grades(course, filename) == len(course.grades) > 0
+
+    target = load(ungraded_file)
+    target_course = target.registry.get_course(course.course_code)
+    result = gradebook_io.import_grades(target, target_course, filename, batch_size=7)
+    assert (result.rows, result.imported, result.error_count) == (len(course.grades), len(course.grades), 0)
+    assert grade_rows(target_course) == grade_rows(course)
+    assert target_course.gradebook.summary() == pytest.approx(course.gradebook.summary())
+
+    again = gradebook_io.import_grades(target, target_course, filename)
+    assert again.imported == 0 and {reason for _, reason in again.errors} == {"grade already exists"}
+
+
+def test_bad_rows_are_rejected_with_their_line_numbers(data_file, tmp_path):
+    admin = load(data_file)
+    course = graded_course(admin)
+    student = next(iter(course.enrolled_students))
+    outsider = next(s for s in admin.students if course not in s.enrolled_courses)
+    course.add_assignment(Assignment('Quiz', 'Short quiz.', datetime(2031, 1, 1, 12, 0), course))
+    rows = [
+        {'student_id': student.student_id, 'assignment_title': 'Quiz', 'score': 88, 'feedback': 'Good'},
+        {'student_id': 'nobody', 'assignment_title': 'Quiz', 'score': 50},
+        {'student_id': outsider.student_id, 'assignment_title': 'Quiz', 'score': 50},
+        {'student_id': student.student_id, 'assignment_title': 'Missing', 'score': 50},
+        {'student_id': student.student_id, 'assignment_title': 'Quiz', 'score': 'high'},
+    ]
+    filename = str(tmp_path / 'grades.jsonl')
+    with open(filename, 'w') as f:
+        f.writelines(json.dumps(row) + '\n' for row in rows)
+        f.write('not json\n')
+
+    result = gradebook_io.import_grades(admin, course, filename)
+    assert (result.rows, result.imported) == (6, 1)
+    assert [line for line, _ in result.errors] == [2, 3, 4, 5, 6]
+    assert course.gradebook.get(student.student_id, 'Quiz') == 88
+
+
+def test_grades_go_to_the_first_assignment_with_a_title(data_file, tmp_path):
+    admin = load(data_file)
+    course = graded_course(admin)
+    student = next(iter(course.enrolled_students))
+    first = Assignment('Essay', 'First essay.', datetime(2031, 1, 1, 12, 0), course)
+    second = Assignment('Essay', 'Second essay.', datetime(2031, 2, 1, 12, 0), course)
+    course.add_assignment(first)
+    course.add_assignment(second)
+    filename = str(tmp_path / 'grades.csv')
+    with open(filename, 'w') as f:
+        f.write(f"student_id,assignment_title,score\n{student.student_id},Essay,75\n")
+
+    assert gradebook_io.import_grades(admin, course, filename).imported == 1
+    assert course.grades[(student.student_id, 'Essay')].assignment is first
+    assert [g['score'] for g in first.grades] == [75] and second.grades == []
+
+
+def test_unsupported_format():
+    with pytest.raises(ValueError):
+        gradebook_io.file_format('grades.xlsx')
+    assert gradebook_io.file_format('grades.json') == 'jsonl'
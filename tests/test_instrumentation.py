@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+import gradebook_io
+import instrumentation
+from enrollment import Enrollment
+from platform_admin import PlatformAdmin
+
+
+@pytest.fixture(autouse=True)
+def clean():
+    instrumentation.reset()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_enable_wraps_and_disable_restores():
+    originals = (PlatformAdmin.__dict__['load_data'], Enrollment.__dict__['enroll_student'],
+                 gradebook_io.import_grades)
+    instrumentation.enable()
+    instrumentation.enable()  # A second enable does not wrap twice
+    assert PlatformAdmin.__dict__['load_data'] is not originals[0]
+    assert PlatformAdmin.__dict__['load_data'].__wrapped__ is originals[0]
+    assert gradebook_io.import_grades.__wrapped__ is originals[2]
+    assert PlatformAdmin.load_data.__name__ == 'load_data'
+
+    instrumentation.disable()
+    assert (PlatformAdmin.__dict__['load_data'], Enrollment.__dict__['enroll_student'],
+            gradebook_io.import_grades) == originals
+    assert not instrumentation.enabled
+
+
+def test_calls_and_errors_are_recorded(data_file):
+    instrumentation.enable()
+    admin = PlatformAdmin()
+    admin.load_data(data_file)
+    student, course = admin.students[0], admin.courses[-1]
+    admin.enrollments.unenroll_student(student, course)
+    admin.enrollments.enroll_student(student, course)
+    with pytest.raises(AttributeError):
+        admin.enrollments.enroll_student(None, course)
+    instrumentation.count('custom', 3)
+
+    stats = instrumentation.snapshot()
+    operations = stats['operations']
+    assert operations['PlatformAdmin.load_data']['count'] == 1
+    assert operations['Enrollment.enroll_student']['count'] == 2
+    assert operations['Enrollment.enroll_student']['errors'] == 1
+    assert stats['counters'] == {'custom': 3}
+    row = operations['PlatformAdmin.load_data']
+    assert 0 < row['p50_ms'] <= row['max_ms'] and sum(row['histogram'].values()) == 1
+    assert json.loads(instrumentation.dump_json()) == stats
+
+    instrumentation.disable()
+    admin.enrollments.enroll_student(admin.students[1], course)
+    instrumentation.count('custom')
+    assert instrumentation.snapshot() == stats  # Nothing is recorded once disabled
+
+
+def test_profile_next_profiles_a_single_call(data_file, tmp_path):
+    output = str(tmp_path / 'load.txt')
+    instrumentation.profile_next('PlatformAdmin.load_data', mode='sample', output=output, interval=0.0005)
+    admin = PlatformAdmin()
+    admin.load_data(data_file)
+    admin.load_data(data_file)
+    with open(output, encoding='utf-8') as f:
+        assert 'samples' in f.read()
+    assert instrumentation.snapshot()['operations']['PlatformAdmin.load_data']['count'] == 2
+    with pytest.raises(ValueError):
+        instrumentation.profile_next('search', mode='trace')
@@ -0,0 +1,87 @@
+import threading
+
+from platform_admin import PlatformAdmin
+from roundtrip import canonical, mutate
+
+
+def open_journal(filename):
+    admin = PlatformAdmin()
+    admin.open_journal(filename, commit_interval=0.01, compact_after=10 ** 9)
+    return admin
+
+
+def enrolled_pair(admin):
+    student = next(s for s in admin.students if s.enrolled_courses)
+    return student, student.enrolled_courses[0]
+
+
+def test_replay_after_unenroll(data_file):
+    admin = open_journal(data_file)
+    student, course = enrolled_pair(admin)
+    admin.enrollments.unenroll_student(student, course)
+    expected = admin.snapshot_data()
+    admin.close_journal()
+
+    replayed = open_journal(data_file)
+    try:
+        student = replayed.registry.get_student(student.student_id)
+        course = replayed.registry.get_course(course.course_code)
+        assert not replayed.enrollments.is_student_enrolled(student, course)
+        assert course not in student.enrolled_courses
+        assert student not in course.enrolled_students
+        assert replayed.snapshot_data() == expected
+    finally:
+        replayed.close_journal()
+
+
+def test_replay_unenroll_then_enroll_again(data_file):
+    admin = open_journal(data_file)
+    student, course = enrolled_pair(admin)
+    admin.enrollments.unenroll_student(student, course)
+    admin.enrollments.on_conflict = 'flag'
+    assert admin.enrollments.enroll_student(student, course)
+    admin.close_journal()
+
+    replayed = open_journal(data_file)
+    try:
+        assert replayed.enrollments.is_student_enrolled(replayed.registry.get_student(student.student_id),
+                                                        replayed.registry.get_course(course.course_code))
+    finally:
+        replayed.close_journal()
+
+
+def test_announcement_posted_during_compaction_survives(data_file):
+    admin = open_journal(data_file)
+    rotate = admin.journal.rotate
+    poster = threading.Thread(target=admin.post_announcement,
+                              args=('Late', 'Posted while compacting', '2025-06-01', ['Student']))
+
+    def rotate_with_concurrent_post():
+        poster.start()
+        poster.join(0.2)  # Finishes here unless it has to wait for compact() to release its locks
+        return rotate()
+
+    admin.journal.rotate = rotate_with_concurrent_post
+    admin.compact(background=False)
+    poster.join()
+    admin.close_journal()
+
+    reopened = open_journal(data_file)
+    try:
+        assert [a.title for a in reopened.announcements].count('Late') == 1
+    finally:
+        reopened.close_journal()
+
+
+def test_journal_round_trip(data_file, expected):
+    admin = PlatformAdmin()
+    admin.open_journal(data_file, commit_interval=0.01, compact_after=10 ** 9)
+    mutate(admin, new_student=False)  # Only journaled mutations survive without a snapshot
+    admin.close_journal()
+
+    reloaded = PlatformAdmin()
+    reloaded.open_journal(data_file, commit_interval=0.01, compact_after=10 ** 9)
+    try:
+        assert canonical(reloaded) == expected[False]
+    finally:
+        reloaded.close_journal()
@@ -0,0 +1,43 @@
+import json_stream
+import platform_admin
+from platform_admin import PlatformAdmin
+from roundtrip import canonical, mutate
+
+
+def test_json_round_trip(data_file, expected):
+    admin = PlatformAdmin()
+    admin.load_data(data_file)
+    mutate(admin)
+    admin.save_data(data_file)
+
+    for options in ({}, {'stream': True}):
+        reloaded = PlatformAdmin()
+        reloaded.load_data(data_file, **options)
+        assert canonical(reloaded) == expected[True]
+
+
+def test_streaming_reports_progress(data_file):
+    seen = []
+    admin = PlatformAdmin()
+    admin.load_data(data_file, stream=True, progress=lambda section, records, position, total: seen.append(
+        (section, records, position, total)))
+    assert {section for section, _, _, _ in seen} >= {'students', 'courses'}
+    positions = [position for _, _, position, _ in seen]
+    assert positions == sorted(positions) and positions[-1] <= seen[-1][3]
+    assert len(admin.students) == 200
+
+
+def test_large_files_are_streamed_by_default(data_file, monkeypatch, capsys):
+    streamed = []
+    iter_sections = json_stream.iter_sections
+    monkeypatch.setattr(json_stream, 'iter_sections', lambda *args, **kwargs: streamed.append(args) or
+                        iter_sections(*args, **kwargs))
+    PlatformAdmin().load_data(data_file)
+    assert streamed == []
+
+    monkeypatch.setattr(platform_admin, 'STREAM_THRESHOLD', 0)
+    admin = PlatformAdmin()
+    admin.load_data(data_file, progress=json_stream.print_progress)
+    assert streamed == [(data_file,)]
+    assert len(admin.students) == 200
+    assert "Loading students: 200 records" in capsys.readouterr().out
@@ -0,0 +1,54 @@
+import datagen
+from datagen import Generator
+from lazy_store import LazyJsonStorage
+from platform_admin import PlatformAdmin
+from roundtrip import canonical, mutate
+
+
+def test_lazy_round_trip(data_file, expected):
+    admin = PlatformAdmin(storage=LazyJsonStorage(data_file))
+    admin.load_data(data_file)
+    mutate(admin)
+    admin.save_data(data_file)
+    admin.storage.close()
+
+    lazy = PlatformAdmin(storage=LazyJsonStorage(data_file))
+    lazy.load_data(data_file)
+    try:
+        assert canonical(lazy) == expected[True]
+    finally:
+        lazy.storage.close()
+    eager = PlatformAdmin()
+    eager.load_data(data_file)
+    assert canonical(eager) == expected[True]
+
+
+def test_lazy_open_hydrates_on_demand(data_file):
+    eager = PlatformAdmin()
+    eager.load_data(data_file)
+    admin = PlatformAdmin(storage=LazyJsonStorage(data_file))
+    admin.load_data(data_file)
+    try:
+        assert not admin.registry.students and not admin.registry.courses
+        student = admin.registry.get_student(Generator.student_id(3))
+        expected = eager.registry.get_student(student.student_id)
+        assert [c.course_code for c in student.enrolled_courses] == [c.course_code for c in expected.enrolled_courses]
+        assert len(admin.registry.students) == 1
+    finally:
+        admin.storage.close()
+
+
+def test_stale_offset_index_is_rebuilt(data_file):
+    admin = PlatformAdmin(storage=LazyJsonStorage(data_file))
+    admin.load_data(data_file)
+    admin.storage.close()
+    datagen.generate(data_file, 50)  # Rewritten behind the index's back
+
+    admin = PlatformAdmin(storage=LazyJsonStorage(data_file))
+    admin.load_data(data_file)
+    try:
+        assert admin.registry.get_student(Generator.student_id(100)) is None
+        assert admin.registry.get_student(Generator.student_id(10)) is not None
+        assert len(admin.students) == 50
+    finally:
+        admin.storage.close()
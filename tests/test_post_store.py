@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+from post_store import PostStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PostStore(str(tmp_path / 'data.discussions'), segment_size=4)
+    yield store
+    store.close()
+
+
+def fill(store, n, thread_title='Optics'):
+    thread_id = store.create_thread('PHY101', thread_title, 'I1', 'Instructor')['thread_id']
+    for i in range(n):
+        store.append(thread_id, f'S{i % 3}', 'Student', f'post {i + 1}')
+    return thread_id
+
+
+def test_posts_are_split_into_segments(store):
+    thread_id = fill(store, 10)
+    segments = sorted(os.listdir(os.path.join(store.directory, str(thread_id))))
+    assert segments == ['000000001.jsonl', '000000005.jsonl', '000000009.jsonl']
+    assert store.count(thread_id) == 10
+    assert [p['id'] for p in store.read(thread_id, 3, 6)] == [3, 4, 5, 6]  # Spans two segments
+    assert [p['message'] for p in store.read(thread_id, 9, 50)] == ['post 9', 'post 10']
+    assert store.read(thread_id, 11, 20) == []
+
+
+def test_reopening_reads_only_the_tail(store):
+    thread_id = fill(store, 10)
+    other = fill(store, 2, 'Waves')
+    store.close()
+
+    reopened = PostStore(store.directory, segment_size=4)
+    try:
+        assert [t['title'] for t in reopened.threads()] == ['Optics', 'Waves']
+        assert reopened.count(thread_id) == 10 and reopened.count(other) == 2
+        assert reopened.last_activity(thread_id) == store.last_activity(thread_id)
+        assert reopened._cache == {}  # Counts came from the tail segments alone
+        assert reopened.append(thread_id, 'S0', 'Student', 'post 11')['id'] == 11
+        assert [p['message'] for p in reopened.read(thread_id, 1, 2)] == ['post 1', 'post 2']
+    finally:
+        reopened.close()
+
+
+def test_torn_append_is_repaired(store):
+    thread_id = fill(store, 6)
+    store.close()
+    tail = os.path.join(store.directory, str(thread_id), '000000005.jsonl')
+    with open(tail, 'a', encoding='utf-8') as f:
+        f.write('{"id": 7, "mess')  # Crash in the middle of an append
+
+    reopened = PostStore(store.directory, segment_size=4)
+    try:
+        assert reopened.count(thread_id) == 6
+        reopened.append(thread_id, 'S0', 'Student', 'post 7')
+        assert [p['message'] for p in reopened.read(thread_id, 5, 7)] == ['post 5', 'post 6', 'post 7']
+    finally:
+        reopened.close()
+
+
+def test_in_memory_store_and_copy(tmp_path):
+    memory = PostStore(segment_size=4)
+    thread_id = fill(memory, 9)
+    assert [p['id'] for p in memory.read(thread_id, 4, 5)] == [4, 5]
+
+    directory = str(tmp_path / 'copy.discussions')
+    memory.save_to(directory)
+    copy = PostStore(directory, segment_size=4)
+    try:
+        assert copy.count(thread_id) == 9
+        assert copy.read(thread_id, 1, 9) == memory.read(thread_id, 1, 9)
+    finally:
+        copy.close()
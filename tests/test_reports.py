@@ -0,0 +1,62 @@
+import json
+import os
+
+import pytest
+
+import reports
+from platform_admin import PlatformAdmin
+
+
+@pytest.fixture
+def admin(data_file):
+    admin = PlatformAdmin()
+    admin.load_data(data_file)
+    return admin
+
+
+def read_report(directory, course_code):
+    with open(os.path.join(directory, f"{course_code}.json"), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def check_reports(admin, directory):
+    for course in admin.courses:
+        report = read_report(directory, course.course_code)
+        enrolled = admin.enrollments.count_students(course)
+        assert report['enrolled'] == enrolled
+        assert report['grades'] == pytest.approx(course.gradebook.summary())
+        for assignment in report['assignments']:
+            expected = course.gradebook.summary(assignment['title'])
+            assert assignment['count'] == expected['count']
+            assert {key: assignment[key] for key in expected} == pytest.approx(expected)
+            assert assignment['completion_rate'] == (round(expected['count'] / enrolled, 4) if enrolled else 0.0)
+        assert sum(a['count'] for a in report['assignments']) == len(course.gradebook)
+
+
+def test_report_stats_match_the_gradebook(admin, tmp_path):
+    directory = str(tmp_path / 'reports')
+    admin.generate_reports(directory, workers=1)
+    check_reports(admin, directory)
+    assert any(a['count'] for course in admin.courses
+               for a in read_report(directory, course.course_code)['assignments'])
+
+
+def test_worker_processes_give_the_same_reports(admin, tmp_path):
+    directory = str(tmp_path / 'reports')
+    run = reports.generate_reports(admin, directory, workers=2, incremental=False, batch_size=8)
+    assert len(run.rebuilt) == len(admin.courses)
+    check_reports(admin, directory)
+
+
+def test_unchanged_courses_are_not_rebuilt(admin, tmp_path):
+    directory = str(tmp_path / 'reports')
+    admin.generate_reports(directory, workers=1)
+    course = admin.courses[0]
+    student = next(s for s in admin.enrollments.get_students_by_course(course)
+                   if (s.student_id, course.assignments[0].title) not in course.grades)
+    course.enter_grade(student, course.assignments[0], 91.0)
+
+    run = admin.generate_reports(directory, workers=1)
+    assert run.rebuilt == [course.course_code]
+    assert len(run.unchanged) == len(admin.courses) - 1
+    check_reports(admin, directory)
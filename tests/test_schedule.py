@@ -0,0 +1,122 @@
+import pytest
+
+import schedule
+from course import Course
+from enrollment import Enrollment
+from instructor import Instructor
+from platform_admin import PlatformAdmin
+from schedule import Schedule
+from student import Student
+
+MONDAY, SUNDAY = 0, 6 * schedule.MINUTES_PER_DAY
+
+
+def make_course(code, instructor, day=None, time=None):
+    course = Course(f"Course {code}", code, instructor, 3)
+    if day:
+        course.schedule = Schedule(course, day, time)
+    return course
+
+
+@pytest.fixture
+def instructor():
+    return Instructor("Dr. Lee", "lee@example.com", "0000000000", "Campus", "I1")
+
+
+@pytest.fixture
+def student():
+    return Student("Ada", "ada@example.com", "0000000000", "Campus", "S1", "Freshman", "Physics")
+
+
+def test_day_and_time_parsing():
+    assert schedule.parse_days("Mon/Wed") == [0, 2]
+    assert schedule.parse_days("Tuesday, Thursday") == [1, 3]
+    assert schedule.parse_time("09:30 AM") == 9 * 60 + 30
+    assert schedule.parse_time("14:30") == 14 * 60 + 30
+    assert schedule.weekly_intervals("Monday", "09:00 AM - 10:30 AM") == [(MONDAY + 540, MONDAY + 630)]
+    # A session running past Sunday midnight wraps round to Monday morning
+    assert schedule.weekly_intervals("Sunday", "11:00 PM - 01:00 AM") == [
+        (0, 60), (SUNDAY + 23 * 60, schedule.MINUTES_PER_WEEK)]
+    with pytest.raises(ValueError):
+        schedule.parse_days("Someday")
+    with pytest.raises(ValueError):
+        schedule.parse_time_range("09:00 AM")
+
+
+def test_overlap_is_half_open(instructor):
+    first = make_course("A", instructor, "Mon/Wed", "09:00 AM - 10:00 AM").schedule
+    adjacent = make_course("B", instructor, "Wednesday", "10:00 AM - 11:00 AM").schedule
+    overlapping = make_course("C", instructor, "Wednesday", "09:59 AM - 11:00 AM").schedule
+    assert not first.overlaps(adjacent)
+    assert first.overlaps(overlapping) and overlapping.overlaps(first)
+    wrapping = make_course("D", instructor, "Sunday", "11:00 PM - 01:00 AM").schedule
+    assert make_course("E", instructor, "Monday", "12:30 AM - 01:30 AM").schedule.overlaps(wrapping)
+
+
+def test_enrollment_rejects_or_flags_conflicts(instructor, student):
+    morning = make_course("A", instructor, "Mon/Wed", "09:00 AM - 10:30 AM")
+    clash = make_course("B", instructor, "Wednesday", "10:00 AM - 11:00 AM")
+    unscheduled = make_course("C", instructor)
+    enrollment = Enrollment()
+    assert enrollment.enroll_student(student, morning)
+    assert enrollment.schedule_conflicts(student, clash) == [morning]
+    assert not enrollment.enroll_student(student, clash)
+    assert enrollment.enroll_student(student, unscheduled)  # No schedule, no conflict
+
+    enrollment.on_conflict = 'flag'
+    assert enrollment.enroll_student(student, clash)
+    assert student.enrolled_courses == [morning, unscheduled, clash]
+
+
+def test_conflict_report_and_instructor_conflicts(instructor, student):
+    admin = PlatformAdmin()
+    admin.add_instructor(instructor)
+    courses = [make_course("A", instructor, "Monday", "09:00 AM - 11:00 AM"),
+               make_course("B", instructor, "Monday", "10:00 AM - 12:00 PM"),
+               make_course("C", instructor, "Tuesday", "09:00 AM - 11:00 AM")]
+    for course in courses:
+        admin.add_course(course)
+    admin.add_student(student)
+    admin.enrollments.on_conflict = 'flag'
+    for course in courses:
+        admin.enrollments.enroll_student(student, course)
+
+    assert admin.registry.instructor_conflicts(courses[0]) == [courses[1]]
+    report = [(person.name, a.course_code, b.course_code) for person, a, b in admin.schedule_conflict_report()]
+    assert report == [("Dr. Lee", "A", "B"), ("Ada", "A", "B")]
+
+    admin.set_schedule(courses[1], "Wednesday", "10:00 AM - 12:00 PM")
+    assert admin.schedule_conflict_report() == []
+    assert admin.enrollments.schedule_conflicts(student, courses[0]) == []
+
+
+def test_timetables_are_built_once_and_kept_up_to_date(instructor, student):
+    admin = PlatformAdmin()
+    admin.add_instructor(instructor)
+    friday = make_course("A", instructor, "Friday", "01:00 PM - 02:00 PM")
+    monday = make_course("B", instructor, "Mon/Wed", "09:00 AM - 10:00 AM")
+    for course in (friday, monday):
+        admin.add_course(course)
+    admin.add_student(student)
+    lookups = []
+    schedules = admin.enrollments.schedules
+    courses_of = schedules.courses_of
+    schedules.courses_of = lambda owner: lookups.append(owner) or courses_of(owner)
+
+    admin.enrollments.enroll_student(student, friday)
+    assert [c.course_code for _, _, c in admin.student_timetable(student)] == ["A"]
+    admin.enrollments.enroll_student(student, monday)
+    assert [c.course_code for _, _, c in admin.student_timetable(student)] == ["B", "B", "A"]
+    assert lookups == [student]  # Built on first use, then updated in place
+
+    admin.set_schedule(friday, "Tuesday", "08:00 AM - 09:00 AM")
+    assert [c.course_code for _, _, c in admin.student_timetable(student)] == ["B", "A", "B"]
+    assert schedule.format_timetable(admin.student_timetable(student))[1] == \
+        "Tuesday 08:00 AM - 09:00 AM: Course A (Code: A)"
+    admin.enrollments.unenroll_student(student, monday)
+    assert [c.course_code for _, _, c in admin.student_timetable(student)] == ["A"]
+    assert lookups == [student]
+
+    assert [c.course_code for _, _, c in admin.instructor_timetable(instructor)] == ["B", "A", "B"]
+    admin.registry.remove_course(monday)
+    assert [c.course_code for _, _, c in admin.instructor_timetable(instructor)] == ["A"]
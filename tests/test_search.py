@@ -0,0 +1,86 @@
+import os
+
+import search_index
+from platform_admin import PlatformAdmin
+
+
+def load(filename):
+    admin = PlatformAdmin()
+    admin.load_data(filename)
+    return admin
+
+
+def test_announcements_with_the_same_date_and_title_stay_distinct(data_file):
+    admin = load(data_file)
+    first = admin.post_announcement('Library hours', 'The library closes at noon.', '2025-03-01', ['Student'])
+    second = admin.post_announcement('Library hours', 'The library stays open late.', '2025-03-01', ['Student'])
+    assert first.announcement_id != second.announcement_id
+    assert {r['text'] for r in admin.search('library')} == {first.content, second.content}
+
+    admin.announcements.remove(first)
+    assert [r['text'] for r in admin.search('library')] == [second.content]
+
+
+def test_announcement_ids_survive_a_reload(data_file):
+    admin = load(data_file)
+    posted = admin.post_announcement('Exam rooms', 'Rooms are listed online.', '2025-04-01', ['Student'])
+    admin.save_data(data_file)
+
+    reloaded = load(data_file)
+    announcement = reloaded.announcements.get(posted.announcement_id)
+    assert announcement.title == 'Exam rooms'
+    assert [r['title'] for r in reloaded.search('exam rooms', role='Student')] == ['Exam rooms']
+    assert reloaded.search('exam rooms', role='Instructor') == []
+
+
+def test_threads_and_posts_are_found(data_file):
+    admin = load(data_file)
+    course = admin.courses[0]
+    thread = admin.create_thread(course, 'Eigenvalue question', course.instructor)
+    thread.add_post(course.instructor, 'Diagonalize the matrix first.')
+    results = admin.search('diagonalize')
+    assert [(r['kind'], r['thread_id'], r['course_code']) for r in results] == [('post', thread.thread_id, course.course_code)]
+
+    admin.save_data(data_file)
+    reloaded = load(data_file)
+    assert [r['kind'] for r in reloaded.search('eigenvalue')] == ['thread']
+
+
+def test_role_filter_is_applied_before_ranking(data_file):
+    admin = load(data_file)
+    for i in range(30):
+        admin.post_announcement('Parking parking parking', f'Staff parking notice {i}.', '2025-05-01', ['Instructor'])
+    visible = admin.post_announcement('Parking', 'Student parking moves.', '2025-05-01', ['Student'])
+    index = admin.search_index
+    docs = index.search('parking', group='Student', limit=1)
+    assert [index.doc_kind[doc] for _, doc in docs] == [search_index.ANNOUNCEMENT]
+    assert [r['text'] for r in admin.search('parking', role='Student', limit=1)] == [visible.content]
+
+    visible.remove_recipient_group('Student')
+    assert admin.search('parking', role='Student') == []
+    visible.add_recipient_group('Student')
+    admin.save_data(data_file)
+    assert [r['text'] for r in load(data_file).search('student parking', role='Student')] == [visible.content]
+
+
+def test_assignment_hits_resolve_to_their_assignment(data_file):
+    admin = load(data_file)
+    course = admin.courses[0]
+    course.assign_assignment('Lab | Optics', 'Measure the focal length of a lens.', '2031-02-01T12:00:00')
+    results = admin.search('focal length')
+    assert [(r['kind'], r['course_code'], r['title']) for r in results] == [
+        ('assignment', course.course_code, 'Lab | Optics')]
+
+
+def test_save_as_writes_the_sidecars_next_to_the_new_file(data_file, tmp_path):
+    admin = load(data_file)
+    course = admin.courses[0]
+    thread = admin.create_thread(course, 'Telescope night', course.instructor)
+    thread.add_post(course.instructor, 'Bring warm clothes.')
+    other = str(tmp_path / 'other.json')
+    admin.save_data(other)
+    assert os.path.exists(search_index.sidecar_path(other))
+
+    copy = load(other)
+    assert [r['kind'] for r in copy.search('telescope')] == ['thread']
+    assert [r['text'] for r in copy.search('warm clothes')] == ['Bring warm clothes.']
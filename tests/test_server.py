@@ -0,0 +1,91 @@
+import asyncio
+import json
+import time
+
+import events
+import server
+from platform_admin import PlatformAdmin
+
+
+async def request(reader, writer, line):
+    writer.write(line.encode('utf-8') + b'\n')
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+def serve(data_file, client):
+    """Run `client(port)` against an in-process server over data_file."""
+    admin = PlatformAdmin()
+    admin.load_data(data_file)
+
+    async def main():
+        instance = server.ELearningServer(admin, port=0, save_on_exit=False)
+        await instance.start()
+        try:
+            return await client(admin, instance.port)
+        finally:
+            await instance.stop()
+
+    return asyncio.run(main())
+
+
+def test_messages_go_to_the_request_not_the_process_sink(data_file):
+    user_sink = events.MemorySink()
+
+    async def client(admin, port):
+        admin.enrollments.on_conflict = 'flag'
+        student = admin.students[0]
+        course = next(c for c in admin.courses if c not in student.enrolled_courses)
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        await request(reader, writer, f"LOGIN student|{student.name}")
+        response = await request(reader, writer, f"ENROLL {course.course_name}")
+        writer.close()
+        return response
+
+    with events.use_sink(user_sink):
+        response = serve(data_file, client)
+        assert events.get_sink() is user_sink  # Still installed after the server stopped
+    assert response['ok']
+    assert any('has been enrolled' in m for m in response['messages'])
+    assert user_sink.messages == []
+
+
+def test_requests_carry_their_own_domain_messages(data_file):
+    async def client(admin, port):
+        course = admin.courses[0]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        await request(reader, writer, f"LOGIN instructor|{course.instructor.name}")
+        responses = [await request(reader, writer, f"ASSIGN {course.course_code}|Essay|Write.|2031-05-01T12:00:00"),
+                     await request(reader, writer, f"ASSIGN {course.course_code}|Essay|Write.|2031-05-01T12:00:00")]
+        writer.close()
+        responses[0]['course'] = course.course_name
+        return responses
+
+    created, duplicate = serve(data_file, client)
+    assert created['ok'] and created['messages'] == [f"Assignment 'Essay' added to course '{created['course']}'."]
+    assert not duplicate['ok'] and len(duplicate['messages']) == 1 and 'already exists' in duplicate['messages'][0]
+
+
+def test_a_slow_request_does_not_block_other_sessions(data_file, monkeypatch):
+    def slow_courses(self):
+        time.sleep(0.5)
+        return []
+
+    monkeypatch.setattr(server.Session, 'courses', slow_courses)
+
+    async def client(admin, port):
+        name = admin.students[0].name
+        slow_reader, slow_writer = await asyncio.open_connection('127.0.0.1', port)
+        await request(slow_reader, slow_writer, f"LOGIN student|{name}")
+        start = time.perf_counter()
+        slow = asyncio.ensure_future(request(slow_reader, slow_writer, "COURSES"))
+        await asyncio.sleep(0.05)  # The server is now serving COURSES (and, were it blocking, the loop with it)
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        await request(reader, writer, "HELP")
+        elapsed = time.perf_counter() - start
+        await slow
+        slow_writer.close()
+        writer.close()
+        return elapsed
+
+    assert serve(data_file, client) < 0.3
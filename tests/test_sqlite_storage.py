@@ -0,0 +1,115 @@
+import os
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from platform_admin import PlatformAdmin
+from roundtrip import canonical, mutate
+from sqlite_storage import SqliteStorage
+
+
+@pytest.fixture
+def eager(data_file):
+    admin = PlatformAdmin()
+    admin.load_data(data_file)
+    return admin
+
+
+@pytest.fixture
+def db_file(data_file, eager):
+    filename = os.path.join(os.path.dirname(data_file), 'data.db')
+    storage = SqliteStorage(filename)
+    storage.import_data(eager.snapshot_data())
+    storage.close()
+    return filename
+
+
+def open_sqlite(db_file, data_file):
+    admin = PlatformAdmin(storage=SqliteStorage(db_file))
+    admin.load_data(data_file)
+    return admin
+
+
+def test_unenroll_is_persisted(db_file, data_file, eager):
+    student_id = next(s.student_id for s in eager.students if s.enrolled_courses)
+    admin = open_sqlite(db_file, data_file)
+    student = admin.registry.get_student(student_id)
+    course = student.enrolled_courses[0]
+    admin.enrollments.unenroll_student(student, course)
+    admin.save_data()
+    admin.storage.close()
+
+    reopened = open_sqlite(db_file, data_file)
+    student = reopened.registry.get_student(student_id)
+    assert course.course_code not in [c.course_code for c in student.enrolled_courses]
+    reopened.storage.load_roster(reopened.registry.get_course(course.course_code))
+    assert student not in reopened.registry.get_course(course.course_code).enrolled_students
+    reopened.storage.close()
+
+
+def test_mutations_from_worker_threads(db_file, data_file, eager):
+    admin = open_sqlite(db_file, data_file)
+    admin.enrollments.on_conflict = 'flag'
+    course = admin.courses[0]
+    enrolled = {s.student_id for s in eager.enrollments.get_students_by_course(eager.registry.get_course(course.course_code))}
+    student_ids = [s.student_id for s in eager.students if s.student_id not in enrolled][:20]
+
+    def enroll(student_id):
+        return admin.enrollments.enroll_student(admin.registry.get_student(student_id), course)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        assert all(pool.map(enroll, student_ids))
+    admin.storage.close()
+
+    reopened = open_sqlite(db_file, data_file)
+    course = reopened.registry.get_course(course.course_code)
+    reopened.storage.load_roster(course)
+    assert set(student_ids) <= {s.student_id for s in course.enrolled_students}
+    reopened.storage.close()
+
+
+def test_roster_is_loaded_with_a_fixed_number_of_queries(db_file, data_file, eager):
+    admin = open_sqlite(db_file, data_file)
+    statements = []
+    admin.storage.conn.set_trace_callback(statements.append)
+    course = max(admin.courses, key=lambda c: eager.enrollments.count_students(eager.registry.get_course(c.course_code)))
+    admin.storage.load_roster(course)
+    admin.storage.conn.set_trace_callback(None)
+    assert len(statements) <= 4
+
+    expected = eager.registry.get_course(course.course_code)
+    assert {s.student_id for s in course.enrolled_students} == {s.student_id for s in expected.enrolled_students}
+    assert {key: g.score for key, g in course.grades.items()} == {key: g.score for key, g in expected.grades.items()}
+    for student in course.enrolled_students:
+        assert ({c.course_code for c in student.enrolled_courses}
+                == {c.course_code for c in eager.registry.get_student(student.student_id).enrolled_courses})
+    admin.storage.close()
+
+
+def test_sqlite_round_trip(db_file, data_file, expected):
+    admin = open_sqlite(db_file, data_file)
+    mutate(admin)
+    admin.save_data(data_file)
+    admin.storage.close()
+
+    reloaded = open_sqlite(db_file, data_file)
+    try:
+        assert canonical(reloaded) == expected[True]
+    finally:
+        reloaded.storage.close()
+
+
+def test_announcement_groups_and_expiry_are_persisted(db_file, data_file):
+    admin = open_sqlite(db_file, data_file)
+    kept = admin.post_announcement('Kept', 'Still relevant.', datetime(2031, 1, 1, 12, 0), ['Student'])
+    admin.post_announcement('Dropped', 'Out of date.', datetime(2031, 1, 1, 9, 0), ['Student'])
+    kept.add_recipient_group('Instructor')
+    admin.expire_announcements('2031-01-01 10:00:00')
+    admin.storage.close()
+
+    reopened = open_sqlite(db_file, data_file)
+    titles = [a.title for a in reopened.announcements]
+    assert 'Kept' in titles and 'Dropped' not in titles
+    assert reopened.announcements.get(kept.announcement_id).recipient_groups == ['Student', 'Instructor']
+    reopened.storage.close()